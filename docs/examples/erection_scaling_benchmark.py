@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Times the erection and offload operation time calculations (separately and in one pass for all crane operations) for
+crane catalogs with 10, 100, and 1000 crane configurations (crane name and boom system) using synthetic crane and
+component data.
+
+Run from the repository root:  python docs/examples/erection_scaling_benchmark.py
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# just to temporarily change PYTHONPATH without installing
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'landbosse'))
+
+import ErectionCost
+
+catalog_sizes = [10, 100, 1000]
+load_chart_points = 3  # rows in crane specifications for each crane configuration
+repeats = 3
+
+
+def create_crane_specs(num_configs, seed=0):
+    """
+    Creates synthetic crane specifications with a load chart for each crane configuration.
+
+    :param num_configs: number of crane configurations (crane name and boom system)
+    :param seed: seed for random crane data
+    :return: data frame with crane specifications
+    """
+
+    random_state = np.random.RandomState(seed)
+    rows = list()
+    for config in range(num_configs):
+        equipment = ['Crawler crane', 'Offload crane'][config % 2]
+        capacity = [400, 600, 100][config % 3]
+        max_capacity = np.sort(random_state.uniform(20, 200, load_chart_points))[::-1]
+        hub_height = np.sort(random_state.uniform(40, 140, load_chart_points))
+        for point in range(load_chart_points):
+            rows.append([equipment, 'Crane {}'.format(config // 4), 'Boom {}'.format(config), capacity,
+                         max_capacity[point], hub_height[point], 12 + config % 4, 60, 1.0 + config % 3, 30, 'C1',
+                         200000])
+
+    return pd.DataFrame(rows, columns=['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne',
+                                       'Max capacity tonne', 'Hub height m', 'Max wind speed m per s',
+                                       'Hoist speed m per min', 'Speed of travel km per hr', 'Setup time hr',
+                                       'Crew type ID', 'Mobilization cost USD'])
+
+
+project = pd.DataFrame([[100.0, 50.0, 5.0, 120.0, 0.5]],
+                       columns=['Hub height m', 'Number of turbines', 'Turbine spacing (times rotor diameter)',
+                                'Rotor diameter m', 'Breakpoint between base and topping (percent)'])
+
+components = pd.DataFrame([['Tower 1', 60, 25, 100, 1.2, 3, 5, 1],
+                           ['Tower 2', 50, 55, 90, 1.2, 3, 5, 1],
+                           ['Tower 3', 40, 85, 80, 1.2, 3, 5, 1],
+                           ['Nacelle', 80, 100, 60, 1.2, 4, 5, 1.5],
+                           ['Rotor', 70, 100, 400, 0.8, 6, 5, 1.5]],
+                          columns=['Component', 'Mass tonne', 'Lift height m', 'Surface area sq m', 'Coeff drag',
+                                   'Cycle time installation hrs', 'Offload hook height m', 'Offload cycle time hrs'])
+
+print('Crane configurations, erection time s, offload time s, all operations time s')
+for num_configs in catalog_sizes:
+    project_data = {'crane_specs': create_crane_specs(num_configs), 'components': components.copy()}
+
+    erection_time = list()
+    offload_time = list()
+    all_operations_time = list()
+    for repeat in range(repeats):
+        # clear compiled crane catalogs so that each run includes compiling the catalog
+        ErectionCost.clear_compiled_cache()
+
+        start = time.time()
+        ErectionCost.calculate_erection_operation_time(project_specs=project,
+                                                       project_data=project_data,
+                                                       construct_duration=9,
+                                                       operational_construction_time=10)
+        erection_time.append(time.time() - start)
+
+        start = time.time()
+        ErectionCost.calculate_offload_operation_time(project_specs=project,
+                                                      project_data=project_data,
+                                                      operational_construction_time=10,
+                                                      rate_of_deliveries=10)
+        offload_time.append(time.time() - start)
+
+        start = time.time()
+        ErectionCost.calculate_operation_time(project_specs=project,
+                                              project_data=project_data,
+                                              operations=list(ErectionCost.crane_operations),
+                                              construct_duration=9,
+                                              operational_construction_time=10,
+                                              rate_of_deliveries=10)
+        all_operations_time.append(time.time() - start)
+
+    print('{}, {:.3f}, {:.3f}, {:.3f}'.format(num_configs, min(erection_time), min(offload_time),
+                                               min(all_operations_time)))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+Times creating the weather window from a weather file (date parsing and season/hour masks) and loading it through the
+weather window cache (first load, in-memory hit, and on-disk hit) for 1, 10, and 30 years of synthetic hourly weather
+data.
+
+Run from the repository root:  python docs/examples/weather_window_benchmark.py
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# just to temporarily change PYTHONPATH without installing
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'landbosse'))
+
+import WeatherDelay as WD
+
+num_years_list = [1, 10, 30]
+repeats = 3
+
+season_id = {'winter': [12, 1, 2], 'spring': [3, 4, 5], 'summer': [6, 7, 8], 'fall': [9, 10, 11]}
+season_construct = ['spring', 'summer']
+time_construct = 'normal'
+
+
+def create_weather_file(weather_file, num_years, seed=0):
+    """
+    Creates a synthetic weather file with hourly wind speeds (four header rows, date in first column, and wind speed in
+    fifth column, as in the weather files used by LandBOSSE).
+
+    :param weather_file: path to weather file
+    :param num_years: number of years of hourly weather data
+    :param seed: seed for random wind speeds
+    """
+
+    random_state = np.random.RandomState(seed)
+    dates = pd.date_range('1990-01-01 00:00', periods=num_years * 8760, freq='h')
+    speed = np.round(random_state.weibull(2.0, len(dates)) * 9.5, 3)
+    weather_data = pd.DataFrame({'Date': dates.strftime('%m/%d/%Y %H:%M'), 'Temperature': 10.0, 'Pressure': 1.0,
+                                 'Direction': 180.0, 'Speed': speed},
+                                columns=['Date', 'Temperature', 'Pressure', 'Direction', 'Speed'])
+    header = pd.DataFrame([['header'] * 5] * 4, columns=weather_data.columns)
+    pd.concat([header, weather_data]).to_csv(weather_file, index=False)
+
+
+temp_dir = tempfile.mkdtemp()
+try:
+    print('Years of weather data, create window s, first load s, memory hit s, disk hit s')
+    for num_years in num_years_list:
+        weather_file = os.path.join(temp_dir, 'weather_{}.csv'.format(num_years))
+        create_weather_file(weather_file, num_years)
+        cache_dir = os.path.join(temp_dir, 'cache_{}'.format(num_years))
+
+        create_time = list()
+        first_load_time = list()
+        memory_hit_time = list()
+        disk_hit_time = list()
+        for repeat in range(repeats):
+            start = time.time()
+            WD.create_weather_window(weather_data=pd.read_csv(weather_file),
+                                     season_id=season_id,
+                                     season_construct=season_construct,
+                                     time_construct=time_construct)
+            create_time.append(time.time() - start)
+
+            # first load reads the weather file and stores the weather window in memory and on disk
+            WD.clear_weather_cache(disk=True)
+            WD.configure_weather_cache(cache_dir=cache_dir)
+            load_times = list()
+            for load in ['first', 'memory', 'disk']:
+                if load == 'disk':
+                    WD.weather_cache.clear()
+                start = time.time()
+                WD.load_weather_window(weather_file=weather_file,
+                                       season_id=season_id,
+                                       season_construct=season_construct,
+                                       time_construct=time_construct)
+                load_times.append(time.time() - start)
+            first_load_time.append(load_times[0])
+            memory_hit_time.append(load_times[1])
+            disk_hit_time.append(load_times[2])
+
+        print('{}, {:.3f}, {:.3f}, {:.4f}, {:.4f}'.format(num_years, min(create_time), min(first_load_time),
+                                                         min(memory_hit_time), min(disk_hit_time)))
+finally:
+    WD.configure_weather_cache(cache_dir='')
+    WD.clear_weather_cache()
+    shutil.rmtree(temp_dir)
@@ -48,401 +48,711 @@ Return total erection costs
 
 import pandas as pd
 import numpy as np
-from scipy import sqrt
-from shapely.geometry import Point
-from shapely.geometry.polygon import Polygon
 import WeatherDelay as WD
-import sys
+import ErectionSchedule as ES
+import hashlib
+from collections import OrderedDict
 
 # constants
 km_per_m = 0.001
 hr_per_min = 1/60
 m_per_ft = 0.3048
 
+# crane operations for erection and offloading
+# 'Equipment name': cranes that can be used for operation (any crane if None)
+# 'Hook height': column of component data with height that crane must reach for each lift
+# 'Cycle time': column of component data with cycle time for each lift
+# 'Cranes per lift': number of cranes that share the load for each lift
+# 'Schedule': time frame for operation ('Erection': within 1/3 of construction time, 'Deliveries': at rate of deliveries)
+crane_operations = {'Base': {'Equipment name': None,
+                             'Hook height': 'Lift height m',
+                             'Cycle time': 'Cycle time installation hrs',
+                             'Cranes per lift': 1,
+                             'Schedule': 'Erection'},
+                    'Top': {'Equipment name': None,
+                            'Hook height': 'Lift height m',
+                            'Cycle time': 'Cycle time installation hrs',
+                            'Cranes per lift': 1,
+                            'Schedule': 'Erection'},
+                    'Offload': {'Equipment name': 'Offload crane',
+                                'Hook height': 'Offload hook height m',
+                                'Cycle time': 'Offload cycle time hrs',
+                                'Cranes per lift': 2,
+                                'Schedule': 'Deliveries'}}
+
+
+# cache of crane catalogs by content of crane specifications (see get_crane_catalog) and cache of crew rates by
+# content of crew and crew price data (see get_crew_rates); max_size limits the number of crane catalogs and crew rates
+# kept in each cache (least recently used are evicted first)
+crane_catalog_cache = OrderedDict()
+crew_rates_cache = OrderedDict()
+compiled_cache_settings = {'max_size': 16}
+compiled_cache_stats = {'crane_catalog': {'hits': 0, 'misses': 0, 'evictions': 0},
+                        'crew_rates': {'hits': 0, 'misses': 0, 'evictions': 0}}
+
+
+class InfeasibleErectionError(ValueError):
+    """
+    Raised when no crane in the crane catalog can make one or more lifts, or when a lift for the chosen cranes is never
+    permitted in the weather window of a simulated erection schedule. The lifts that cannot be made are stored in
+    infeasible_lifts (see find_infeasible_lifts), with the reason for each, so that batch runs can record the failure
+    and continue.
+    """
 
-def calculate_erection_operation_time(project_specs, project_data, construct_duration, operational_construction_time):
+    def __init__(self, infeasible_lifts):
+        """
+        :param infeasible_lifts: data frame with lifts that cannot be made (see find_infeasible_lifts)
+        """
+
+        self.infeasible_lifts = infeasible_lifts
+        message = '; '.join('{} operation and {} component ({})'.format(operation, component, reason.lower())
+                            for operation, component, reason in infeasible_lifts[['Operation', 'Component',
+                                                                                  'Reason']].values)
+        super(InfeasibleErectionError, self).__init__('Unable to find crane for {}'.format(message))
+
+
+class CraneCatalog(object):
+    """
+    Crane configurations compiled from crane specifications, with one configuration for each distinct crane (equipment
+    name, crane name, boom system, and crane capacity). The capacity envelope from the load chart and the properties
+    used to calculate operation time are stored as arrays, and configurations are indexed by max hub height and max
+    capacity so that cranes that cannot lift any component are pruned before the capacity envelope is checked.
+    """
+
+    # columns for each crane configuration
+    columns = ['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne',
+               'Max wind speed m per s', 'Setup time hr', 'Hoist speed m per min', 'Speed of travel km per hr',
+               'Crew type ID', 'Envelope min capacity tonne', 'Envelope max capacity tonne',
+               'Envelope min hub height m', 'Envelope max hub height m']
+
+    def __init__(self, crane_specs):
+        """
+        Compiles crane configurations from crane specifications.
+
+        :param crane_specs: data frame with crane specifications (one row for each point on crane load chart)
+        """
+
+        # group crane data by boom system and crane name to get distinct cranes
+        # todo: crew type is first crew type for each crane, which is correct because same for all crane/boom combinations
+        #  but we should come up with a better way to do it
+        crane_grouped = crane_specs.groupby(['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne'])
+        crane_data = crane_grouped.agg(**{'Max wind speed m per s': ('Max wind speed m per s', 'min'),
+                                          'Setup time hr': ('Setup time hr', 'max'),
+                                          'Hoist speed m per min': ('Hoist speed m per min', 'min'),
+                                          'Speed of travel km per hr': ('Speed of travel km per hr', 'min'),
+                                          'Crew type ID': ('Crew type ID', 'first'),
+                                          'Envelope min capacity tonne': ('Max capacity tonne', 'min'),
+                                          'Envelope max capacity tonne': ('Max capacity tonne', 'max'),
+                                          'Envelope min hub height m': ('Hub height m', 'min'),
+                                          'Envelope max hub height m': ('Hub height m', 'max')}).reset_index()
+
+        self.num_configs = len(crane_data)
+        self.data = {column: crane_data[column].values for column in self.columns}
+
+        # configurations sorted by max hub height and by max capacity
+        self.height_order = np.argsort(self.data['Envelope max hub height m'], kind='mergesort')
+        self.sorted_height = self.data['Envelope max hub height m'][self.height_order]
+        self.capacity_order = np.argsort(self.data['Envelope max capacity tonne'], kind='mergesort')
+        self.sorted_capacity = self.data['Envelope max capacity tonne'][self.capacity_order]
+
+    def find_candidates(self, mass, lift_height, equipment_name=None):
+        """
+        Finds crane configurations that could lift at least one of the components, i.e., configurations with max
+        capacity above the lightest component and max hub height above the lowest lift height (the capacity envelope
+        must still be checked for each component, see check_lift_envelope).
+
+        :param mass: array of mass (in tonnes) for each component
+        :param lift_height: array of lift height (in meters) for each component
+        :param equipment_name: if provided, only configurations for this equipment name (e.g., 'Offload crane')
+        :return: array of configurations (in catalog order) that could lift components
+        """
+
+        candidate = np.zeros(self.num_configs, dtype=bool)
+        if len(mass) == 0:
+            return np.flatnonzero(candidate)
+
+        # configurations with max hub height above lowest lift height and max capacity above lightest component
+        taller = self.height_order[np.searchsorted(self.sorted_height, np.min(lift_height), side='right'):]
+        stronger = np.zeros(self.num_configs, dtype=bool)
+        stronger[self.capacity_order[np.searchsorted(self.sorted_capacity, np.min(mass), side='right'):]] = True
+        candidate[taller] = stronger[taller]
+
+        if equipment_name is not None:
+            candidate &= self.data['Equipment name'] == equipment_name
+
+        return np.flatnonzero(candidate)
+
+    def select(self, equipment_name=None):
+        """
+        Selects crane configurations by equipment name.
+
+        :param equipment_name: equipment name of configurations (all configurations if not provided)
+        :return: array of configurations (in catalog order)
+        """
+
+        if equipment_name is None:
+            return np.arange(self.num_configs)
+
+        return np.flatnonzero(self.data['Equipment name'] == equipment_name)
+
+    def to_frame(self, configs=None):
+        """
+        Creates data frame with crane configurations.
+
+        :param configs: array of configurations to include (all configurations if not provided)
+        :return: data frame with one row for each crane configuration
+        """
+
+        if configs is None:
+            configs = np.arange(self.num_configs)
+
+        return pd.DataFrame({column: self.data[column][configs] for column in self.columns}, columns=self.columns)
+
+
+class CrewRates(object):
+    """
+    Crew rates compiled from crew and crew price data. Crews are merged with labor prices and grouped by crew type and
+    operation once, and the crews that are scaled with project size and rate of construction are scaled for each
+    scenario with array operations (see calculate).
+    """
+
+    # crews scaled by number of turbines (for each 100 turbines) and by rate of construction (for each 10 turbines/week)
+    project_size_crews = ['Management - project size']
+    rate_construction_crews = ['Management - rate construction', 'Mechanical completion']
+
+    # columns for grouping crews
+    group_columns = ['Crew type ID', 'Operation', 'Crew type']
+
+    def __init__(self, crew, crew_price):
+        """
+        Merges crew and crew price data and groups crews by crew type and operation.
+
+        :param crew: data frame with number of workers for each crew and labor type
+        :param crew_price: data frame with hourly rate and per diem for each labor type
+        """
+
+        self.crew_cost = pd.merge(crew, crew_price, on=['Labor type ID'])
+        self.num_workers = self.crew_cost['Number of workers'].values.astype(float)
+        self.hourly_rate = self.crew_cost['Hourly rate USD per hour'].values.astype(float)
+        self.per_diem = self.crew_cost['Per diem USD per day'].values.astype(float)
+        self.project_size_bool = self.crew_cost['Crew name'].isin(self.project_size_crews).values
+        self.rate_construction_bool = self.crew_cost['Crew name'].isin(self.rate_construction_crews).values
+
+        # group for each crew (crews with missing group columns are not in a group)
+        crew_grouped = self.crew_cost.groupby(self.group_columns)
+        self.group_id = crew_grouped.ngroup().fillna(-1).values.astype(int)
+        self.grouped = crew_grouped.size().reset_index()[self.group_columns]
+        self.management_bool = self.grouped['Operation'].isin(['Management', 'Mechanical completion']).values
+
+    def calculate(self, num_turbines, rate_construction, overtime_multiplier):
+        """
+        Calculates crew rates for a scenario.
+
+        :param num_turbines: number of turbines
+        :param rate_construction: rate of construction (number of turbines per week)
+        :param overtime_multiplier: overtime multiplier for labor costs (40 hrs/wk vs. 60 hrs/wk)
+        :return: data frame with rates for each crew, data frame with rates grouped by crew type and operation, and
+                 hourly rate and per diem for all management crews
+        """
+
+        # increase management crews by project size and by rate of construction (scale if greater than 10/wk)
+        scale = np.where(self.project_size_bool, np.ceil(num_turbines / 100), 1)
+        scale = np.where(self.rate_construction_bool, np.ceil(rate_construction / 10), scale)
+        num_workers = np.where(self.project_size_bool | self.rate_construction_bool,
+                               np.round(self.num_workers * scale), self.num_workers)
+
+        # calculate crew costs
+        hourly_rate_all = self.hourly_rate * num_workers * overtime_multiplier
+        per_diem_all = self.per_diem * num_workers
+        crew_cost = self.crew_cost.assign(**{'Number of workers': num_workers,
+                                             'Hourly rate for all workers': hourly_rate_all,
+                                             'Per diem all workers': per_diem_all})
+
+        # sum crew costs by crew type and operation
+        grouped = self.group_id >= 0
+        crew_cost_grouped = self.grouped.assign(**{column: np.bincount(self.group_id[grouped],
+                                                                       weights=values[grouped],
+                                                                       minlength=len(self.grouped))
+                                                   for column, values in [('Number of workers', num_workers),
+                                                                          ('Hourly rate for all workers', hourly_rate_all),
+                                                                          ('Per diem all workers', per_diem_all)]})
+
+        # get total rate for management crew
+        hourly_management = crew_cost_grouped['Hourly rate for all workers'].values[self.management_bool].sum()
+        per_diem_management = crew_cost_grouped['Per diem all workers'].values[self.management_bool].sum()
+
+        return crew_cost, crew_cost_grouped, hourly_management, per_diem_management
+
+
+def get_crew_rates(crew, crew_price):
+    """
+    Gets the crew rates for crew and crew price data (compiled once for each distinct set of crew and crew price data).
+
+    :param crew: data frame with number of workers for each crew and labor type
+    :param crew_price: data frame with hourly rate and per diem for each labor type
+    :return: crew rates for crew and crew price data
+    """
+
+    key = hashlib.sha1(b''.join(pd.util.hash_pandas_object(data, index=False).values.tobytes() +
+                                repr(list(data.columns)).encode() for data in [crew, crew_price])).hexdigest()
+    return load_compiled(cache=crew_rates_cache, stats=compiled_cache_stats['crew_rates'], key=key,
+                         compiled_class=CrewRates, data=[crew, crew_price])
+
+
+def get_crane_catalog(crane_specs):
+    """
+    Gets the crane catalog for crane specifications (compiled once for each distinct set of crane specifications).
+
+    :param crane_specs: data frame with crane specifications
+    :return: crane catalog for crane specifications
+    """
+
+    key = hashlib.sha1(pd.util.hash_pandas_object(crane_specs, index=False).values.tobytes() +
+                       repr(list(crane_specs.columns)).encode()).hexdigest()
+    return load_compiled(cache=crane_catalog_cache, stats=compiled_cache_stats['crane_catalog'], key=key,
+                         compiled_class=CraneCatalog, data=[crane_specs])
+
+
+def load_compiled(cache, stats, key, compiled_class, data):
+    """
+    Loads a compiled crane catalog or crew rates from its cache, or compiles it and adds it to the cache if it is not
+    in the cache.
+
+    :param cache: cache of compiled crane catalogs or crew rates (crane_catalog_cache or crew_rates_cache)
+    :param stats: statistics for cache (see compiled_cache_stats)
+    :param key: hash of input data for compiled crane catalog or crew rates
+    :param compiled_class: class of compiled data (CraneCatalog or CrewRates)
+    :param data: list of input data frames used to compile crane catalog or crew rates
+    :return: compiled crane catalog or crew rates
     """
-    Calculates operation time required for each type of equipment included in project data.
+
+    if key in cache:
+        stats['hits'] += 1
+        cache.move_to_end(key)
+    else:
+        stats['misses'] += 1
+        cache[key] = compiled_class(*data)
+        evict_compiled_cache()
+
+    return cache[key]
+
+
+def configure_compiled_cache(max_size=None):
+    """
+    Sets size limit for the crane catalog and crew rates caches used by get_crane_catalog and get_crew_rates.
+
+    :param max_size: maximum number of crane catalogs (and of crew rates) to keep in cache
+    """
+
+    if max_size is not None:
+        if max_size < 1:
+            raise ValueError('Compiled cache size must be at least 1')
+        compiled_cache_settings['max_size'] = int(max_size)
+
+    evict_compiled_cache()
+
+
+def evict_compiled_cache():
+    """
+    Evicts least recently used crane catalogs and crew rates until each cache is within its size limit.
+    """
+
+    for name, cache in [('crane_catalog', crane_catalog_cache), ('crew_rates', crew_rates_cache)]:
+        while len(cache) > compiled_cache_settings['max_size']:
+            cache.popitem(last=False)
+            compiled_cache_stats[name]['evictions'] += 1
+
+
+def get_compiled_cache_stats():
+    """
+    Gets statistics for the crane catalog and crew rates caches used by get_crane_catalog and get_crew_rates.
+
+    :return: dictionary with number of cache hits, cache misses, evictions, and cached items for the crane catalog
+             cache ('crane_catalog') and crew rates cache ('crew_rates')
+    """
+
+    stats = {name: dict(compiled_cache_stats[name]) for name in compiled_cache_stats}
+    stats['crane_catalog']['size'] = len(crane_catalog_cache)
+    stats['crew_rates']['size'] = len(crew_rates_cache)
+    return stats
+
+
+def clear_compiled_cache():
+    """
+    Clears the crane catalog and crew rates caches used by get_crane_catalog and get_crew_rates and resets their
+    statistics.
+    """
+
+    crane_catalog_cache.clear()
+    crew_rates_cache.clear()
+    for name in compiled_cache_stats:
+        for key in compiled_cache_stats[name]:
+            compiled_cache_stats[name][key] = 0
+
+
+def check_lift_envelope(capacity_min, capacity_max, height_min, height_max, mass, lift_height):
+    """
+    Checks if each crane can lift each component based on the capacity envelope from the crane load chart. The capacity
+    envelope is the polygon with vertices (0, 0), (0, max height), (min capacity, max height), (max capacity, min height),
+    and (max capacity, 0); a component can be lifted if its mass and lift height are inside the envelope (not on the
+    boundary).
+
+    :param capacity_min: array of minimum capacity (in tonnes) from load chart for each crane
+    :param capacity_max: array of maximum capacity (in tonnes) from load chart for each crane
+    :param height_min: array of minimum hub height (in meters) from load chart for each crane
+    :param height_max: array of maximum hub height (in meters) from load chart for each crane
+    :param mass: array of mass (in tonnes) for each component
+    :param lift_height: array of lift height (in meters) for each component
+    :return: boolean matrix that is true where crane (rows) can lift component (columns)
+    """
+
+    [capacity_min, capacity_max, height_min, height_max] = [np.asarray(value, dtype=float)[:, np.newaxis]
+                                                            for value in [capacity_min, capacity_max,
+                                                                          height_min, height_max]]
+    mass = np.asarray(mass, dtype=float)[np.newaxis, :]
+    lift_height = np.asarray(lift_height, dtype=float)[np.newaxis, :]
+
+    # components must be below sloped edge from (min capacity, max height) to (max capacity, min height)
+    # (edge is vertical if min capacity equals max capacity)
+    sloped_edge = ((capacity_max - capacity_min) * (lift_height - height_max) -
+                   (height_min - height_max) * (mass - capacity_min))
+
+    return ((mass > 0) & (mass < capacity_max) & (lift_height > 0) & (lift_height < height_max) &
+            ((sloped_edge < 0) | (capacity_max == capacity_min)))
+
+
+def calculate_component_crane_rows(component_group, crane_candidates, vmax, crane_bool):
+    """
+    Creates one row for each crane and component with the max permissible wind speed and whether the crane can lift the
+    component (rows for each crane are in component order).
+
+    :param component_group: data frame with components for operation
+    :param crane_candidates: data frame with cranes that could lift components (see CraneCatalog.find_candidates)
+    :param vmax: matrix of max permissible wind speed for each crane (rows) and component (columns)
+    :param crane_bool: boolean matrix that is true where crane (rows) can lift component (columns)
+    :return: data frame with component data, max permissible wind speed, crane name, boom system, and crane boolean
+             for each crane and component
+    """
+
+    num_components = len(component_group)
+    component_rows = np.tile(np.arange(num_components), len(crane_candidates))
+
+    return component_group.take(component_rows).assign(**{'vmax': np.ravel(vmax),
+                                                          'Crane name': np.repeat(crane_candidates['Crane name'].values, num_components),
+                                                          'Boom system': np.repeat(crane_candidates['Boom system'].values, num_components),
+                                                          'crane_bool': np.ravel(crane_bool)})
+
+
+def create_operation_lifts(project_specs, components, operations):
+    """
+    Creates the lifts for each crane operation. Components above the breakpoint between base and topping are lifted in
+    the topping operation and the rest in the base operation; other operations lift every component.
+
+    :param project_specs: data frame with project details (from project input file)
+    :param components: data frame with component properties
+    :param operations: list of crane operations (see crane_operations)
+    :return: data frame with component properties for each lift, with 'Operation', 'Hook height m', 'Hoist load tonne'
+             (load for each crane), and 'Lift cycle time hrs'
+    """
+
+    # for components in component list determine if base or topping
+    top_bool = components['Lift height m'] > (float((project_specs['Hub height m'] *
+                                                     project_specs['Breakpoint between base and topping (percent)']).iloc[0]))
+    operation_components = {'Base': ~top_bool.values, 'Top': top_bool.values}
+
+    # rows of component data lifted in each operation
+    operation_rows = [np.flatnonzero(operation_components.get(operation, np.ones(len(components), dtype=bool)))
+                      for operation in operations]
+    rows = np.concatenate(operation_rows).astype(int)
+
+    # lifts are added to a new data frame so that input data for project is not changed
+    cranes_per_lift = np.repeat([crane_operations[operation]['Cranes per lift'] for operation in operations],
+                                [len(operation_row) for operation_row in operation_rows])
+    lifts = components.take(rows).reset_index(drop=True)
+    lifts['Operation'] = np.repeat(operations, [len(operation_row) for operation_row in operation_rows]).astype(object)
+    for [column, key] in [('Hook height m', 'Hook height'), ('Lift cycle time hrs', 'Cycle time')]:
+        # values from component data column for each operation (see crane_operations)
+        lifts[column] = np.concatenate([components[crane_operations[operation][key]].values[operation_row]
+                                        for operation, operation_row in zip(operations, operation_rows)]).astype(float)
+    lifts['Hoist load tonne'] = lifts['Mass tonne'].values / cranes_per_lift
+
+    return lifts
+
+
+def check_operation_lifts(lifts, crane_catalog):
+    """
+    Checks which cranes in the crane catalog can make each lift using the capacity envelope of each crane (cranes that
+    are too short or too small to make any lift are pruned first) and the equipment name for each operation. Lifts that
+    no crane can make are reported with the reason (no crane with the equipment name for the operation, no crane tall
+    enough for the lift, or no tall enough crane with enough capacity) and the nearest capacity crane: the crane allowed
+    for the operation that is tall enough for the lift with max capacity closest to the hoist load (or the tallest crane
+    if none are tall enough; nearest crane columns are missing if no crane is allowed for the operation).
+
+    :param lifts: data frame with lifts for each operation (see create_operation_lifts)
+    :param crane_catalog: crane catalog (see get_crane_catalog)
+    :return: array of candidate configurations, boolean matrix that is true where candidate (rows) can make lift
+             (columns), and data frame with lifts that cannot be made (no rows if all lifts can be made)
+    """
+
+    operation = lifts['Operation'].values
+    hoist_load = lifts['Hoist load tonne'].values
+    hook_height = lifts['Hook height m'].values
+    data = crane_catalog.data
+
+    # prune cranes that are too short or too small to make any lift in any operation
+    candidates = crane_catalog.find_candidates(mass=hoist_load, lift_height=hook_height)
+
+    # check if each lift can be made by each crane without wind loading (crane rows, lift columns)
+    lift_bool = check_lift_envelope(capacity_min=data['Envelope min capacity tonne'][candidates],
+                                    capacity_max=data['Envelope max capacity tonne'][candidates],
+                                    height_min=data['Envelope min hub height m'][candidates],
+                                    height_max=data['Envelope max hub height m'][candidates],
+                                    mass=hoist_load,
+                                    lift_height=hook_height)
+
+    # only use cranes with the equipment name for the operation
+    allowed_bool = np.ones((crane_catalog.num_configs, len(lifts)), dtype=bool)
+    for name_operation in set(operation):
+        equipment_name = crane_operations[name_operation]['Equipment name']
+        if equipment_name is not None:
+            allowed_bool[:, operation == name_operation] = (data['Equipment name'] == equipment_name)[:, np.newaxis]
+    lift_bool &= allowed_bool[candidates]
+
+    # report lifts that cannot be made with nearest capacity crane
+    infeasible_lifts = list()
+    for lift in np.flatnonzero(~lift_bool.any(axis=0)):
+        allowed = allowed_bool[:, lift]
+        tall_enough = allowed & (data['Envelope max hub height m'] > hook_height[lift])
+        if tall_enough.any():
+            reason = 'Crane capacity too small'
+            capacity_gap = np.where(tall_enough,
+                                    np.abs(data['Envelope max capacity tonne'] - hoist_load[lift]),
+                                    np.inf)
+            nearest = np.argmin(capacity_gap)
+        elif allowed.any():
+            reason = 'Crane hub height too small'
+            nearest = np.argmax(np.where(allowed, data['Envelope max hub height m'], -np.inf))
+        else:
+            reason = 'No crane for equipment name'
+            nearest = None
+        infeasible_lifts.append([operation[lift], lifts['Component'].values[lift], hoist_load[lift], hook_height[lift],
+                                 reason] +
+                                [np.nan if nearest is None else data[column][nearest]
+                                 for column in ['Crane name', 'Boom system', 'Envelope max capacity tonne',
+                                                'Envelope max hub height m']])
+
+    infeasible_lifts = pd.DataFrame(infeasible_lifts,
+                                    columns=['Operation', 'Component', 'Hoist load tonne', 'Hook height m', 'Reason',
+                                             'Nearest crane name', 'Nearest boom system',
+                                             'Nearest crane max capacity tonne', 'Nearest crane max hub height m'])
+
+    return candidates, lift_bool, infeasible_lifts
+
+
+def find_infeasible_lifts(project_specs, project_data, operations=None):
+    """
+    Finds lifts that no crane can make (pre-screen with the capacity envelope of each crane, see check_operation_lifts)
+    without calculating operation time or costs.
+
+    :param project_specs: data frame with project details (from project input file)
+    :param project_data: dictionary of data frames for each of the csv files loaded for the project
+    :param operations: list of crane operations (all crane operations if not provided, see crane_operations)
+    :return: data frame with lifts that cannot be made, with the reason and the nearest capacity crane for each lift
+             (no rows if all lifts can be made)
+    """
+
+    if operations is None:
+        operations = list(crane_operations)
+
+    lifts = create_operation_lifts(project_specs=project_specs,
+                                   components=project_data['components'],
+                                   operations=operations)
+
+    return check_operation_lifts(lifts=lifts, crane_catalog=get_crane_catalog(project_data['crane_specs']))[2]
+
+
+def calculate_operation_time(project_specs, project_data, operations, construct_duration,
+                             operational_construction_time, rate_of_deliveries=None):
+    """
+    Calculates operation time for each crane and crane operation (e.g., base, topping, and offloading) in one pass over
+    the crane catalog and the lifts for all operations.
 
     :param project_specs: data frame with project details (from project input file)
     :param project_data: dictionary of data frames for each of the csv files loaded for the project
+    :param operations: list of crane operations (see crane_operations)
     :param construct_duration: duration of construction (in months)
     :param operational_construction_time: operational hours of construction
-    :return: list of possible cranes that could be used to erect tower and turbine
+    :param rate_of_deliveries: rate of deliveries (number of turbines per week; needed for offloading)
+    :return: data frame of possible cranes for each lift, data frame of operation time for each crane and operation,
+             and data frame of lifts that cannot be made (see check_operation_lifts; if there are any, operation time
+             is not calculated and the other data frames are empty)
     """
-    erection_construction_time = 1/3 * construct_duration
 
-    print('Calculating operation time for erection...')
-    # group project data by project ID
+    print('Calculating operation time for {}...'.format(', '.join(operations).lower()))
     project = project_specs
-
-    # for components in component list determine if base or topping
-    project_data['components']['Operation'] = project_data['components']['Lift height m'] > (float(project['Hub height m'] * project['Breakpoint between base and topping (percent)']))
-    boolean_dictionary = {True: 'Top', False: 'Base'}
-    project_data['components']['Operation'] = project_data['components']['Operation'].map(boolean_dictionary)
-
-    # create groups for operations
-    top_v_base = project_data['components'].groupby(['Operation'])
-
-    # group crane data by boom system and crane name to get distinct cranes
-    crane_grouped = project_data['crane_specs'].groupby(['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne'])
-
-    crane_poly = pd.DataFrame(columns=['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne', 'Crane poly'])
-    for name, crane in crane_grouped:
-        crane = crane.reset_index(drop=True)
-        x = crane['Max capacity tonne']
-        y = crane['Hub height m']
-        wind_speed = min(crane['Max wind speed m per s'])
-        hoist_speed = min(crane['Hoist speed m per min'])
-        travel_speed = min(crane['Speed of travel km per hr'])
-        setup_time = max(crane['Setup time hr'])
-        crew_type = crane['Crew type ID'][0]  #todo: fix this so it's not a hack... need to rethink data structure - right now just picking first crew type - this is correct because same for all crane/boom combinations but we should come up with a better way to do it
-        polygon = Polygon([(0, 0), (0, max(y)), (min(x), max(y)), (max(x), min(y)), (max(x), 0)])
-        df = pd.DataFrame([[name[0],
-                            name[1],
-                            name[2],
-                            name[3],
-                            wind_speed,
-                            setup_time,
-                            hoist_speed,
-                            travel_speed,
-                            crew_type,
-                            polygon]],
-                            columns=['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne',
-                                     'Max wind speed m per s', 'Setup time hr',
-                                     'Hoist speed m per min', 'Speed of travel km per hr',
-                                     'Crew type ID', 'Crane poly'])
-        crane_poly = crane_poly.append(df, sort=True)
-
-    # loop through operation type (topping vs. base)
-    rownew = pd.Series()
-    component_max_speed = pd.DataFrame()
-    crane_poly_new = crane_poly
-    for name_operation, component_group in top_v_base:
-        # calculate polygon for crane capacity and check if component can be lifted by each crane without wind loading
-        for idx, crane in crane_poly.iterrows():
-            polygon = crane['Crane poly']
-
-            for component in component_group['Component']:
-                # get weight and height of component in each component group
-                component_only = component_group.where(component_group['Component'] == component).dropna(thresh=1)
-                point = Point(component_only['Mass tonne'], component_only['Lift height m'])
-                crane['Lift boolean {component}'.format(component=component)] = polygon.contains(point)
-
-            rownew = rownew.append(crane)
-
-            bool_list = list()
-            for component in component_group['Component']:
-                if crane['Lift boolean {component}'.format(component=component)] is False:
-                    crane_bool = False
-                else:
-                    crane_bool = True
-                bool_list.append(crane_bool)
-
-            # calculate max permissible wind speed
-            # equation for calculating permissible wind speed:
-            # vmax = max_TAB * sqrt(1.2 * mh / aw), where
-            # mh = hoist load
-            # aw = area exposed to wind = surface area * coeff drag
-            # 1.2 = constant in m^2 / t
-            # vmax_tab = maximum load speed per load chart
-            # source: pg. 33 of Liebherr
-
-            mh = component_group['Mass tonne']
-            aw = component_group['Surface area sq m'] * component_group['Coeff drag']
-            vmax_tab = crane['Max wind speed m per s']
-            vmax_calc = vmax_tab * sqrt(1.2 * mh / aw)
-
-            # if vmax_calc is less than vmax_tab then vmax_calc, otherwise vmax_tab (based on pg. 33 of Liebherr)
-            # todo: check vmax - should it be set to calculated value rather than vmax_tab if greater?
-            component_group_new = pd.DataFrame(component_group,
-                                               columns=list(component_group.columns.values) + ['vmax',
-                                                                                               'Crane name',
-                                                                                               'Boom system',
-                                                                                               'crane_bool'])
-            component_group_new['vmax'] = list((min(vmax_tab, x) for x in vmax_calc))
-            component_group_new['Crane name'] = crane['Crane name']
-            component_group_new['Boom system'] = crane['Boom system']
-            component_group_new['crane_bool'] = bool_list
-
-            component_max_speed = component_max_speed.append(component_group_new, sort=True)
-
-        crane_poly_new['Crane bool {operation}'.format(operation=name_operation)] = min(bool_list)
-
-    crane_poly = crane_poly_new
-
-    # join crane polygon to crane specs
-    crane_component = pd.merge(crane_poly, component_max_speed, on=['Crane name', 'Boom system'])
-
-    # select only cranes that could lift the component
-    possible_cranes = crane_component.where(crane_component['crane_bool'] == True).dropna(thresh=1).reset_index(drop=True)
+    lifts = create_operation_lifts(project_specs=project_specs,
+                                   components=project_data['components'],
+                                   operations=operations)
+
+    # check which cranes can make each lift; stop before calculating operation time if any lift cannot be made
+    crane_catalog = get_crane_catalog(project_data['crane_specs'])
+    [candidates, lift_bool, infeasible_lifts] = check_operation_lifts(lifts=lifts, crane_catalog=crane_catalog)
+    if len(infeasible_lifts) != 0:
+        for operation, component, reason in infeasible_lifts[['Operation', 'Component', 'Reason']].values:
+            print('Error: Unable to find crane for {} operation and {} component ({})'.format(operation, component,
+                                                                                            reason.lower()))
+        return pd.DataFrame(), pd.DataFrame(), infeasible_lifts
+
+    crane_candidates = crane_catalog.to_frame(candidates)
+
+    # calculate max permissible wind speed for each crane (rows) and lift (columns)
+    # equation for calculating permissible wind speed:
+    # vmax = max_TAB * sqrt(1.2 * mh / aw), where
+    # mh = hoist load
+    # aw = area exposed to wind = surface area * coeff drag
+    # 1.2 = constant in m^2 / t
+    # vmax_tab = maximum load speed per load chart
+    # source: pg. 33 of Liebherr
+
+    mh = lifts['Hoist load tonne'].values
+    aw = (lifts['Surface area sq m'] * lifts['Coeff drag']).values
+    vmax_tab = crane_candidates['Max wind speed m per s'].values.astype(float)[:, np.newaxis]
+    vmax_calc = vmax_tab * np.sqrt(1.2 * mh / aw)
+
+    # if vmax_calc is less than vmax_tab then vmax_calc, otherwise vmax_tab (based on pg. 33 of Liebherr)
+    # todo: check vmax - should it be set to calculated value rather than vmax_tab if greater?
+    component_max_speed = calculate_component_crane_rows(component_group=lifts,
+                                                         crane_candidates=crane_candidates,
+                                                         vmax=np.where(vmax_calc < vmax_tab, vmax_calc, vmax_tab),
+                                                         crane_bool=lift_bool)
+
+    # join crane data to crane and lift combinations and select only cranes that could make the lift
+    crane_component = pd.merge(crane_candidates, component_max_speed, on=['Crane name', 'Boom system'])
+    possible_cranes = crane_component[crane_component['crane_bool'].values].reset_index(drop=True)
 
     # calculate travel time per cycle
-    turbine_spacing = float(project['Turbine spacing (times rotor diameter)'] * project['Rotor diameter m'] * km_per_m)
-    turbine_num = float(project['Number of turbines'])
+    turbine_spacing = float((project['Turbine spacing (times rotor diameter)'] * project['Rotor diameter m'] * km_per_m).iloc[0])
+    turbine_num = float(project['Number of turbines'].iloc[0])
     possible_cranes['Travel time hr'] = turbine_spacing / possible_cranes['Speed of travel km per hr'] * turbine_num
 
-    # calculate erection time
+    # calculate operation time
     possible_cranes['Operation time hr'] = ((possible_cranes['Lift height m'] / possible_cranes['Hoist speed m per min'] * hr_per_min)
-                                            + (possible_cranes['Cycle time installation hrs'])
+                                            + (possible_cranes['Lift cycle time hrs'])
                                             ) * turbine_num
 
     # store setup time
     possible_cranes['Setup time hr'] = possible_cranes['Setup time hr'] * turbine_num
 
-    erection_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
-                                             'Boom system', 'Operation'])['Operation time hr'].sum()
-    travel_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
-                                           'Boom system', 'Operation'])['Travel time hr'].max()
-    setup_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
-                                          'Boom system', 'Operation'])['Setup time hr'].max()
-    rental_time_without_weather = erection_time + travel_time + setup_time
+    operation_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
+                                              'Boom system', 'Operation']).agg(**{'Operation time hr': ('Operation time hr', 'sum'),
+                                                                                  'Travel time hr': ('Travel time hr', 'max'),
+                                                                                  'Setup time hr': ('Setup time hr', 'max')})
+    rental_time_without_weather = (operation_time['Operation time hr'] + operation_time['Travel time hr'] +
+                                   operation_time['Setup time hr'])
 
     operation_time = rental_time_without_weather.reset_index()
     operation_time = operation_time.rename(columns={0: 'Operation time all turbines hrs'})
     operation_time['Operational construct days'] = (operation_time['Operation time all turbines hrs'] /
                                                     operational_construction_time)
 
-    # if more than one crew needed to complete within construction duration then assume that all construction happens
-    # within that window and use that time frame for weather delays; if not, use the number of days calculated
-    operation_time['time_construct_bool'] = (operation_time['Operational construct days'] >
-                                             erection_construction_time * 30)
-    boolean_dictionary = {True: erection_construction_time * 30, False: np.NAN}
-    operation_time['time_construct_bool'] = operation_time['time_construct_bool'].map(boolean_dictionary)
-    operation_time['Time construct days'] = operation_time[['time_construct_bool', 'Operational construct days']].min(axis=1)
-
-    #print(possible_cranes[['Crane name', 'Component', 'Operation time hr', 'Operation']])
-    for operation, component_group in top_v_base:
-        unique_component_crane = possible_cranes.loc[possible_cranes['Operation'] == operation]['Component'].unique()
-        for component in component_group['Component']:
-            if component not in unique_component_crane:
-                error = 1
-                sys.exit('Error: Unable to find installation crane for {} operation and {} component'.format(operation, component))
-            else:
-                error = 0
-        if error == 0:
-            print('Crane(s) found for all components for {} installation'.format(operation))
-
-    return possible_cranes, operation_time, error
+    # erection: if more than one crew needed to complete within construction duration then assume that all
+    # construction happens within that window and use that time frame for weather delays; if not, use the number of
+    # days calculated
+    # deliveries: if offloading is faster than deliveries, offloading takes as long as deliveries
+    schedule = operation_time['Operation'].map({operation: crane_operations[operation]['Schedule']
+                                                for operation in operations}).values
+    construct_days = operation_time['Operational construct days'].values
+    if construct_duration is not None:
+        erection_construct_days = np.minimum(construct_days, 1/3 * construct_duration * 30)
+    else:
+        erection_construct_days = construct_days
+    if rate_of_deliveries is not None:
+        delivery_days = turbine_num / (float(rate_of_deliveries) / 6)
+        delivery_construct_days = np.where(turbine_num / construct_days * 6 > float(rate_of_deliveries),
+                                           np.maximum(delivery_days, construct_days), construct_days)
+    else:
+        delivery_construct_days = construct_days
+    operation_time['Time construct days'] = np.where(schedule == 'Erection', erection_construct_days,
+                                                     delivery_construct_days)
+
+    for operation in operations:
+        print('Crane(s) found for all components for {} operation'.format(operation))
+
+    return possible_cranes, operation_time, infeasible_lifts
+
+
+def calculate_erection_operation_time(project_specs, project_data, construct_duration, operational_construction_time):
+    """
+    Calculates operation time required for each crane for base and topping (see calculate_operation_time).
+
+    :param project_specs: data frame with project details (from project input file)
+    :param project_data: dictionary of data frames for each of the csv files loaded for the project
+    :param construct_duration: duration of construction (in months)
+    :param operational_construction_time: operational hours of construction
+    :return: list of possible cranes that could be used to erect tower and turbine, operation time, and lifts that
+             cannot be made
+    """
+
+    return calculate_operation_time(project_specs=project_specs,
+                                    project_data=project_data,
+                                    operations=['Base', 'Top'],
+                                    construct_duration=construct_duration,
+                                    operational_construction_time=operational_construction_time)
 
 
 def calculate_offload_operation_time(project_specs, project_data, operational_construction_time, rate_of_deliveries):
     """
+    Calculates operation time required for each crane for offloading (see calculate_operation_time).
 
     :param project_specs: data frame with project details (from project input file)
     :param project_data: dictionary of data frames for each of the csv files loaded for the project
     :param operational_construction_time: operational hours of construction
     :param rate_of_deliveries: rate of deliveries
-    :return: operation time for offloading
+    :return: list of possible cranes that could be used for offloading, operation time, and lifts that cannot be made
     """
-    # group project data by project ID
-    project = project_specs
 
-    offload_cranes = project_data['crane_specs'].where(project_data['crane_specs']['Equipment name'] == 'Offload crane')
-
-    # group crane data by boom system and crane name to get distinct cranes
-    crane_grouped = offload_cranes.groupby(
-        ['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne'])
-
-    crane_poly = pd.DataFrame(
-        columns=['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne', 'Crane poly'])
-    for name, crane in crane_grouped:
-        crane = crane.reset_index(drop=True)
-        x = crane['Max capacity tonne']
-        y = crane['Hub height m']
-        wind_speed = min(crane['Max wind speed m per s'])
-        hoist_speed = min(crane['Hoist speed m per min'])
-        travel_speed = min(crane['Speed of travel km per hr'])
-        setup_time = max(crane['Setup time hr'])
-        crew_type = crane['Crew type ID'][
-            0]  # todo: fix this so it's not a hack... need to rethink data structure - right now just picking first crew type - this is correct because same for all crane/boom combinations but we should come up with a better way to do it
-        polygon = Polygon([(0, 0), (0, max(y)), (min(x), max(y)), (max(x), min(y)), (max(x), 0)])
-        df = pd.DataFrame([[name[0],
-                            name[1],
-                            name[2],
-                            name[3],
-                            wind_speed,
-                            setup_time,
-                            hoist_speed,
-                            travel_speed,
-                            crew_type,
-                            polygon]],
-                          columns=['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne',
-                                   'Max wind speed m per s', 'Setup time hr',
-                                   'Hoist speed m per min', 'Speed of travel km per hr',
-                                   'Crew type ID', 'Crane poly'])
-        crane_poly = crane_poly.append(df, sort=True)
-
-    rownew = pd.Series()
-    component_max_speed = pd.DataFrame()
-    crane_poly_new = crane_poly
-
-    component_group = project_data['components']
-
-    for idx, crane in crane_poly.iterrows():
-        polygon = crane['Crane poly']
-
-        for component in component_group['Component']:
-            # get weight and height of component in each component group
-            component_only = component_group.where(component_group['Component'] == component).dropna(thresh=1)
-            point = Point(component_only['Mass tonne'] / 2, component_only['Offload hook height m'])  # weight ivided by two because assuming two offload cranes are used
-            crane['Lift boolean {component}'.format(component=component)] = polygon.contains(point)
-
-        rownew = rownew.append(crane)
-
-        bool_list = list()
-        for component in component_group['Component']:
-            if crane['Lift boolean {component}'.format(component=component)] is False:
-                crane_bool = False
-            else:
-                crane_bool = True
-
-            bool_list.append(crane_bool)
-
-        # calculate max permissible wind speed
-        # equation for calculating permissible wind speed:
-        # vmax = max_TAB * sqrt(1.2 * mh / aw), where
-        # mh = hoist load
-        # aw = area exposed to wind = surface area * coeff drag
-        # 1.2 = constant in m^2 / t
-        # vmax_tab = maximum load speed per load chart
-        # source: pg. 33 of Liebherr
-
-        mh = component_group['Mass tonne'] / 2  # divided by two because assuming two offload cranes are used
-        aw = component_group['Surface area sq m'] * component_group['Coeff drag']
-        vmax_tab = crane['Max wind speed m per s']
-        vmax_calc = vmax_tab * sqrt(1.2 * mh / aw)
-
-        # if vmax_calc is less than vmax_tab then vmax_calc, otherwise vmax_tab (based on pg. 33 of Liebherr)
-        # todo: check vmax - should it be set to calculated value rather than vmax_tab if greater?
-        component_group_new = pd.DataFrame(component_group,
-                                           columns=list(component_group.columns.values) + ['vmax',
-                                                                                           'Crane name',
-                                                                                           'Boom system',
-                                                                                           'crane_bool'])
-        component_group_new['vmax'] = list((min(vmax_tab, x) for x in vmax_calc))
-        component_group_new['Crane name'] = crane['Crane name']
-        component_group_new['Boom system'] = crane['Boom system']
-        component_group_new['crane_bool'] = bool_list
-
-        component_max_speed = component_max_speed.append(component_group_new, sort=True)
-
-    crane_poly_new['Crane bool {operation}'.format(operation='offload')] = min(bool_list)
-
-    crane_poly = crane_poly_new
-
-    if len(crane_poly) != 0:
-        # join crane polygon to crane specs
-        crane_component = pd.merge(crane_poly, component_max_speed, on=['Crane name', 'Boom system'])
-
-        # select only cranes that could lift the component
-        possible_cranes = crane_component.where(crane_component['crane_bool'] == True).dropna(thresh=1).reset_index(
-            drop=True)
-
-        # calculate travel time per cycle
-        turbine_spacing = float(project['Turbine spacing (times rotor diameter)'] * project['Rotor diameter m'] * km_per_m)
-        turbine_num = float(project['Number of turbines'])
-        possible_cranes['Travel time hr'] = turbine_spacing / possible_cranes['Speed of travel km per hr'] * turbine_num
-
-        # calculate erection time
-        possible_cranes['Operation time hr'] = ((possible_cranes['Lift height m'] / possible_cranes[
-            'Hoist speed m per min'] * hr_per_min)
-                                                + (possible_cranes['Offload cycle time hrs'])
-                                                ) * turbine_num
-
-        # store setup time
-        possible_cranes['Setup time hr'] = possible_cranes['Setup time hr'] * turbine_num
-
-        erection_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
-                                                 'Boom system'])['Operation time hr'].sum()
-        travel_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
-                                               'Boom system'])['Travel time hr'].max()
-        setup_time = possible_cranes.groupby(['Crane name', 'Equipment name', 'Crane capacity tonne', 'Crew type ID',
-                                              'Boom system'])['Setup time hr'].max()
-        rental_time_without_weather = erection_time + travel_time + setup_time
-
-        operation_time = rental_time_without_weather.reset_index()
-        operation_time = operation_time.rename(columns={0: 'Operation time all turbines hrs'})
-        operation_time['Operational construct days'] = (operation_time['Operation time all turbines hrs'] /
-                                                        operational_construction_time)
-
-        # if more than one crew needed to complete within construction duration then assume that all construction happens
-        # within that window and use that timeframe for weather delays; if not, use the number of days calculated
-        operation_time['time_construct_bool'] = (turbine_num / operation_time['Operational construct days'] * 6
-                                                 > float(rate_of_deliveries))
-        boolean_dictionary = {True: (float(turbine_num) / (float(rate_of_deliveries) / 6)), False: np.NAN}
-        operation_time['time_construct_bool'] = operation_time['time_construct_bool'].map(boolean_dictionary)
-        operation_time['Time construct days'] = operation_time[['time_construct_bool', 'Operational construct days']].max(
-            axis=1)
-
-        possible_cranes['Operation'] = 'Offload'
-        operation_time['Operation'] = 'Offload'
-    else:
-        possible_cranes = []
-        operation_time = []
-
-    #print(possible_cranes[['Crane name', 'Component', 'Operation time hr']])
-    unique_components = project_data['components']['Component'].unique()
-    unique_component_crane = possible_cranes['Component'].unique()
-    for component in unique_components:
-        if component not in unique_component_crane:
-            error = 1
-            sys.exit('Error: Unable to find offload crane for {}'.format(component))
-        else:
-            error = 0
-    if error == 0:
-        print('Crane(s) found for all components for offloading')
-
-    return possible_cranes, operation_time, error
+    return calculate_operation_time(project_specs=project_specs,
+                                    project_data=project_data,
+                                    operations=['Offload'],
+                                    construct_duration=None,
+                                    operational_construction_time=operational_construction_time,
+                                    rate_of_deliveries=rate_of_deliveries)
 
 
-def calculate_wind_delay_by_component(crane_specs, weather_window, wind_shear_exponent):
+def calculate_wind_delay_by_component(crane_specs, weather_window, wind_shear_exponent, weather_index=None):
     """
     Calculates wind delay for each component in the project.
 
     :param crane_specs: data frame with crane specifications and component properties
     :param weather_window: filtered weather window containing data specific to season and time of construction
     :param wind_shear_exponent: exponent for wind shear calculations
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
     :return: data frame with crane specifications and component properties joined with wind delays for each case
     """
 
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
+
     # calculate wind delay for each component and crane combination
     crane_specs = crane_specs.reset_index()
-    crane_specs['Wind delay percent'] = np.nan
     print('Calculating wind delay for erection...')
-    for i in range(0, len(crane_specs.index)):
-        # print for debugging
-        # print("Calculating weather delay for {operation}, {component},
-        #                                               {crane} {boom}".format(operation=crane_specs['Operation'][i],
-        #                                                                      component=crane_specs['Component'][i],
-        #                                                                      crane=crane_specs['Crane name'][i],
-        #                                                                      boom=crane_specs['Boom system'][i]))
-
-        # assume we don't know when the operation occurs
-        operation_window = len(weather_window.index)  # operation window = entire construction weather window
-        operation_start = 0  # start time is at beginning of construction weather window
-
-        # extract critical wind speed
-        critical_wind_operation = crane_specs['vmax'][i]
-
-        # extract height of interest
-        height_interest = crane_specs['Lift height m'][i]
-
-        # compute weather delay
-        wind_delay = WD.calculate_wind_delay(weather_window=weather_window,
-                                             start_delay=operation_start,
-                                             mission_time=operation_window,
-                                             critical_wind_speed=critical_wind_operation,
-                                             height_interest=height_interest,
-                                             wind_shear_exponent=wind_shear_exponent)
-        wind_delay = pd.DataFrame(wind_delay)
-
-        # if greater than 4 hour delay, then shut down for full day (10 hours)
-        wind_delay[(wind_delay > 4)] = 10
-        wind_delay_time = float(wind_delay.sum())
-
-        # store weather delay for operation, component, crane, and boom combination
-        crane_specs.loc[i, 'Wind delay percent'] = wind_delay_time / len(weather_window)
+
+    # assume we don't know when the operation occurs
+    operation_window = len(weather_window.index)  # operation window = entire construction weather window
+    operation_start = 0  # start time is at beginning of construction weather window
+
+    # compute weather delay for all combinations at once using critical wind speed and height of interest for each
+    # (combinations with the same critical wind speed and height of interest are only computed once)
+    # if greater than 4 hour delay, then shut down for full day (10 hours)
+    wind_delay_time = WD.calculate_cached_delay(weather_index=weather_index,
+                                                start_delay=operation_start,
+                                                mission_time=operation_window,
+                                                critical_wind_speed=crane_specs['vmax'].values,
+                                                height_interest=crane_specs['Lift height m'].values,
+                                                wind_shear_exponent=wind_shear_exponent)
+
+    # store weather delay for operation, component, crane, and boom combination
+    crane_specs['Wind delay percent'] = wind_delay_time / len(weather_window)
 
     return crane_specs
 
@@ -459,9 +769,9 @@ def aggregate_erection_costs(project_specs, crane_data, operation_time, project_
     :param hour_day: dictionary for number of hours worked per day (normal vs long)
     :param construct_time: time allowed for construction
     :param overtime_multiplier: overtime multiplier for labor costs (40 hrs/wk vs. 60 hrs/wk)
-    :return: two data frames that have aggregated labor, equipment, mobilization, and fuel costs for
-             1) utilizing the same crane for base and topping and
-             2) utilizing separate cranes for base and topping
+    :return: data frame with aggregated labor, equipment, mobilization, and fuel costs for each crane and operation
+             (costs for using the same crane for base and topping are calculated from these costs, see
+             find_crane_fleet_options)
     """
 
     average_wind_delay = crane_data.groupby(['Crane name', 'Boom system', 'Operation'])['Wind delay percent'].mean().reset_index()
@@ -481,87 +791,48 @@ def aggregate_erection_costs(project_specs, crane_data, operation_time, project_
 
     possible_crane_cost['Equipment rental cost USD'] = possible_crane_cost['Total time per op with weather'] * possible_crane_cost['Equipment price USD per hour']
 
-    # merge crew type and crew cost data
-    crew_cost = pd.merge(project_data['crew'], project_data['crew_price'], on=['Labor type ID'])
-
-    # increase management crews by project size
-    num_turbines = float(project_specs['Number of turbines'])
-    crew_cost.loc[crew_cost['Crew name'] == "Management - project size", 'Number of workers'] = \
-        round(crew_cost[crew_cost['Crew name'] == "Management - project size"]['Number of workers'] *
-              np.ceil(num_turbines / 100))
-
-    # increase management crews by rate of construction (scale if greater than 10/wk)
-    rate_construction = float(project_specs['Rate of deliveries (turbines per week)'].dropna())
-
-    crew_cost.loc[crew_cost['Crew name'] == "Management - rate construction", 'Number of workers'] = \
-        round(crew_cost[crew_cost['Crew name'] == "Management - rate construction"]['Number of workers'] *
-              np.ceil(rate_construction / 10))
-
-    crew_cost.loc[crew_cost['Crew name'] == "Mechanical completion", 'Number of workers'] = \
-        round(crew_cost[crew_cost['Crew name'] == "Mechanical completion"]['Number of workers'] *
-              np.ceil(rate_construction / 10))
-
-    # calculate crew costs
-    crew_cost['Hourly rate for all workers'] = (crew_cost['Hourly rate USD per hour'] * crew_cost['Number of workers']) * overtime_multiplier
-    crew_cost['Per diem all workers'] = crew_cost['Per diem USD per day'] * crew_cost['Number of workers']
-
-    # group crew costs by crew type and operation
-    crew_cost_grouped = crew_cost.groupby(['Crew type ID', 'Operation', 'Crew type']).sum().reset_index()
+    # crew rates scaled for project size and rate of construction (crew data is merged and grouped once)
+    num_turbines = float(project_specs['Number of turbines'].iloc[0])
+    rate_construction = float(project_specs['Rate of deliveries (turbines per week)'].dropna().iloc[0])
+    crew_rates = get_crew_rates(crew=project_data['crew'], crew_price=project_data['crew_price'])
+    [crew_cost, crew_cost_grouped, hourly_management, per_diem_management] = \
+        crew_rates.calculate(num_turbines=num_turbines,
+                             rate_construction=rate_construction,
+                             overtime_multiplier=overtime_multiplier)
 
     # merge crane data with grouped crew costs
     possible_crane_cost = pd.merge(possible_crane_cost, crew_cost_grouped, on=['Crew type ID', 'Operation'])
 
-    # get total rate for management crew
-    management_rates = crew_cost_grouped[(crew_cost_grouped['Operation'] == 'Management') |
-                                         (crew_cost_grouped['Operation'] == 'Mechanical completion')].sum()
-    per_diem_management = management_rates['Per diem all workers']
-    hourly_management = management_rates['Hourly rate for all workers']
-
     # calculate labor costs
     labor_day_operation = round(possible_crane_cost['Total time per op with weather'] / hour_day[construct_time])
-    possible_crane_cost['Labor cost USD'] = (possible_crane_cost['Total time per op with weather'] *
-                                             (possible_crane_cost['Hourly rate for all workers'] + hourly_management) +
-                                             labor_day_operation *
-                                             (crew_cost['Per diem all workers'] + per_diem_management))
+    hourly_labor = (possible_crane_cost['Total time per op with weather'] *
+                    (possible_crane_cost['Hourly rate for all workers'] + hourly_management))
+    per_diem_labor = labor_day_operation * (crew_cost['Per diem all workers'] + per_diem_management)
+    possible_crane_cost['Labor cost USD'] = hourly_labor + per_diem_labor
+
+    # store labor cost for management crews (management is paid for the time the operation is on site)
+    # management share is taken from the same terms as labor cost, so it is missing (and not summed) wherever labor
+    # cost is missing and can never exceed labor cost
+    management_labor = (possible_crane_cost['Total time per op with weather'] * hourly_management +
+                        labor_day_operation * per_diem_management)
+    possible_crane_cost['Management labor cost USD'] = management_labor.where(possible_crane_cost['Labor cost USD'].notnull())
 
     # calculate fuel costs
     project = project_specs
-    possible_crane_cost['Fuel cost USD'] = possible_crane_cost['Fuel consumption gal per day'] * float(project['Fuel cost USD per gal']) * labor_day_operation
-
-    # calculate costs if top and base cranes are the same
-    base_cranes = possible_crane_cost[possible_crane_cost['Operation'] == 'Base']
-    crane_topbase_bool = possible_crane_cost['Crane name'].isin(base_cranes['Crane name'])
-    boom_topbase_bool = possible_crane_cost['Boom system'].isin(base_cranes['Boom system'])
-    possible_crane_topbase = possible_crane_cost[boom_topbase_bool & crane_topbase_bool]
-    possible_crane_topbase_sum = possible_crane_topbase.groupby(['Crane name',
-                                                                 'Boom system'])['Labor cost USD',
-                                                                                 'Equipment rental cost USD',
-                                                                                 'Fuel cost USD',
-                                                                                 'Time weather',
-                                                                                 'Total time per op with weather',
-                                                                                 'Wind multiplier'
-                                                                                ].sum().reset_index()
+    possible_crane_cost['Fuel cost USD'] = possible_crane_cost['Fuel consumption gal per day'] * float(project['Fuel cost USD per gal'].iloc[0]) * labor_day_operation
 
     # group crane spec data for mobilization
     mobilization_costs = project_data['crane_specs'].groupby(['Crane name', 'Boom system'])['Mobilization cost USD'].max().reset_index()
 
-    # join top and base crane data with mobilization data
-    topbase_same_crane_cost = pd.merge(possible_crane_topbase_sum, mobilization_costs, on=['Crane name', 'Boom system'])
-
-    # compute total project cost for erection
-    topbase_same_crane_cost['Total cost USD'] = topbase_same_crane_cost['Labor cost USD'] + \
-                                                topbase_same_crane_cost['Equipment rental cost USD'] + \
-                                                topbase_same_crane_cost['Fuel cost USD'] + \
-                                                topbase_same_crane_cost['Mobilization cost USD'] * 2  # for mobilization and demobilizaton
-
     # calculate costs if top and base use separate cranes
-    separate_topbase = possible_crane_cost.groupby(['Operation', 'Crane name', 'Boom system'])['Labor cost USD',
-                                                                                               'Equipment rental cost USD',
-                                                                                               'Fuel cost USD',
-                                                                                               'Time weather',
-                                                                                               'Total time per op with weather',
-                                                                                               'Wind multiplier'
-                                                                                              ].sum().reset_index()
+    separate_topbase = possible_crane_cost.groupby(['Operation', 'Crane name', 'Boom system'])[['Labor cost USD',
+                                                                                                'Equipment rental cost USD',
+                                                                                                'Fuel cost USD',
+                                                                                                'Time weather',
+                                                                                                'Total time per op with weather',
+                                                                                                'Wind multiplier',
+                                                                                                'Management labor cost USD'
+                                                                                                ]].sum().reset_index()
 
     # join mobilization data to separate top base crane costs
     separate_topbase_crane_cost = pd.merge(separate_topbase, mobilization_costs, on=['Crane name', 'Boom system'])
@@ -572,50 +843,191 @@ def aggregate_erection_costs(project_specs, crane_data, operation_time, project_
                                                     separate_topbase_crane_cost['Fuel cost USD'] + \
                                                     separate_topbase_crane_cost['Mobilization cost USD'] * 2  # for mobilization and demobilizaton
 
-    return separate_topbase_crane_cost, topbase_same_crane_cost
+    return separate_topbase_crane_cost
+
+
+def calculate_crane_fleet_costs(separate_basetop, hour_day, construct_time, construction_time, max_num_cranes,
+                                num_cranes=None):
+    """
+    Calculates erection costs for fleets of 1 to max_num_cranes cranes of the same type working in parallel on each
+    erection operation (base and topping), for all cranes and fleet sizes at once. Crane hours (and therefore rental,
+    crew, fuel, and weather delay hours) are split between the cranes in the fleet, mobilization is paid for each crane,
+    and management labor and time on site are reduced by the number of cranes. Only fleets that complete each operation
+    within the time allowed for erection (1/3 of construction time) are kept, unless no fleet for the operation does, in
+    which case the largest fleets are kept and recorded as not completing the operation within the time allowed.
+
+    :param separate_basetop: data frame with aggregated labor, equipment, mobilization, and fuel costs for each crane
+                             and operation (see aggregate_erection_costs)
+    :param hour_day: dictionary of hours for each type of operational time (e.g., normal vs. long hours)
+    :param construct_time: string that describes operational time (e.g., normal vs. long hours)
+    :param construction_time: time allowed for construction (in months)
+    :param max_num_cranes: maximum number of cranes for each erection operation
+    :param num_cranes: dictionary with number of cranes for each erection operation (if provided, only this number of
+                       cranes is evaluated for the operation and time allowed for erection is not checked)
+    :return: data frame with costs for each crane, operation, and number of cranes (offload cranes are unchanged),
+             including 'Number of cranes', 'Construct days' (days on site for the operation), and 'Within time allowed'
+             (whether the fleet completes the operation within the time allowed for erection; always true for offload)
+    """
+
+    erection_construction_days = 1/3 * construction_time * 30
+
+    erection = separate_basetop['Operation'].isin(ES.erection_operations).values
+    erection_cost = separate_basetop[erection]
+    offload_cost = separate_basetop[~erection].assign(**{'Number of cranes': 1, 'Construct days': np.nan,
+                                                         'Within time allowed': True})
+
+    # costs for each crane and operation (rows) and number of cranes (columns)
+    fleet_size = np.arange(1, int(max_num_cranes) + 1)[np.newaxis, :]
+    total_time = erection_cost['Total time per op with weather'].values[:, np.newaxis]
+    management_labor = erection_cost['Management labor cost USD'].values[:, np.newaxis]
+    labor = erection_cost['Labor cost USD'].values[:, np.newaxis] - management_labor + management_labor / fleet_size
+    mobilization = erection_cost['Mobilization cost USD'].values[:, np.newaxis] * fleet_size
+    total_cost = (labor + mobilization * 2 + (erection_cost['Equipment rental cost USD'].values +
+                                              erection_cost['Fuel cost USD'].values)[:, np.newaxis])
+    construct_days = total_time / fleet_size / hour_day[construct_time]
+    within_time = construct_days <= erection_construction_days
+
+    # fleets that can be used for each operation
+    operation = erection_cost['Operation'].values
+    fleet_bool = np.zeros(total_cost.shape, dtype=bool)
+    for name_operation in np.unique(operation):
+        operation_rows = operation == name_operation
+        if num_cranes is not None and name_operation in num_cranes:
+            fleet_bool[operation_rows] = fleet_size == int(num_cranes[name_operation])
+        elif within_time[operation_rows].any():
+            fleet_bool[operation_rows] = within_time[operation_rows]
+        else:
+            fleet_bool[operation_rows] = fleet_size == fleet_size.max()
+
+    [rows, sizes] = np.nonzero(fleet_bool)
+    fleet_cost = erection_cost.take(rows).assign(**{'Labor cost USD': labor[rows, sizes],
+                                                    'Management labor cost USD': management_labor[rows, 0] /
+                                                                                 fleet_size[0, sizes],
+                                                    'Mobilization cost USD': mobilization[rows, sizes],
+                                                    'Total cost USD': total_cost[rows, sizes],
+                                                    'Number of cranes': fleet_size[0, sizes],
+                                                    'Construct days': construct_days[rows, sizes],
+                                                    'Within time allowed': within_time[rows, sizes]})
+
+    return pd.concat([fleet_cost, offload_cost], sort=False).reset_index(drop=True)
+
+
+def find_smallest(cost, num_options):
+    """
+    Finds the positions of the smallest costs (ties are broken by position).
+
+    :param cost: array of costs
+    :param num_options: number of positions to return
+    :return: array of positions of the smallest costs, sorted by cost
+    """
+
+    cost = np.ravel(cost)
+    if num_options < len(cost):
+        positions = np.argpartition(cost, num_options - 1)[:num_options]
+    else:
+        positions = np.arange(len(cost))
+
+    # partition does not keep lowest positions for tied costs, so include all positions tied with the largest cost
+    if len(positions) > 0 and num_options < len(cost):
+        positions = np.union1d(positions, np.flatnonzero(cost == cost[positions].max()))
+
+    return positions[np.lexsort((positions, cost[positions]))][:num_options]
 
 
-def find_minimum_cost_cranes(separate_basetop, same_basetop, allow_same_flag):
+def find_crane_fleet_options(separate_basetop, allow_same_crane=False, num_options=1):
+    """
+    Finds the least cost crane fleets for erection by evaluating every combination of base, topping, and offload
+    cranes at once. If the same crane (crane name and boom system) is chosen for base and topping, it can be mobilized
+    (and demobilized) once for both operations if allow_same_crane is true. Two cranes are used for offloading.
+
+    :param separate_basetop: data frame with aggregated labor, equipment, mobilization, and fuel costs for each crane
+                             and operation (see aggregate_erection_costs)
+    :param allow_same_crane: flag to indicate whether the same crane can be mobilized once for base and topping
+    :param num_options: number of crane fleets to return (least cost fleet and next least cost alternatives)
+    :return: data frame with crane fleets sorted by total cost, including the rows in separate_basetop for the base,
+             topping, and offload crane of each fleet
+    """
+
+    operation = np.asarray(separate_basetop['Operation'], dtype=object)
+    crane_name = np.asarray(separate_basetop['Crane name'], dtype=object)
+    boom_system = np.asarray(separate_basetop['Boom system'], dtype=object)
+    total_cost = separate_basetop['Total cost USD'].values.astype(float)
+    mobilization_cost = separate_basetop['Mobilization cost USD'].values.astype(float)
+
+    base = np.flatnonzero(operation == 'Base')
+    top = np.flatnonzero(operation == 'Top')
+    offload = np.flatnonzero(operation == 'Offload')
+
+    # cost for each pair of base (rows) and topping (columns) cranes
+    pair_cost = total_cost[base][:, np.newaxis] + total_cost[top][np.newaxis, :]
+    same_crane = ((crane_name[base][:, np.newaxis] == crane_name[top][np.newaxis, :]) &
+                  (boom_system[base][:, np.newaxis] == boom_system[top][np.newaxis, :]))
+    if allow_same_crane:
+        # mobilization and demobilization for shared crane(s) are only paid once
+        shared_mobilization = np.minimum(mobilization_cost[base][:, np.newaxis], mobilization_cost[top][np.newaxis, :])
+        pair_cost = pair_cost - np.where(same_crane, shared_mobilization * 2, 0)
+
+    # offload cost for two offload cranes (no offload cost if there are no offload cranes)
+    if len(offload) != 0:
+        offload_cost = total_cost[offload] * 2
+    else:
+        offload_cost = np.zeros(1)
+
+    # least cost fleets are combinations of least cost base and topping pairs and least cost offload cranes
+    best_pairs = find_smallest(pair_cost, num_options)
+    best_offload = find_smallest(offload_cost, num_options)
+    fleet_cost = pair_cost.ravel()[best_pairs][:, np.newaxis] + offload_cost[best_offload][np.newaxis, :]
+    best_fleets = find_smallest(fleet_cost, num_options)
+    [pair_num, offload_num] = np.unravel_index(best_fleets, fleet_cost.shape)
+    [base_num, top_num] = np.unravel_index(best_pairs[pair_num], pair_cost.shape)
+
+    fleet_options = pd.DataFrame({'Base row': separate_basetop.index[base[base_num]],
+                                  'Base crane name': crane_name[base[base_num]],
+                                  'Base boom system': boom_system[base[base_num]],
+                                  'Top row': separate_basetop.index[top[top_num]],
+                                  'Top crane name': crane_name[top[top_num]],
+                                  'Top boom system': boom_system[top[top_num]],
+                                  'Same base and top crane': same_crane[base_num, top_num] & allow_same_crane,
+                                  'Total cost USD': fleet_cost.ravel()[best_fleets]},
+                                 columns=['Base row', 'Base crane name', 'Base boom system',
+                                          'Top row', 'Top crane name', 'Top boom system', 'Same base and top crane',
+                                          'Offload row', 'Offload crane name', 'Offload boom system', 'Total cost USD'])
+    if len(offload) != 0:
+        fleet_options['Offload row'] = separate_basetop.index[offload[best_offload[offload_num]]]
+        fleet_options['Offload crane name'] = crane_name[offload[best_offload[offload_num]]]
+        fleet_options['Offload boom system'] = boom_system[offload[best_offload[offload_num]]]
+
+    return fleet_options
+
+
+def find_minimum_cost_cranes(separate_basetop, allow_same_flag):
     """
     Finds the minimum cost crane(s) based on the aggregated labor, equipment, mobilization and fuel costs for erection.
 
     :param separate_basetop: data frame with aggregated labor, equipment, mobilization, and fuel costs for utilizing
                              separate cranes for base and topping
-    :param same_basetop: data frame with aggregated labor, equipment, mobilization, and fuel costs for utilizing the
-                         same crane for base and topping
-    :param allow_same_flag: flag to indicate whether choosing same base and topping crane is allowed
+    :param allow_same_flag: flag to indicate whether choosing same base and topping crane is allowed (the shared crane
+                            is mobilized once, see find_crane_fleet_options)
     :return: data frame with the lowest cost crane option for erection
     """
-    total_separate_cost = pd.DataFrame()
-    for operation in separate_basetop['Operation'].unique():
-        # find minimum cost option for separate base and topping cranes
-        min_val = min(separate_basetop['Total cost USD'].where(separate_basetop['Operation'] == operation).dropna())
-
-        # find the crane that corresponds to the minimum cost for each operation
-        crane = separate_basetop[separate_basetop['Total cost USD'] == min_val]
-        cost = crane.groupby('Operation').min()
-        total_separate_cost = total_separate_cost.append(cost, sort=True)
 
-    # reset index for separate crane costs
-    total_separate_cost = total_separate_cost.reset_index()
+    fleet = find_crane_fleet_options(separate_basetop=separate_basetop,
+                                     allow_same_crane=allow_same_flag is True,
+                                     num_options=1).iloc[0]
 
     # duplicate offload records because assuming two offload cranes are on site
-    total_separate_cost = total_separate_cost.append(total_separate_cost.loc[total_separate_cost['Operation'] == 'Offload'], sort=True)
-
-    # sum costs for separate cranes to get total for all cranes
-    cost_chosen_separate = total_separate_cost['Total cost USD'].sum()
+    chosen_rows = [fleet['Base row'], fleet['Top row']]
+    if not pd.isnull(fleet['Offload row']):
+        chosen_rows += [fleet['Offload row'], fleet['Offload row']]
+    total_separate_cost = separate_basetop.loc[chosen_rows].reset_index(drop=True)
 
-    if allow_same_flag is True:
-        # get the minimum cost for using the same crane for all operations
-        cost_chosen_same = min(same_basetop['Total cost USD'])
+    # crane(s) used for base and topping are only mobilized once
+    if fleet['Same base and top crane']:
+        shared_mobilization = total_separate_cost.loc[0:1, 'Mobilization cost USD'].min()
+        total_separate_cost.loc[1, 'Total cost USD'] -= shared_mobilization * 2
+        total_separate_cost.loc[1, 'Mobilization cost USD'] -= shared_mobilization
 
-        # check if separate or same crane option is cheaper and choose crane cost
-        if cost_chosen_separate < cost_chosen_same:
-            cost_chosen = total_separate_cost.groupby(by="Boom system").sum()
-        else:
-            cost_chosen = same_basetop.where(same_basetop['Total cost USD'] == cost_chosen_same).dropna()
-    else:
-        cost_chosen = total_separate_cost.groupby(by="Boom system").sum()
+    cost_chosen = total_separate_cost.groupby(by="Boom system").sum()
 
     # for debugging
     # print(total_separate_cost)
@@ -623,11 +1035,155 @@ def find_minimum_cost_cranes(separate_basetop, same_basetop, allow_same_flag):
     return cost_chosen
 
 
+def calculate_erection_wind_multiplier(erection_cost):
+    """
+    Calculates the average wind multiplier for the cranes chosen for erection.
+
+    :param erection_cost: data frame with the lowest cost crane option for erection
+    :return: average wind multiplier for erection
+    """
+
+    erection_wind_mult = (erection_cost['Total time per op with weather']) / (erection_cost['Total time per op with weather'] - erection_cost['Time weather'])
+    erection_wind_mult = erection_wind_mult.reset_index(drop=True).mean()
+
+    return erection_wind_mult
+
+
+def select_crane_rows(crane_data, chosen_cranes):
+    """
+    Selects rows for the chosen crane (crane name and boom system) for each operation.
+
+    :param crane_data: data frame with 'Operation', 'Crane name', and 'Boom system' columns
+    :param chosen_cranes: dictionary of (crane name, boom system) for each operation
+    :return: boolean array that is true for rows for chosen cranes
+    """
+
+    chosen = np.zeros(len(crane_data), dtype=bool)
+    for operation in chosen_cranes:
+        chosen |= ((crane_data['Operation'] == operation) &
+                   (crane_data['Crane name'] == chosen_cranes[operation][0]) &
+                   (crane_data['Boom system'] == chosen_cranes[operation][1])).values
+
+    return chosen
+
+
+def calculate_simulated_erection_costs(project_specs, project_data, hour_day, time_construct, weather_window,
+                                       construction_time, crane_data, operation_time, separate_basetop,
+                                       rate_of_deliveries, overtime_multiplier, wind_shear_exponent,
+                                       allow_same_crane=False):
+    """
+    Simulates the erection schedule for the least cost base and topping cranes against the weather window (see
+    ErectionSchedule.simulate_erection) and recalculates erection costs for those cranes using the simulated time on
+    site and time lost to weather (base and topping cranes are simulated as separate cranes). If crane fleets were sized
+    (see calculate_crane_fleet_costs), the chosen number of cranes is simulated for each operation.
+
+    :param project_specs: data frame with project details (from project input file)
+    :param project_data: dictionary of data frames for each of the csv files loaded for the project
+    :param hour_day: dictionary of hours for each type of operational time (e.g., normal vs. long hours)
+    :param time_construct: string that describes operational time (e.g., normal vs. long hours)
+    :param weather_window: window of weather data for project of interest
+    :param construction_time: time allowed for construction (in months)
+    :param crane_data: data frame with crane specifications and component properties joined with wind delays for each case
+    :param operation_time: data frame with operation time for each crane and operation
+    :param separate_basetop: data frame with aggregated costs for each crane and operation (see aggregate_erection_costs
+                             and calculate_crane_fleet_costs)
+    :param rate_of_deliveries: rate of deliveries (number of turbines per week)
+    :param overtime_multiplier: multiplier for overtime work (working 60 hr/wk vs 40 hr/wk)
+    :param wind_shear_exponent: exponent used for wind shear calculations
+    :param allow_same_crane: if true, the same crane can be used (and mobilized once) for base and topping
+    :return: data frame with the crane option for erection with simulated costs (see find_minimum_cost_cranes) and
+             data frame with simulated schedule for each turbine and operation (raises InfeasibleErectionError if a lift
+             for the chosen cranes is never permitted in the weather window)
+    """
+
+    fleet = find_crane_fleet_options(separate_basetop=separate_basetop,
+                                     allow_same_crane=allow_same_crane,
+                                     num_options=1).iloc[0]
+    chosen_cranes = {'Base': (fleet['Base crane name'], fleet['Base boom system']),
+                     'Top': (fleet['Top crane name'], fleet['Top boom system'])}
+
+    # number of cranes for each operation
+    fleet_sizing = 'Number of cranes' in separate_basetop.columns
+    if fleet_sizing:
+        num_cranes = {'Base': int(separate_basetop.loc[fleet['Base row'], 'Number of cranes']),
+                      'Top': int(separate_basetop.loc[fleet['Top row'], 'Number of cranes'])}
+    else:
+        num_cranes = {'Base': 1, 'Top': 1}
+
+    # lifts for each turbine in order of lift height (operation, travel, and setup time are for all turbines)
+    turbine_num = float(project_specs['Number of turbines'].iloc[0])
+    chosen_lifts = crane_data[select_crane_rows(crane_data, chosen_cranes)].sort_values('Lift height m', kind='mergesort')
+    lift_data = pd.DataFrame({'Operation': chosen_lifts['Operation'].values,
+                              'Component': chosen_lifts['Component'].values,
+                              'Lift time hr': chosen_lifts['Operation time hr'].values / turbine_num,
+                              'vmax': chosen_lifts['vmax'].values,
+                              'Lift height m': chosen_lifts['Lift height m'].values,
+                              'Travel time hr': chosen_lifts['Travel time hr'].values / turbine_num,
+                              'Setup time hr': chosen_lifts['Setup time hr'].values / turbine_num})
+
+    # erection cannot finish if wind speed always exceeds max permissible wind speed for a lift
+    unpermitted_lifts = ES.find_unpermitted_lifts(weather_window=weather_window,
+                                                  lift_data=lift_data,
+                                                  wind_shear_exponent=wind_shear_exponent)
+    if len(unpermitted_lifts) != 0:
+        raise InfeasibleErectionError(unpermitted_lifts.assign(**{'Reason': 'Wind speed always exceeds max '
+                                                                            'permissible wind speed'}))
+
+    [schedule, operation_summary] = ES.simulate_erection(weather_window=weather_window,
+                                                         lift_data=lift_data,
+                                                         num_turbines=turbine_num,
+                                                         wind_shear_exponent=wind_shear_exponent,
+                                                         operational_hrs_per_day=hour_day[time_construct],
+                                                         rate_of_deliveries=rate_of_deliveries,
+                                                         num_cranes=num_cranes)
+
+    # replace operation time and wind delay for chosen cranes with simulated time (time on site without weather delays
+    # and fraction of time on site lost to weather)
+    simulated_operation_time = operation_time.copy()
+    simulated_crane_data = crane_data.copy()
+    for [operation, total_time, time_weather, simulated_time] in operation_summary[['Operation', 'Total time hrs',
+                                                                                    'Time weather hrs',
+                                                                                    'Operation time hrs']].values:
+        operation_crane = {operation: chosen_cranes[operation]}
+        simulated_operation_time.loc[select_crane_rows(operation_time, operation_crane),
+                                     'Operation time all turbines hrs'] = simulated_time
+        simulated_crane_data.loc[select_crane_rows(crane_data, operation_crane),
+                                 'Wind delay percent'] = time_weather / total_time
+
+    separate_basetop = aggregate_erection_costs(project_specs=project_specs,
+                                                crane_data=simulated_crane_data,
+                                                operation_time=simulated_operation_time,
+                                                project_data=project_data,
+                                                hour_day=hour_day,
+                                                construct_time=time_construct,
+                                                overtime_multiplier=overtime_multiplier)
+
+    if fleet_sizing:
+        separate_basetop = calculate_crane_fleet_costs(separate_basetop=separate_basetop,
+                                                       hour_day=hour_day,
+                                                       construct_time=time_construct,
+                                                       construction_time=construction_time,
+                                                       max_num_cranes=max(num_cranes.values()),
+                                                       num_cranes=num_cranes)
+
+    # keep chosen cranes for base and topping (offload cranes are not simulated)
+    separate_basetop = separate_basetop[select_crane_rows(separate_basetop, chosen_cranes) |
+                                        (separate_basetop['Operation'] == 'Offload').values]
+
+    erection_cost = find_minimum_cost_cranes(separate_basetop=separate_basetop,
+                                             allow_same_flag=allow_same_crane)
+
+    return erection_cost, schedule
+
+
 def calculate_costs(project_specs, project_data, hour_day, time_construct, weather_window, construction_time,
-                    rate_of_deliveries, overtime_multiplier, wind_shear_exponent):
+                    rate_of_deliveries, overtime_multiplier, wind_shear_exponent, weather_index=None, multi_year=False,
+                    allow_same_crane=False, simulate_schedule=False, max_num_cranes=1):
     """
     Calculates BOS costs for erection including selecting cranes that can lift components, incorporating wind delays,
-    and finding the least cost crane options for erection.
+    and finding the least cost crane options for erection. Raises InfeasibleErectionError (with the lifts that cannot
+    be made) if no crane can make a lift, or if a lift is never permitted in the weather window when the erection
+    schedule is simulated.
 
     :param project_specs: data frame with project details (from project input file)
     :param project_data: dictionary of data frames for each of the csv files loaded for the project
@@ -638,48 +1194,82 @@ def calculate_costs(project_specs, project_data, hour_day, time_construct, weath
     :param rate_of_deliveries: rate of deliveries (number of turbines per week)
     :param overtime_multiplier: multiplier for overtime work (working 60 hr/wk vs 40 hr/wk)
     :param wind_shear_exponent: exponent used for wind shear calculations
-     :return:
-    """
-    [crane_specs, operation_time, error_install] = calculate_erection_operation_time(project_specs=project_specs,
-                                                                      project_data=project_data,
-                                                                      construct_duration=construction_time,
-                                                                      operational_construction_time=hour_day[time_construct])
-
-    if error_install == 1:
-        error = 1
-        sys.exit()
-
-    [offload_specs, offload_time, error_off] = calculate_offload_operation_time(project_specs=project_specs,
-                                                                     project_data=project_data,
-                                                                     operational_construction_time=hour_day[time_construct],
-                                                                     rate_of_deliveries=rate_of_deliveries)
-    if error_off == 1:
-        error = 1
-        sys.exit()
-
-    # append data for offloading
-    if len(offload_specs) != 0:
-        crane_specs = crane_specs.append(offload_specs, sort=True)
-        operation_time = operation_time.append(offload_time, sort=True)
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
+    :param multi_year: if true, also returns data frame with wind multiplier for each year of weather data
+    :param allow_same_crane: if true, the same crane can be used (and mobilized once) for base and topping
+    :param simulate_schedule: if true, erection costs for the least cost cranes are calculated from the erection
+                              schedule simulated against the weather window (see calculate_simulated_erection_costs)
+    :param max_num_cranes: maximum number of cranes working in parallel on each erection operation; if greater than one,
+                           the least cost number of cranes that completes erection within the time allowed is chosen
+                           (see calculate_crane_fleet_costs)
+    :return: data frame with total erection costs by type of cost, wind multiplier, and dictionary of other outputs
+             with data frames of wind multiplier by year (if multi year), simulated erection schedule (if simulated
+             schedule is requested), and least cost crane fleet for each operation (if max_num_cranes is greater than
+             one); the dictionary is empty if no other outputs are requested
+    """
+    # operation time for base, topping, and offloading cranes in one pass over crane catalog
+    [crane_specs, operation_time, infeasible_lifts] = \
+        calculate_operation_time(project_specs=project_specs,
+                                 project_data=project_data,
+                                 operations=list(crane_operations),
+                                 construct_duration=construction_time,
+                                 operational_construction_time=hour_day[time_construct],
+                                 rate_of_deliveries=rate_of_deliveries)
+    if len(infeasible_lifts) != 0:
+        raise InfeasibleErectionError(infeasible_lifts)
 
     cranes_wind_delay = calculate_wind_delay_by_component(crane_specs=crane_specs,
                                                           weather_window=weather_window,
-                                                          wind_shear_exponent=wind_shear_exponent)
+                                                          wind_shear_exponent=wind_shear_exponent,
+                                                          weather_index=weather_index)
 
     # for debugging
     # print(cranes_wind_delay[(cranes_wind_delay['Crane name'] == 'LR1500') & (cranes_wind_delay['Boom system'] == 'SL3F')])
 
-    [separate_basetop, same_basetop] = aggregate_erection_costs(project_specs=project_specs,
-                                                                crane_data=cranes_wind_delay,
-                                                                operation_time=operation_time,
-                                                                project_data=project_data,
-                                                                hour_day=hour_day,
-                                                                construct_time=time_construct,
-                                                                overtime_multiplier=overtime_multiplier)
+    separate_basetop = aggregate_erection_costs(project_specs=project_specs,
+                                                crane_data=cranes_wind_delay,
+                                                operation_time=operation_time,
+                                                project_data=project_data,
+                                                hour_day=hour_day,
+                                                construct_time=time_construct,
+                                                overtime_multiplier=overtime_multiplier)
+
+    if max_num_cranes > 1:
+        separate_basetop = calculate_crane_fleet_costs(separate_basetop=separate_basetop,
+                                                       hour_day=hour_day,
+                                                       construct_time=time_construct,
+                                                       construction_time=construction_time,
+                                                       max_num_cranes=max_num_cranes)
 
     erection_cost = find_minimum_cost_cranes(separate_basetop=separate_basetop,
-                                             same_basetop=same_basetop,
-                                             allow_same_flag=False)
+                                             allow_same_flag=allow_same_crane)
+
+    other_outputs = dict()
+    if max_num_cranes > 1:
+        # record whether the chosen fleet completes each erection operation within the time allowed for erection
+        # (from the chosen rows, since least cost cranes are grouped by boom system)
+        fleet = find_crane_fleet_options(separate_basetop=separate_basetop,
+                                         allow_same_crane=allow_same_crane is True,
+                                         num_options=1).iloc[0]
+        other_outputs['Crane fleet'] = separate_basetop.loc[[fleet['Base row'], fleet['Top row']],
+                                                            ['Operation', 'Crane name', 'Boom system',
+                                                             'Number of cranes', 'Construct days',
+                                                             'Within time allowed']].reset_index(drop=True)
+    if simulate_schedule:
+        [erection_cost, other_outputs['Erection schedule']] = \
+            calculate_simulated_erection_costs(project_specs=project_specs,
+                                               project_data=project_data,
+                                               hour_day=hour_day,
+                                               time_construct=time_construct,
+                                               weather_window=weather_window,
+                                               construction_time=construction_time,
+                                               crane_data=cranes_wind_delay,
+                                               operation_time=operation_time,
+                                               separate_basetop=separate_basetop,
+                                               rate_of_deliveries=rate_of_deliveries,
+                                               overtime_multiplier=overtime_multiplier,
+                                               wind_shear_exponent=wind_shear_exponent,
+                                               allow_same_crane=allow_same_crane)
 
     erection_cost_output = pd.DataFrame([['Erection', 'Equipment rental', erection_cost['Equipment rental cost USD'].sum()],
                                          ['Erection', 'Fuel', erection_cost['Fuel cost USD'].sum()],
@@ -689,10 +1279,47 @@ def calculate_costs(project_specs, project_data, hour_day, time_construct, weath
                                          ['Erection', 'Materials', 0]],
                                         columns=['Phase of construction', 'Type of cost', 'Cost USD'])
 
-    erection_wind_mult = (erection_cost['Total time per op with weather']) / (erection_cost['Total time per op with weather'] - erection_cost['Time weather'])
-    erection_wind_mult = erection_wind_mult.reset_index(drop=True).mean()
-
-    return erection_cost_output, erection_wind_mult
+    erection_wind_mult = calculate_erection_wind_multiplier(erection_cost=erection_cost)
+
+    if multi_year:
+        # compute weather delay for all combinations for each year of weather data (entire weather window for each year)
+        [years, year_hours, wind_delay_by_year] = WD.calculate_capped_delay_by_year(weather_window=weather_window,
+                                                                                    mission_time=np.inf,
+                                                                                    critical_wind_speed=cranes_wind_delay['vmax'].values,
+                                                                                    height_interest=cranes_wind_delay['Lift height m'].values,
+                                                                                    wind_shear_exponent=wind_shear_exponent)
+
+        # find least cost cranes for each year of weather data
+        erection_wind_mult_by_year = list()
+        for year_idx in range(0, len(years)):
+            cranes_wind_delay_year = cranes_wind_delay.copy()
+            cranes_wind_delay_year['Wind delay percent'] = wind_delay_by_year[year_idx] / year_hours[year_idx]
+
+            separate_basetop_year = aggregate_erection_costs(project_specs=project_specs,
+                                                             crane_data=cranes_wind_delay_year,
+                                                             operation_time=operation_time,
+                                                             project_data=project_data,
+                                                             hour_day=hour_day,
+                                                             construct_time=time_construct,
+                                                             overtime_multiplier=overtime_multiplier)
+
+            if max_num_cranes > 1:
+                separate_basetop_year = calculate_crane_fleet_costs(separate_basetop=separate_basetop_year,
+                                                                    hour_day=hour_day,
+                                                                    construct_time=time_construct,
+                                                                    construction_time=construction_time,
+                                                                    max_num_cranes=max_num_cranes)
+
+            erection_cost_year = find_minimum_cost_cranes(separate_basetop=separate_basetop_year,
+                                                          allow_same_flag=allow_same_crane)
+
+            erection_wind_mult_by_year.append(calculate_erection_wind_multiplier(erection_cost=erection_cost_year))
+
+        other_outputs['Wind multiplier by year'] = pd.DataFrame({'Year': years,
+                                                                 'Wind multiplier': erection_wind_mult_by_year},
+                                                                columns=['Year', 'Wind multiplier'])
+
+    return erection_cost_output, erection_wind_mult, other_outputs
 
 
 # OTHER NOTES ABOUT WEATHER DELAYS
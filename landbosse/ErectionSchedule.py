@@ -0,0 +1,268 @@
+"""
+ErectionSchedule.py
+
+Simulates the erection schedule for a wind project by stepping through the lifts for each turbine against the hourly
+weather window (discrete event simulation)
+
+Get weather window
+Get lifts for each operation (lift time, max permissible wind speed, and lift height for each component)
+Get travel and setup time for each turbine
+Get number of cranes for each operation
+Get rate of deliveries
+
+Calculate hours where each lift is permitted (wind speed at lift height does not exceed max permissible wind speed)
+Stop if a lift is never permitted in the weather window (erection cannot finish)
+
+Simulate erection (cranes are events in a heap-based event queue)
+    Turbines are delivered at the rate of deliveries and are ready for the first operation (base) when delivered
+    Each turbine is ready for the next operation (topping) when the previous operation is finished
+    Cranes for each operation erect turbines in order; a crane travels to the turbine, sets up, and completes each lift,
+    waiting while wind speed exceeds max permissible wind speed for the lift
+
+Return schedule for each turbine and operation and time for each operation
+
+"""
+
+import numpy as np
+import pandas as pd
+import heapq
+
+# operations in order of erection
+erection_operations = ['Base', 'Top']
+
+# days of operation per week (for deliveries)
+days_per_week = 6
+
+
+def calculate_permitted_hours(weather_window, vmax, lift_height, wind_shear_exponent):
+    """
+    Calculates the cumulative number of hours in the weather window where a lift is permitted.
+
+    :param weather_window: filtered weather window containing data specific to season and time of construction
+    :param vmax: max permissible wind speed for lift
+    :param lift_height: height of lift (in meters)
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: array with number of permitted hours before each hour of weather window (and total at end)
+    """
+
+    speed = weather_window['Speed m per s'].values.astype(float) * (lift_height / 100) ** wind_shear_exponent
+    permitted = ~(speed > vmax)
+
+    return np.r_[0, np.cumsum(permitted)].astype(float)
+
+
+def find_unpermitted_lifts(weather_window, lift_data, wind_shear_exponent):
+    """
+    Finds lifts that are not permitted in any hour of the weather window (wind speed at lift height always exceeds max
+    permissible wind speed), so that erection cannot finish.
+
+    :param weather_window: filtered weather window containing data specific to season and time of construction
+    :param lift_data: data frame with one row for each lift for a turbine (see simulate_erection)
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: data frame with rows of lift data for lifts that are never permitted (no rows if all lifts are permitted)
+    """
+
+    speed = weather_window['Speed m per s'].values.astype(float)
+    lift_time = lift_data['Lift time hr'].values.astype(float)
+    vmax = lift_data['vmax'].values.astype(float)
+    lift_height = lift_data['Lift height m'].values.astype(float)
+
+    # lift is permitted if wind speed at lift height is below max permissible wind speed in the calmest hour
+    if len(speed) == 0:
+        permitted = np.zeros(len(lift_data), dtype=bool)
+    else:
+        permitted = ~(speed.min() * (lift_height / 100) ** wind_shear_exponent > vmax)
+
+    return lift_data[~permitted & (lift_time > 0)]
+
+
+def calculate_finish_time(permitted_hours, start_time, work_time):
+    """
+    Calculates the time that work started at start time is finished if work only progresses during permitted hours
+    (weather window is repeated if work continues past the end of the weather window).
+
+    :param permitted_hours: cumulative number of permitted hours (see calculate_permitted_hours)
+    :param start_time: time work is started (in hours from start of weather window)
+    :param work_time: time to complete work (in hours) without weather delays
+    :return: time work is finished (infinite if there are no permitted hours in weather window)
+    """
+
+    if work_time <= 0:
+        return start_time
+
+    num_hours = len(permitted_hours) - 1
+    cycle_hours = permitted_hours[-1]
+    if cycle_hours == 0:
+        return np.inf
+
+    # permitted hours completed before start time
+    [start_cycle, start_offset] = divmod(start_time, num_hours)
+    start_hour = int(start_offset)
+    work_before = (start_cycle * cycle_hours + permitted_hours[start_hour] +
+                   (permitted_hours[start_hour + 1] - permitted_hours[start_hour]) * (start_offset - start_hour))
+
+    # find hour where permitted hours reach work completed at finish
+    [finish_cycle, finish_work] = divmod(work_before + work_time, cycle_hours)
+    if finish_work == 0:
+        finish_cycle -= 1
+        finish_work = cycle_hours
+    finish_hour = int(np.searchsorted(permitted_hours, finish_work, side='left')) - 1
+
+    return finish_cycle * num_hours + finish_hour + (finish_work - permitted_hours[finish_hour])
+
+
+def simulate_erection(weather_window, lift_data, num_turbines, wind_shear_exponent, operational_hrs_per_day,
+                      rate_of_deliveries=None, num_cranes=None):
+    """
+    Simulates erection of all turbines with a heap-based event queue. Cranes for each operation erect turbines in order
+    once the turbine is ready (delivered for the first operation, or finished with the previous operation), and each
+    lift only progresses during hours where wind speed at lift height does not exceed max permissible wind speed.
+
+    :param weather_window: filtered weather window containing data specific to season and time of construction
+    :param lift_data: data frame with one row for each lift for a turbine, with 'Operation', 'Component',
+                      'Lift time hr', 'vmax', 'Lift height m', 'Travel time hr', and 'Setup time hr' (travel and setup
+                      time per turbine for crane for operation; lifts are done in order of rows for each operation)
+    :param num_turbines: number of turbines
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :param operational_hrs_per_day: number of hours of operation per day (hours of weather window per day)
+    :param rate_of_deliveries: rate of deliveries (number of turbines per week); all turbines are ready at start if not
+                               provided
+    :param num_cranes: dictionary with number of cranes for each operation (one crane for each operation if not
+                       provided)
+    :return: data frame with schedule for each turbine and operation and data frame with total time, weather delay
+             time, and operation time (without weather delays) for all cranes for each operation (raises ValueError if
+             a lift is never permitted in the weather window, see find_unpermitted_lifts)
+    """
+
+    unpermitted_lifts = find_unpermitted_lifts(weather_window=weather_window,
+                                               lift_data=lift_data,
+                                               wind_shear_exponent=wind_shear_exponent)
+    if len(unpermitted_lifts) != 0:
+        raise ValueError('Wind speed exceeds max permissible wind speed in every hour of weather window for {}'
+                         .format('; '.join('{} operation and {} component'.format(operation, component)
+                                           for operation, component in unpermitted_lifts[['Operation',
+                                                                                          'Component']].values)))
+
+    num_turbines = int(num_turbines)
+    operations = [operation for operation in erection_operations if operation in set(lift_data['Operation'])]
+    if num_cranes is None:
+        num_cranes = dict()
+
+    # lifts for each operation with cumulative permitted hours for each max wind speed and lift height
+    permitted_hours = dict()
+    lifts = list()
+    travel_setup_time = np.zeros(len(operations))
+    for operation_num, operation in enumerate(operations):
+        operation_lifts = lift_data[lift_data['Operation'] == operation]
+        travel_setup_time[operation_num] = (operation_lifts['Travel time hr'].max() +
+                                            operation_lifts['Setup time hr'].max())
+        lifts.append(list())
+        for [lift_time, vmax, lift_height] in operation_lifts[['Lift time hr', 'vmax', 'Lift height m']].values:
+            key = (float(vmax), float(lift_height))
+            if key not in permitted_hours:
+                permitted_hours[key] = calculate_permitted_hours(weather_window=weather_window,
+                                                                 vmax=key[0],
+                                                                 lift_height=key[1],
+                                                                 wind_shear_exponent=wind_shear_exponent)
+            lifts[operation_num].append((float(lift_time), permitted_hours[key]))
+
+    # time each turbine is ready for each operation (turbines are delivered at start of each day of operation)
+    ready_time = np.full((len(operations), num_turbines), np.inf)
+    if rate_of_deliveries is None:
+        ready_time[0] = 0
+    else:
+        turbines_per_day = float(rate_of_deliveries) / days_per_week
+        ready_time[0] = np.floor(np.arange(num_turbines) / turbines_per_day) * operational_hrs_per_day
+
+    # schedule for each operation (rows) and turbine (columns)
+    start_time = np.full((len(operations), num_turbines), np.nan)
+    finish_time = np.full((len(operations), num_turbines), np.nan)
+    weather_time = np.zeros((len(operations), num_turbines))
+    turbine_crane = np.zeros((len(operations), num_turbines), dtype=int)
+
+    # crane state
+    crane_operation = np.repeat(np.arange(len(operations)),
+                                [int(num_cranes.get(operation, 1)) for operation in operations])
+    crane_start = np.full(len(crane_operation), np.nan)
+    crane_finish = np.full(len(crane_operation), np.nan)
+    next_turbine = np.zeros(len(operations), dtype=int)
+    waiting_cranes = [list() for operation in operations]
+
+    # event queue of (time, event number, crane or -1 - operation for turbine ready, turbine)
+    event_queue = [(0.0, crane, crane, -1) for crane in range(len(crane_operation))]
+    heapq.heapify(event_queue)
+    num_events = len(event_queue)
+
+    while event_queue:
+        [time, event_num, crane, turbine] = heapq.heappop(event_queue)
+
+        if crane < 0:
+            # turbine is ready for operation; waiting cranes for operation check for next turbine
+            operation_num = -1 - crane
+            ready_time[operation_num, turbine] = time
+            for waiting_crane in waiting_cranes[operation_num]:
+                heapq.heappush(event_queue, (time, num_events, waiting_crane, -1))
+                num_events += 1
+            waiting_cranes[operation_num] = list()
+            continue
+
+        # crane is free; start next turbine for operation if it is ready
+        operation_num = crane_operation[crane]
+        turbine = next_turbine[operation_num]
+        if turbine >= num_turbines:
+            continue
+        if ready_time[operation_num, turbine] == np.inf:
+            waiting_cranes[operation_num].append(crane)
+            continue
+        next_turbine[operation_num] += 1
+
+        # travel to turbine and set up crane (not limited by wind), then complete each lift
+        start = max(time, ready_time[operation_num, turbine])
+        finish = start + travel_setup_time[operation_num]
+        weather = 0
+        for [lift_time, lift_permitted_hours] in lifts[operation_num]:
+            lift_finish = calculate_finish_time(permitted_hours=lift_permitted_hours,
+                                                start_time=finish,
+                                                work_time=lift_time)
+            weather += lift_finish - finish - lift_time
+            finish = lift_finish
+
+        start_time[operation_num, turbine] = start
+        finish_time[operation_num, turbine] = finish
+        weather_time[operation_num, turbine] = weather
+        turbine_crane[operation_num, turbine] = crane
+        if np.isnan(crane_start[crane]):
+            crane_start[crane] = start
+        crane_finish[crane] = finish
+
+        if finish == np.inf:
+            continue
+
+        heapq.heappush(event_queue, (finish, num_events, crane, -1))
+        num_events += 1
+        if operation_num + 1 < len(operations):
+            heapq.heappush(event_queue, (finish, num_events, -2 - operation_num, turbine))
+            num_events += 1
+
+    schedule = pd.DataFrame({'Turbine': np.tile(np.arange(num_turbines), len(operations)),
+                             'Operation': np.repeat(operations, num_turbines),
+                             'Crane number': turbine_crane.ravel(),
+                             'Start hr': start_time.ravel(),
+                             'Finish hr': finish_time.ravel(),
+                             'Weather delay hr': weather_time.ravel()},
+                            columns=['Turbine', 'Operation', 'Crane number', 'Start hr', 'Finish hr',
+                                     'Weather delay hr'])
+
+    # cranes are on site from start of first turbine to finish of last turbine
+    crane_time = np.nan_to_num(crane_finish - crane_start)
+    total_time = np.bincount(crane_operation, weights=crane_time, minlength=len(operations))
+    time_weather = weather_time.sum(axis=1)
+    operation_summary = pd.DataFrame({'Operation': operations,
+                                      'Number of cranes': np.bincount(crane_operation, minlength=len(operations)),
+                                      'Total time hrs': total_time,
+                                      'Time weather hrs': time_weather,
+                                      'Operation time hrs': total_time - time_weather},
+                                     columns=['Operation', 'Number of cranes', 'Total time hrs', 'Time weather hrs',
+                                              'Operation time hrs'])
+
+    return schedule, operation_summary
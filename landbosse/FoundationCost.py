@@ -52,8 +52,8 @@ Calculate the total foundation cost based on amount of equipment, amount of labo
 import pandas as pd
 import numpy as np
 import WeatherDelay as WD
-from sympy.solvers import solve
-from sympy import Symbol
+import hashlib
+from collections import OrderedDict
 
 # constants
 kg_per_tonne = 1000
@@ -61,35 +61,95 @@ cubicm_per_cubicft = 0.0283168
 steel_density = 9490  # kg / m^3
 cubicyd_per_cubicm = 1.30795
 ton_per_tonne = 0.907185
+pa_per_kpa = 1000
 
+# foundation design constants
+safety_overturn = 1.5
+unit_weight_fill = 17.3e3  # in N / m^3
+unit_weight_concrete = 23.6e3  # in N / m^3
+rated_thrust = 742e3  # thrust for IEA 37 reference machine in N (unfactored) # todo: update to user input
+default_bearing_pressure = 203500 * 1.2  # N / m^2 # todo: update to user input
 
-def calculate_foundation_loads(component_data, depth):
+# mobilization cost as a fraction of total foundation cost
+mobilization_fraction = 0.1
+
+# columns of component data used for foundation loads (see calculate_component_loads)
+load_columns = ['Mass tonne', 'Section height m', 'Surface area sq m', 'Coeff drag (installed)', 'Lever arm m',
+                'Multplier drag rotor', 'Multiplier tower drag']
+
+# cache of foundation loads by content of component data used for foundation loads and depth; max_size limits the
+# number of cached foundation loads (least recently used are evicted first)
+foundation_loads_cache = OrderedDict()
+foundation_loads_cache_settings = {'max_size': 1000}
+foundation_loads_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def calculate_bearing_radius(e, a_eff):
+    """
+    Calculates the foundation radius based on bearing pressure, i.e., the largest real root x of
+    2 * (x ** 2 - e * (x ** 2 - e ** 2) ** 0.5) = a_eff. Substituting y = x ** 2 and squaring gives the quadratic
+    4 * y ** 2 - 4 * (a_eff + e ** 2) * y + (a_eff ** 2 + 4 * e ** 4) = 0; roots of the quadratic are kept if they solve
+    the original equation (y >= e ** 2 and 2 * y - a_eff has the same sign as e).
+
+    :param e: eccentricity of load (in meters); scalar or array
+    :param a_eff: effective area for bearing pressure (in square meters); scalar or array
+    :return: foundation radius based on bearing pressure (NaN where there is no real root)
     """
 
-    :param component_data: data on components (weight, height, area, etc.)
-    :param depth: depth in meters
-    :return: foundation loads
+    e = np.asarray(e, dtype=float)
+    a_eff = np.asarray(a_eff, dtype=float)
+
+    # roots of quadratic in y (smaller root from product of roots to avoid cancellation)
+    discriminant = e ** 2 * (2 * a_eff - 3 * e ** 2)
+    sqrt_discriminant = np.sqrt(np.where(discriminant >= 0, discriminant, np.nan))
+    y_large = (a_eff + e ** 2 + sqrt_discriminant) / 2
+    y_small = np.where(y_large != 0, (a_eff ** 2 + 4 * e ** 4) / 4 / np.where(y_large != 0, y_large, 1), 0)
+
+    # keep roots that solve the original equation (within rounding of the quadratic)
+    tolerance = 1e-12 * np.abs(a_eff + e ** 2)
+    radius = np.full(np.broadcast(e, a_eff).shape, np.nan)
+    for y in [y_small, y_large]:
+        valid = (y - e ** 2 >= -tolerance) & (e * (2 * y - a_eff) >= -tolerance * np.abs(e))
+        radius = np.where(valid, np.sqrt(np.maximum(y, 0)), radius)
+
+    return radius
+
+
+def calculate_component_loads(component_data, variant=None):
+    """
+    Calculates the loads on the foundation from the components of each turbine variant.
+
+    :param component_data: data on components (weight, height, area, etc.) for one or more turbine variants
+    :param variant: array with turbine variant for each row of component data (all rows are one variant if not
+                    provided)
+    :return: array of variants and arrays of dead load (in N), lateral load (in N), total moment (in N * m), and
+             horizontal load (in N) for each variant
     """
 
+    if variant is None:
+        variant = np.zeros(len(component_data), dtype=int)
+    [variant_id, variants] = pd.factorize(np.asarray(variant))
+    num_variants = len(variants)
+
     # set exposure constants
     a = 9.5
     z_g = 274.32
 
     # get section height
-    z = component_data['Section height m']
+    z = component_data['Section height m'].values.astype(float)
 
     # get cross-sectional area
-    a_f = component_data['Surface area sq m']
+    a_f = component_data['Surface area sq m'].values.astype(float)
 
     # get coefficient of drag
-    c_d = component_data['Coeff drag (installed)']
+    c_d = component_data['Coeff drag (installed)'].values.astype(float)
 
     # get lever arm
-    l = component_data['Lever arm m']
+    l = component_data['Lever arm m'].values.astype(float)
 
     # get multipliers for tower and rotor
-    multiplier_rotor = component_data['Multplier drag rotor']
-    multiplier_tower = component_data['Multiplier tower drag']
+    multiplier_rotor = component_data['Multplier drag rotor'].values.astype(float)
+    multiplier_tower = component_data['Multiplier tower drag'].values.astype(float)
 
     # Equations from Shrestha, S. 2015. DESIGN AND ANALYSIS OF FOUNDATION FOR ONSHORE TALL WIND TURBINES. All Theses. Paper 2291.
     # https: // tigerprints.clemson.edu / cgi / viewcontent.cgi?referer = https: // www.google.com / & httpsredir = 1 & article = 3296 & context = all_theses
@@ -116,34 +176,74 @@ def calculate_foundation_loads(component_data, depth):
 
     # calculate dead load in N
     g = 9.8  # m / s ^ 2
-    f_dead = component_data['Mass tonne'].sum() * g * kg_per_tonne / 1.15  # scaling factor to adjust dead load for uplift
+    mass = np.bincount(variant_id, weights=component_data['Mass tonne'].values.astype(float), minlength=num_variants)
+    f_dead = mass * g * kg_per_tonne / 1.15  # scaling factor to adjust dead load for uplift
 
-    # calculate moment from each component at base of tower
-    m_overturn = f * l
+    # get total lateral load (N) and moment from each component at base of tower (N * m)
+    f_lat = np.bincount(variant_id, weights=f, minlength=num_variants)
+    m_overturn = np.bincount(variant_id, weights=f * l, minlength=num_variants)
 
-    safety_overturn = 1.5
-    unit_weight_fill = 17.3e3  # in N / m^3
-    unit_weight_concrete = 23.6e3  # in N / m^3
-    rated_thrust = 742e3  # thrust for IEA 37 reference machine in N (unfactored) # todo: update to user input
-    bearing_pressure = 203500 * 1.2  # N / m^2 # todo: update to user input
+    max_lever_arm = np.full(num_variants, -np.inf)
+    np.maximum.at(max_lever_arm, variant_id, l)
+    m_thrust = rated_thrust * max_lever_arm
+    m_tot = np.maximum(m_thrust, m_overturn)
 
-    # get total lateral load (N) and moment (N * m)
-    f_lat = f.sum()
-    m_overturn = m_overturn.sum()
+    f_horiz = np.maximum(f_lat, rated_thrust)
 
-    m_thrust = rated_thrust * max(l)
-    m_tot = max(m_thrust, m_overturn)
+    return np.asarray(variants), f_dead, f_lat, m_tot, f_horiz
 
-    f_horiz = max(f_lat, rated_thrust)
 
-    p = [(np.pi * depth * (2 / 3 * unit_weight_fill + 1 / 3 * unit_weight_concrete)),
-         0,
-         f_dead,
-         - (safety_overturn * (m_tot + f_horiz * depth))]
+def calculate_overturn_radius(f_dead, m_tot, f_horiz, depth):
+    """
+    Calculates the foundation radius based on overturning moment, i.e., the real root r of the cubic
+    pi * depth * unit weight * r ** 3 + f_dead * r - safety factor * (m_tot + f_horiz * depth) = 0 (the cubic has one
+    real root because all coefficients except the constant are positive).
+
+    :param f_dead: dead load (in N); scalar or array
+    :param m_tot: total moment (in N * m); scalar or array
+    :param f_horiz: horizontal load (in N); scalar or array
+    :param depth: depth of foundation (in meters); scalar or array
+    :return: foundation radius based on overturning moment
+    """
+
+    unit_weight = 2 / 3 * unit_weight_fill + 1 / 3 * unit_weight_concrete
+    cubic = np.pi * np.asarray(depth, dtype=float) * unit_weight
+    linear = np.asarray(f_dead, dtype=float)
+    constant = - (safety_overturn * (m_tot + f_horiz * depth))
+
+    # real root of depressed cubic r ** 3 + p * r + q = 0 (Cardano), or of linear equation if depth is zero
+    nonzero_cubic = np.where(cubic != 0, cubic, 1)
+    p = linear / nonzero_cubic
+    q = constant / nonzero_cubic
+    u = np.cbrt(-q / 2 + np.sqrt(q ** 2 / 4 + p ** 3 / 27))
+    r = np.where(cubic != 0, u - p / (3 * np.where(u != 0, u, 1)), -constant / linear)
+
+    # refine root with Newton steps on the cubic
+    for step in range(2):
+        r = r - (cubic * r ** 3 + linear * r + constant) / (3 * cubic * r ** 2 + linear)
+
+    return r
+
+
+def calculate_foundation_radius(f_dead, m_tot, f_horiz, depth, bearing_pressure=None):
+    """
+    Calculates the foundation radius for each of the three foundation design criteria (overturning moment, shear, and
+    bearing pressure) and the foundation radius (largest radius) from the foundation loads.
+
+    :param f_dead: dead load (in N); scalar or array
+    :param m_tot: total moment (in N * m); scalar or array
+    :param f_horiz: horizontal load (in N); scalar or array
+    :param depth: depth of foundation (in meters); scalar or array
+    :param bearing_pressure: allowable bearing pressure (in N / m^2; default bearing pressure if not provided)
+    :return: arrays of foundation radius based on overturning moment, shear, and bearing pressure, and foundation radius
+             (NaN where no radius satisfies bearing pressure)
+    """
+
+    if bearing_pressure is None:
+        bearing_pressure = default_bearing_pressure
 
     # calculate foundation radius based on overturning moment
-    r = np.roots(p)
-    r = np.real(r[np.isreal(r)])[0]
+    r = calculate_overturn_radius(f_dead=f_dead, m_tot=m_tot, f_horiz=f_horiz, depth=depth)
 
     # calculate foundation radius based on shear
     foundation_vol = np.pi * r ** 2 * depth
@@ -152,25 +252,196 @@ def calculate_foundation_loads(component_data, depth):
     r_2 = e * 3 / 2
 
     # calculate foundation radius based on bearing pressure
-    r_pick = max(r, r_2)
     a_eff = v_1 / bearing_pressure
-    x = Symbol('x')
-    r_3 = max(solve(2 * (x ** 2 - e * (x ** 2 - e ** 2) ** 0.5) - a_eff, x))
+    r_3 = calculate_bearing_radius(e=e, a_eff=a_eff)
 
     # pick the largest foundation radius based on all three foundation design criteria: moment, shear, bearing
-    r_pick = max(r_pick, r_3)
+    r_pick = np.maximum(np.maximum(r, r_2), r_3)
+
+    return r, r_2, r_3, r_pick
+
+
+def calculate_foundation_sizes(component_data, depth, variant=None, bearing_pressure=None):
+    """
+    Calculates the foundation loads and size for each turbine variant and foundation depth at once. The foundation
+    radius is the largest radius based on the three foundation design criteria: overturning moment, shear, and bearing
+    pressure.
+
+    :param component_data: data on components (weight, height, area, etc.) for one or more turbine variants (see
+                           calculate_component_loads)
+    :param depth: array of foundation depths (in meters)
+    :param variant: array with turbine variant for each row of component data (all rows are one variant if not
+                    provided)
+    :param bearing_pressure: allowable bearing pressure (in N / m^2; default bearing pressure if not provided)
+    :return: dictionary with array of variants, array of depths, and arrays of foundation loads ('F_dead_kN',
+             'F_horiz_kN', 'M_tot_kN_m'), radius for each design criterion ('Radius_o_m', 'Radius_s_m', 'Radius_b_m'),
+             foundation radius ('Radius_m'), and concrete volume ('Foundation_volume_cubic_m') for each variant (rows)
+             and depth (columns); radius is NaN where no radius satisfies bearing pressure
+    """
 
-    foundation_loads = {'F_dead_kN': f_dead / 1e3,
-                        'F_horiz_kN': f_lat / 1e3,
-                        'M_tot_kN_m': m_tot / 1e3,
-                        'Radius_o_m': r,
-                        'Radius_s_m': r_2,
-                        'Radius_b_m': r_3,
-                        'Radius_m': r_pick}
+    [variants, f_dead, f_lat, m_tot, f_horiz] = calculate_component_loads(component_data=component_data,
+                                                                          variant=variant)
+    depths = np.atleast_1d(np.asarray(depth, dtype=float))
+
+    # loads for each variant (rows) and depth (columns)
+    [f_dead, f_lat, m_tot, f_horiz] = [value[:, np.newaxis] for value in [f_dead, f_lat, m_tot, f_horiz]]
+    depth = depths[np.newaxis, :]
+
+    [r, r_2, r_3, r_pick] = calculate_foundation_radius(f_dead=f_dead,
+                                                        m_tot=m_tot,
+                                                        f_horiz=f_horiz,
+                                                        depth=depth,
+                                                        bearing_pressure=bearing_pressure)
+
+    # only compute the portion of the foundation that is composed of concrete (1/3 concrete; other portion is backfill)
+    foundation_cubic_meters = np.pi * r_pick ** 2 * depth * 0.4
+
+    return {'Variant': variants,
+            'Depth_m': depths,
+            'F_dead_kN': np.broadcast_to(f_dead / 1e3, r.shape),
+            'F_horiz_kN': np.broadcast_to(f_lat / 1e3, r.shape),
+            'M_tot_kN_m': np.broadcast_to(m_tot / 1e3, r.shape),
+            'Radius_o_m': r,
+            'Radius_s_m': r_2,
+            'Radius_b_m': r_3,
+            'Radius_m': r_pick,
+            'Foundation_volume_cubic_m': foundation_cubic_meters}
+
+
+def calculate_foundation_loads(component_data, depth):
+    """
+    Calculates the foundation loads and radius for one turbine and foundation depth (see calculate_foundation_sizes).
+
+    :param component_data: data on components (weight, height, area, etc.)
+    :param depth: depth in meters
+    :return: foundation loads
+    """
+
+    foundation_sizes = calculate_foundation_sizes(component_data=component_data, depth=depth)
+    foundation_loads = {key: float(foundation_sizes[key][0, 0])
+                        for key in ['F_dead_kN', 'F_horiz_kN', 'M_tot_kN_m', 'Radius_o_m', 'Radius_s_m', 'Radius_b_m',
+                                    'Radius_m']}
+
+    if np.isnan(foundation_loads['Radius_b_m']):
+        raise ValueError('No foundation radius satisfies bearing pressure for depth {depth} m'.format(depth=depth))
 
     return foundation_loads
 
 
+def calculate_site_foundation_sizes(component_data, site_data):
+    """
+    Calculates the foundation size for each turbine from site-specific bearing pressure and foundation depth in one
+    pass (foundation loads are the same for all turbines).
+
+    :param component_data: data on components (weight, height, area, etc.)
+    :param site_data: data frame with 'Turbine ID', 'Foundation depth m', and 'Bearing pressure kPa' for each turbine
+    :return: data frame with depth, bearing pressure, radius for each design criterion, foundation radius, and concrete
+             volume for each turbine
+    """
+
+    [variants, f_dead, f_lat, m_tot, f_horiz] = calculate_component_loads(component_data=component_data)
+    depth = site_data['Foundation depth m'].values.astype(float)
+    bearing_pressure = site_data['Bearing pressure kPa'].values.astype(float)
+
+    [r, r_2, r_3, r_pick] = calculate_foundation_radius(f_dead=f_dead[0],
+                                                        m_tot=m_tot[0],
+                                                        f_horiz=f_horiz[0],
+                                                        depth=depth,
+                                                        bearing_pressure=bearing_pressure * pa_per_kpa)
+
+    if np.any(np.isnan(r_3)):
+        raise ValueError('No foundation radius satisfies bearing pressure for turbines {turbines}'
+                         .format(turbines=list(site_data['Turbine ID'].values[np.isnan(r_3)])))
+
+    # only compute the portion of the foundation that is composed of concrete (1/3 concrete; other portion is backfill)
+    foundation_sizes = pd.DataFrame({'Turbine ID': site_data['Turbine ID'].values,
+                                     'Foundation depth m': depth,
+                                     'Bearing pressure kPa': bearing_pressure,
+                                     'Radius_o_m': r,
+                                     'Radius_s_m': r_2,
+                                     'Radius_b_m': r_3,
+                                     'Radius_m': r_pick,
+                                     'Foundation volume cubic m': np.pi * r_pick ** 2 * depth * 0.4},
+                                    columns=['Turbine ID', 'Foundation depth m', 'Bearing pressure kPa', 'Radius_o_m',
+                                             'Radius_s_m', 'Radius_b_m', 'Radius_m', 'Foundation volume cubic m'])
+
+    return foundation_sizes
+
+
+def get_foundation_loads(component_data, depth):
+    """
+    Gets the foundation loads and radius for component data and depth (see calculate_foundation_loads), reusing results
+    from foundation_loads_cache for component data with the same content in the columns used for foundation loads
+    (e.g., scenarios with the same turbine).
+
+    :param component_data: data on components (weight, height, area, etc.)
+    :param depth: depth in meters
+    :return: foundation loads
+    """
+
+    # columns used for foundation loads are numeric, so the key is based on their values as floats
+    load_data = np.array([component_data[column].values for column in load_columns], dtype=float)
+    key = (hashlib.sha1(load_data.tobytes()).hexdigest(), load_data.shape, float(depth))
+    if key in foundation_loads_cache:
+        foundation_loads_cache_stats['hits'] += 1
+        foundation_loads_cache.move_to_end(key)
+        foundation_loads = foundation_loads_cache[key]
+    else:
+        foundation_loads = calculate_foundation_loads(component_data=component_data, depth=depth)
+        foundation_loads_cache[key] = foundation_loads
+        foundation_loads_cache_stats['misses'] += 1
+        evict_foundation_loads_cache()
+
+    return dict(foundation_loads)
+
+
+def configure_foundation_loads_cache(max_size=None):
+    """
+    Sets size limit for the foundation loads cache used by get_foundation_loads.
+
+    :param max_size: maximum number of foundation loads to keep in cache
+    """
+
+    if max_size is not None:
+        if max_size < 1:
+            raise ValueError('Foundation loads cache size must be at least 1')
+        foundation_loads_cache_settings['max_size'] = int(max_size)
+
+    evict_foundation_loads_cache()
+
+
+def evict_foundation_loads_cache():
+    """
+    Evicts least recently used foundation loads until the foundation loads cache is within its size limit.
+    """
+
+    while len(foundation_loads_cache) > foundation_loads_cache_settings['max_size']:
+        foundation_loads_cache.popitem(last=False)
+        foundation_loads_cache_stats['evictions'] += 1
+
+
+def get_foundation_loads_cache_stats():
+    """
+    Gets statistics for the foundation loads cache used by get_foundation_loads.
+
+    :return: dictionary with number of cache hits, cache misses, evictions, and cached foundation loads
+    """
+
+    stats = dict(foundation_loads_cache_stats)
+    stats['size'] = len(foundation_loads_cache)
+    return stats
+
+
+def clear_foundation_loads_cache():
+    """
+    Clears the foundation loads cache used by get_foundation_loads and resets its statistics.
+    """
+
+    foundation_loads_cache.clear()
+    for key in foundation_loads_cache_stats:
+        foundation_loads_cache_stats[key] = 0
+
+
 def determine_foundation_size(foundation_loads, depth):
     """
     Calculates the radius of a round, raft foundation
@@ -226,7 +497,7 @@ def estimate_construction_time(throughput_operations, material_needs, duration_c
     # if more than one crew needed to complete within construction duration then assume that all construction happens
     # within that window and use that timeframe for weather delays; if not, use the number of days calculated
     operation_data['time_construct_bool'] = operation_data['Number of days'] > foundation_construction_time * 30
-    boolean_dictionary = {True: foundation_construction_time * 30, False: np.NAN}
+    boolean_dictionary = {True: foundation_construction_time * 30, False: np.nan}
     operation_data['time_construct_bool'] = operation_data['time_construct_bool'].map(boolean_dictionary)
     operation_data['Time construct days'] = operation_data[['time_construct_bool', 'Number of days']].min(axis=1)
 
@@ -234,7 +505,7 @@ def estimate_construction_time(throughput_operations, material_needs, duration_c
 
 
 def calculate_weather_delay(weather_window, duration_construction, start_delay, critical_wind_speed,
-                            operational_hrs_per_day, height_interest, wind_shear_exponent):
+                            operational_hrs_per_day, height_interest, wind_shear_exponent, weather_index=None):
     """
     Calculates wind delay for foundations.
 
@@ -245,30 +516,93 @@ def calculate_weather_delay(weather_window, duration_construction, start_delay,
     :param operational_hrs_per_day: number of hours of operation per day
     :param height_interest: height of interest for weather delay calculations
     :param wind_shear_exponent: wind shear exponent
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
     :return: the total wind delay (in hours) as estimated based on the input parameters
     """
 
     # convert days of work to hours of work
     mission_time_hrs = duration_construction * operational_hrs_per_day
 
-    # compute weather delay
-    wind_delay = WD.calculate_wind_delay(weather_window=weather_window,
-                                         start_delay=start_delay,
-                                         mission_time=mission_time_hrs,
-                                         critical_wind_speed=critical_wind_speed,
-                                         height_interest=height_interest,
-                                         wind_shear_exponent=wind_shear_exponent)
-    wind_delay = pd.DataFrame(wind_delay)
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
 
+    # compute weather delay
     # if greater than 4 hour delay, then shut down for full day (10 hours)
-    wind_delay[(wind_delay > 4)] = 10
-    wind_delay_time = float(wind_delay.sum())
+    wind_delay_time = float(WD.calculate_cached_delay(weather_index=weather_index,
+                                                      start_delay=start_delay,
+                                                      mission_time=mission_time_hrs,
+                                                      critical_wind_speed=critical_wind_speed,
+                                                      height_interest=height_interest,
+                                                      wind_shear_exponent=wind_shear_exponent))
 
     return wind_delay_time
 
 
+def calculate_weather_delay_by_year(weather_window, duration_construction, critical_wind_speed,
+                                    operational_hrs_per_day, height_interest, wind_shear_exponent):
+    """
+    Calculates wind delay for foundations for each year of weather data in the weather window.
+
+    :param weather_window: data frame with weather data for time window associated with construction period
+    :param duration_construction: the length of construction time for the entire project (in months)
+    :param critical_wind_speed: the critical wind speed for determining wind delay
+    :param operational_hrs_per_day: number of hours of operation per day
+    :param height_interest: height of interest for weather delay calculations
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: array of years and the total wind delay (in hours) for each year as estimated based on the input parameters
+    """
+
+    # convert days of work to hours of work
+    mission_time_hrs = duration_construction * operational_hrs_per_day
+
+    # compute weather delay for each year
+    # if greater than 4 hour delay, then shut down for full day (10 hours)
+    [years, year_hours, wind_delay_time] = WD.calculate_capped_delay_by_year(weather_window=weather_window,
+                                                                             mission_time=mission_time_hrs,
+                                                                             critical_wind_speed=critical_wind_speed,
+                                                                             height_interest=height_interest,
+                                                                             wind_shear_exponent=wind_shear_exponent)
+
+    return years, wind_delay_time[:, 0]
+
+
+def calculate_weather_delay_by_start(weather_window, duration_construction, start_fraction, critical_wind_speed,
+                                    operational_hrs_per_day, height_interest, wind_shear_exponent, weather_index=None):
+    """
+    Calculates wind delay for foundations for many different construction start times in the weather window.
+
+    :param weather_window: data frame with weather data for time window associated with construction period
+    :param duration_construction: the length of construction time for the entire project (in months)
+    :param start_fraction: array of start times as a fraction (0 to 1) of the latest start in the weather window
+    :param critical_wind_speed: the critical wind speed for determining wind delay
+    :param operational_hrs_per_day: number of hours of operation per day
+    :param height_interest: height of interest for weather delay calculations
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
+    :return: array of start delays (in hours) and the total wind delay (in hours) for each start
+    """
+
+    # convert days of work to hours of work
+    mission_time_hrs = duration_construction * operational_hrs_per_day
+
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
+
+    # compute weather delay for each start
+    # if greater than 4 hour delay, then shut down for full day (10 hours)
+    [start_delay, wind_delay_time] = WD.calculate_capped_delay_by_start(weather_index=weather_index,
+                                                                        start_fraction=start_fraction,
+                                                                        mission_time=mission_time_hrs,
+                                                                        critical_wind_speed=critical_wind_speed,
+                                                                        height_interest=height_interest,
+                                                                        wind_shear_exponent=wind_shear_exponent)
+
+    return start_delay, wind_delay_time
+
+
 def calculate_costs(input_data, num_turbines, construction_time, weather_window, operational_hrs_per_day,
-                    overtime_multiplier, wind_shear_exponent, depth):
+                    overtime_multiplier, wind_shear_exponent, depth, weather_index=None, multi_year=False,
+                    start_delay=0, start_samples=None, site_data=None):
     """
 
     :param input_data:
@@ -279,15 +613,39 @@ def calculate_costs(input_data, num_turbines, construction_time, weather_window,
     :param overtime_multiplier:
     :param wind_shear_exponent:
     :param depth:
-    :return:
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
+    :param multi_year: if true, also returns data frame with wind multiplier for each year of weather data
+    :param start_delay: the delay (in hours) from the start of the weather window to the start of construction
+    :param start_samples: array of sampled construction start times as a fraction (0 to 1) of the latest start in the
+                          weather window; if provided, also returns data frame with wind multiplier and wind delay
+                          cost for each sample
+    :param site_data: data frame with site-specific foundation depth and bearing pressure for each turbine (see
+                      calculate_site_foundation_sizes); if provided, the foundation for each turbine is sized separately
+                      (depth is not used) and the data frame with foundation size by turbine is returned
+    :return: data frame with total foundation costs by type of cost, wind multiplier, and dictionary of other outputs
+             with data frames of wind multiplier by year (if multi year), by start sample (if start samples are
+             provided), and foundation size by turbine (if site data is provided); the dictionary is empty if no other
+             outputs are requested
     """
 
-    foundation_loads = calculate_foundation_loads(component_data=input_data['components'], depth=depth)
-    # print(foundation_loads)
-    foundation_volume = determine_foundation_size(foundation_loads=foundation_loads, depth=depth)
-    # print(foundation_volume)
-    material_vol = estimate_material_needs(foundation_volume=foundation_volume, num_turbines=num_turbines)
-    # print(material_vol)
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
+    other_outputs = dict()
+
+    if site_data is not None:
+        foundation_sizes = calculate_site_foundation_sizes(component_data=input_data['components'], site_data=site_data)
+        if len(foundation_sizes) != num_turbines:
+            raise ValueError('Foundation site data has {sites} turbines but project has {num_turbines} turbines'
+                             .format(sites=len(foundation_sizes), num_turbines=num_turbines))
+        other_outputs['Foundation size by turbine'] = foundation_sizes
+
+        # material needs are for the total volume of all foundations
+        material_vol = estimate_material_needs(foundation_volume=foundation_sizes['Foundation volume cubic m'].sum(),
+                                               num_turbines=1)
+    else:
+        foundation_loads = get_foundation_loads(component_data=input_data['components'], depth=depth)
+        foundation_volume = determine_foundation_size(foundation_loads=foundation_loads, depth=depth)
+        material_vol = estimate_material_needs(foundation_volume=foundation_volume, num_turbines=num_turbines)
     material_data = pd.merge(material_vol, input_data['material_price'], on=['Material type ID'])
     material_data['Cost USD'] = material_data['Quantity of material'] * pd.to_numeric(material_data['Material price USD per unit'])
 
@@ -297,20 +655,54 @@ def calculate_costs(input_data, num_turbines, construction_time, weather_window,
 
     wind_delay = calculate_weather_delay(weather_window=weather_window,
                                          duration_construction=operation_data['Time construct days'].max(skipna=True),
-                                         start_delay=0,
+                                         start_delay=start_delay,
                                          critical_wind_speed=13,
                                          operational_hrs_per_day=operational_hrs_per_day,
                                          height_interest=20,
-                                         wind_shear_exponent=wind_shear_exponent)
+                                         wind_shear_exponent=wind_shear_exponent,
+                                         weather_index=weather_index)
 
     wind_delay_percent = (wind_delay / operational_hrs_per_day) / operation_data['Time construct days'].max(skipna=True)
     wind_multiplier = 1 / (1 - wind_delay_percent)
 
+    if multi_year:
+        [years, wind_delay_by_year] = calculate_weather_delay_by_year(weather_window=weather_window,
+                                                                      duration_construction=operation_data['Time construct days'].max(skipna=True),
+                                                                      critical_wind_speed=13,
+                                                                      operational_hrs_per_day=operational_hrs_per_day,
+                                                                      height_interest=20,
+                                                                      wind_shear_exponent=wind_shear_exponent)
+        wind_delay_percent_by_year = (wind_delay_by_year / operational_hrs_per_day) / operation_data['Time construct days'].max(skipna=True)
+        other_outputs['Wind multiplier by year'] = pd.DataFrame({'Year': years,
+                                                                 'Wind multiplier': 1 / (1 - wind_delay_percent_by_year)},
+                                                                columns=['Year', 'Wind multiplier'])
+
+    if start_samples is not None:
+        [sample_start_delay, sample_wind_delay] = calculate_weather_delay_by_start(weather_window=weather_window,
+                                                                                   duration_construction=operation_data['Time construct days'].max(skipna=True),
+                                                                                   start_fraction=start_samples,
+                                                                                   critical_wind_speed=13,
+                                                                                   operational_hrs_per_day=operational_hrs_per_day,
+                                                                                   height_interest=20,
+                                                                                   wind_shear_exponent=wind_shear_exponent,
+                                                                                   weather_index=weather_index)
+        sample_wind_delay_percent = (sample_wind_delay / operational_hrs_per_day) / operation_data['Time construct days'].max(skipna=True)
+        sample_wind_multiplier = 1 / (1 - sample_wind_delay_percent)
+
     labor_equip_data = pd.merge(material_vol, input_data['rsmeans'], on=['Material type ID'])
     per_diem = operation_data['Number of workers'] * operation_data['Number of crews'] * (operation_data['Time construct days'] + round(operation_data['Time construct days'] / 7)) * 144
     where_are_na_ns = np.isnan(per_diem)
     per_diem[where_are_na_ns] = 0
-    labor_equip_data['Cost USD'] = (labor_equip_data['Quantity of material'] * labor_equip_data['Rate USD per unit'] * overtime_multiplier + per_diem) * wind_multiplier
+    labor_equip_data['Cost without wind delay USD'] = labor_equip_data['Quantity of material'] * labor_equip_data['Rate USD per unit'] * overtime_multiplier + per_diem
+    labor_equip_data['Cost USD'] = labor_equip_data['Cost without wind delay USD'] * wind_multiplier
+
+    # wind delay cost (including mobilization) for each sampled construction start
+    if start_samples is not None:
+        other_outputs['Start samples'] = pd.DataFrame({'Start delay hr': sample_start_delay,
+                                                       'Wind multiplier': sample_wind_multiplier,
+                                                       'Wind delay cost USD': labor_equip_data['Cost without wind delay USD'].sum() *
+                                                                              (sample_wind_multiplier - 1) * (1 + mobilization_fraction)},
+                                                      columns=['Start delay hr', 'Wind multiplier', 'Wind delay cost USD'])
 
     foundation_cost = labor_equip_data[['Operation ID', 'Type of cost', 'Cost USD']]
 
@@ -319,15 +711,15 @@ def calculate_costs(input_data, num_turbines, construction_time, weather_window,
     material_costs['Type of cost'] = 'Materials'
     material_costs['Cost USD'] = material_data['Cost USD']
 
-    foundation_cost = foundation_cost.append(material_costs)
+    foundation_cost = pd.concat([foundation_cost, material_costs], sort=True)
 
     # calculate mobilization cost as percentage of total foundation cost
-    mob_cost = pd.DataFrame([['Mobilization', 'Mobilization', foundation_cost['Cost USD'].sum() * 0.1]], columns=['Operation ID', 'Type of cost', 'Cost USD'])
-    foundation_cost = foundation_cost.append(mob_cost)
+    mob_cost = pd.DataFrame([['Mobilization', 'Mobilization', foundation_cost['Cost USD'].sum() * mobilization_fraction]], columns=['Operation ID', 'Type of cost', 'Cost USD'])
+    foundation_cost = pd.concat([foundation_cost, mob_cost], sort=True)
 
-    total_foundation_cost = foundation_cost.groupby(by=['Type of cost']).sum().reset_index()
+    total_foundation_cost = foundation_cost.groupby(by=['Type of cost'])[['Cost USD']].sum().reset_index()
     total_foundation_cost['Phase of construction'] = 'Foundations'
 
     # print(foundation_cost)
-    return total_foundation_cost, wind_multiplier
+    return total_foundation_cost, wind_multiplier, other_outputs
 
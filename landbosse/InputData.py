@@ -0,0 +1,283 @@
+"""
+InputData.py
+
+Reads input data for LandBOSSE from csv files. Input data can be read once into an input bundle and reused for each
+scenario that is run with the same input files.
+
+Input bundles can be exported to a single binary file (JSON manifest followed by the data for each column) that is
+loaded by memory mapping the file, so that input data does not need to be parsed from text. Numeric columns of loaded
+tables are read-only views of the file (pages are shared by processes that load the same file); text columns are
+copied into memory when the file is loaded.
+"""
+
+import WeatherDelay as WD
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import struct
+
+# binary input bundle files start with the bundle file signature and the length of the JSON manifest; data for each
+# column starts at a multiple of bundle_alignment bytes from the start of the file
+bundle_signature = b'LANDBOSSE-BUNDLE'
+bundle_version = 1
+bundle_alignment = 64
+
+# data types for columns of each input table (columns that are not listed are typed by the csv parser)
+input_dtypes = {'project': {'Project ID': str,
+                            'Hub height m': float,
+                            'Number of turbines': float,
+                            'Turbine spacing (times rotor diameter)': float,
+                            'Rotor diameter m': float,
+                            'Turbine rating MW': float,
+                            'Rate of deliveries (turbines per week)': float,
+                            'Wind shear exponent': float,
+                            'Tower type': str,
+                            'Foundation depth m': float,
+                            'Breakpoint between base and topping (percent)': float,
+                            'Fuel cost USD per gal': float},
+                'components': {'Component': str,
+                               'Mass tonne': float,
+                               'Lift height m': float,
+                               'Surface area sq m': float,
+                               'Coeff drag': float,
+                               'Coeff drag (installed)': float,
+                               'Section height m': float,
+                               'Lever arm m': float,
+                               'Multplier drag rotor': float,
+                               'Multiplier tower drag': float,
+                               'Cycle time installation hrs': float,
+                               'Offload hook height m': float,
+                               'Offload cycle time hrs': float},
+                'foundation_sites': {'Project ID': str,
+                                     'Turbine ID': str,
+                                     'Foundation depth m': float,
+                                     'Bearing pressure kPa': float},
+                'crane_specs': {'Equipment name': str,
+                                'Crane name': str,
+                                'Boom system': str,
+                                'Crane capacity tonne': float,
+                                'Max capacity tonne': float,
+                                'Hub height m': float,
+                                'Max wind speed m per s': float,
+                                'Hoist speed m per min': float,
+                                'Speed of travel km per hr': float,
+                                'Setup time hr': float,
+                                'Crew type ID': str,
+                                'Mobilization cost USD': float},
+                'crew': {'Crew type ID': str,
+                         'Operation': str,
+                         'Crew type': str,
+                         'Crew name': str,
+                         'Labor type ID': str,
+                         'Number of workers': float},
+                'crew_price': {'Labor type ID': str,
+                               'Hourly rate USD per hour': float,
+                               'Per diem USD per day': float},
+                'equip_price': {'Equipment name': str,
+                                'Crane capacity tonne': float,
+                                'Equipment price USD per hour': float,
+                                'Fuel consumption gal per day': float},
+                'material_price': {'Material type ID': str,
+                                   'Material price USD per unit': float},
+                'rsmeans': {'Module': str,
+                            'Material type ID': str,
+                            'Operation ID': str,
+                            'Type of cost': str,
+                            'Units': str,
+                            'Daily output': float,
+                            'Rate USD per unit': float,
+                            'Number of workers': float,
+                            'Per Diem Hours (per unit)': float}}
+
+
+def read_input_table(name, input_file):
+    """
+    Reads an input table from a csv file using the declared data types for the table (see input_dtypes).
+
+    :param name: name of input table (e.g., 'project', 'crane_specs')
+    :param input_file: path to csv file with input data
+    :return: data frame with input data
+    """
+
+    # only declare data types for columns in the csv file
+    columns = pd.read_csv(input_file, nrows=0).columns
+    dtypes = {column: dtype for column, dtype in input_dtypes.get(name, dict()).items() if column in columns}
+
+    return pd.read_csv(input_file, dtype=dtypes)
+
+
+class InputBundle(object):
+    """
+    Input data for LandBOSSE that is read from csv files (or a binary input bundle file, see load_input_bundle) once
+    and can be passed to LandBOSSE.calculate_bos_cost for each scenario in place of the dictionary of files. Tables in
+    the input bundle are not changed by the model.
+    """
+
+    def __init__(self, files=None):
+        """
+        Reads and types each input table (weather data is read as raw content and converted to a weather window when
+        it is needed, see load_weather_window).
+
+        :param files: dictionary of files with input data from the user (if not provided, the input bundle is empty)
+        """
+
+        self.files = dict() if files is None else dict(files)
+        self.data = dict()
+        self.weather_content = None
+        self.weather_hash = None
+        self.weather_hours = None
+
+        for file in self.files:
+            if file == 'weather':
+                with open(self.files[file], 'rb') as weather_stream:
+                    self.weather_content = weather_stream.read()
+                self.weather_hash = hashlib.sha1(self.weather_content).hexdigest()
+            else:
+                self.data[file] = read_input_table(name=file, input_file=self.files[file])
+
+    def get_weather_hours(self):
+        """
+        Gets weather data for each hour in the input bundle (weather file content is parsed the first time).
+
+        :return: data frame with year, month, day, hour, and wind speed for each hour of weather data
+        """
+
+        if self.weather_hours is None:
+            self.weather_hours = WD.read_weather_hours(weather_content=self.weather_content)
+
+        return self.weather_hours
+
+    def load_weather_window(self, season_id, season_construct, time_construct):
+        """
+        Loads the weather window for the weather data in the input bundle (see WeatherDelay.load_weather_window).
+
+        :param season_id: dictionary that maps seasons to months
+        :param season_construct: list of seasons for construction (e.g., ['spring', 'summer'])
+        :param time_construct: string that describes operational time (e.g., normal vs. long hours)
+        :return: weather_window: filtered weather window containing data specific to season and time of construction
+        """
+
+        return WD.load_weather_window(weather_file=self.files['weather'],
+                                      season_id=season_id,
+                                      season_construct=season_construct,
+                                      time_construct=time_construct,
+                                      weather_content=self.weather_content,
+                                      weather_hash=self.weather_hash,
+                                      weather_hours=self.weather_hours)
+
+
+def encode_column(values):
+    """
+    Converts a column of an input table to an array that can be stored in a binary input bundle file.
+
+    :param values: series with values for column
+    :return: array with values for column (text is stored as fixed width unicode) and list of rows with missing text
+    """
+
+    if values.dtype.kind in 'biuf':
+        return np.ascontiguousarray(values.values), []
+
+    missing = values.isnull().values
+    text = np.array([str(value) for value in values.where(~missing, '')], dtype=np.str_)
+    if len(text) == 0:
+        text = text.astype('<U1')
+
+    return text, np.flatnonzero(missing).tolist()
+
+
+def export_input_bundle(files, bundle_file):
+    """
+    Exports input data to a binary input bundle file that can be loaded with load_input_bundle.
+
+    :param files: dictionary of files with input data from the user, or input bundle
+    :param bundle_file: path to binary input bundle file
+    """
+
+    if isinstance(files, InputBundle):
+        input_bundle = files
+    else:
+        input_bundle = InputBundle(files)
+
+    tables = dict(input_bundle.data)
+    if input_bundle.weather_content is not None or input_bundle.weather_hours is not None:
+        tables['weather'] = input_bundle.get_weather_hours()
+
+    # arrange column data one after another in file
+    manifest = {'version': bundle_version,
+                'files': input_bundle.files,
+                'weather_hash': input_bundle.weather_hash,
+                'tables': dict()}
+    column_data = list()
+    offset = 0
+    for name in tables:
+        manifest['tables'][name] = {'rows': len(tables[name]), 'columns': list()}
+        for column in tables[name].columns:
+            [values, missing] = encode_column(tables[name][column])
+            manifest['tables'][name]['columns'].append({'name': column,
+                                                        'dtype': values.dtype.str,
+                                                        'offset': offset,
+                                                        'missing': missing})
+            column_data.append((offset, values))
+            offset += -(-values.nbytes // bundle_alignment) * bundle_alignment
+
+    # offsets in manifest are relative to start of data (after signature, manifest length, and manifest)
+    manifest_bytes = json.dumps(manifest).encode('utf-8')
+    header_size = len(bundle_signature) + 8 + len(manifest_bytes)
+    data_start = -(-header_size // bundle_alignment) * bundle_alignment
+
+    with open(bundle_file, 'wb') as bundle_stream:
+        bundle_stream.write(bundle_signature)
+        bundle_stream.write(struct.pack('<Q', len(manifest_bytes)))
+        bundle_stream.write(manifest_bytes)
+        for [column_offset, values] in column_data:
+            bundle_stream.seek(data_start + column_offset)
+            bundle_stream.write(values.tobytes())
+        bundle_stream.truncate(data_start + offset)
+
+
+def load_input_bundle(bundle_file):
+    """
+    Loads an input bundle from a binary input bundle file (see export_input_bundle). The file is memory mapped and
+    numeric columns of each table are read-only views of the file (not copied); text columns are copied into memory.
+
+    :param bundle_file: path to binary input bundle file
+    :return: input bundle with input data from binary input bundle file
+    """
+
+    with open(bundle_file, 'rb') as bundle_stream:
+        signature = bundle_stream.read(len(bundle_signature))
+        if signature != bundle_signature:
+            raise ValueError('{file} is not a LandBOSSE input bundle file'.format(file=bundle_file))
+        manifest_size = struct.unpack('<Q', bundle_stream.read(8))[0]
+        manifest = json.loads(bundle_stream.read(manifest_size).decode('utf-8'))
+
+    if manifest['version'] != bundle_version:
+        raise ValueError('Input bundle file version {version} is not supported'.format(version=manifest['version']))
+
+    header_size = len(bundle_signature) + 8 + manifest_size
+    data_start = -(-header_size // bundle_alignment) * bundle_alignment
+    bundle_data = np.memmap(bundle_file, dtype=np.uint8, mode='r')
+
+    tables = dict()
+    for name in manifest['tables']:
+        rows = manifest['tables'][name]['rows']
+        table = dict()
+        for column in manifest['tables'][name]['columns']:
+            values = np.frombuffer(bundle_data, dtype=np.dtype(column['dtype']), count=rows,
+                                   offset=data_start + column['offset'])
+            if values.dtype.kind == 'U':
+                values = values.astype(object)
+                values[column['missing']] = np.nan
+            table[column['name']] = values
+        # build table from column arrays without copying (numeric columns stay views of the memory mapped file)
+        tables[name] = pd.DataFrame(table, columns=[column['name'] for column in manifest['tables'][name]['columns']],
+                                    copy=False)
+
+    input_bundle = InputBundle()
+    input_bundle.files = manifest['files']
+    input_bundle.weather_hash = manifest['weather_hash']
+    input_bundle.weather_hours = tables.pop('weather', None)
+    input_bundle.data = tables
+
+    return input_bundle
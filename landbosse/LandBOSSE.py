@@ -23,6 +23,7 @@ import SubstationCost
 import TransDistCost
 import CollectionCost
 import DevelopmentCost
+import InputData
 from itertools import product
 import pandas as pd
 import numpy as np
@@ -81,79 +82,131 @@ phase_list = {'Collection system': '',
 type_of_cost = ['Labor', 'Equipment rental', 'Mobilization', 'Fuel', 'Materials', 'Development', 'Management', 'Other']
 
 
-def calculate_bos_cost(files, scenario_name, scenario_height, development):
+def calculate_bos_cost(files, scenario_name, scenario_height, development, multi_year=False, num_start_samples=0,
+                       random_seed=None, simulate_erection=False, max_num_cranes=1, allow_same_crane=False):
     """
-    Executes the calculate costs functions for each module/phase in the balance of system
-
-    :param files: [dict] dictionary of files with input data from the user
+    Executes the calculate costs functions for each module/phase in the balance of system. Raises
+    ErectionCost.InfeasibleErectionError (a ValueError, with the lifts that cannot be made and the reason for each in
+    infeasible_lifts) if no crane can make a lift (or, if erection is simulated, if wind speed always exceeds max
+    permissible wind speed for a lift).
+
+    :param files: [dict or InputData.InputBundle] dictionary of files with input data from the user, or input bundle
+                  with input data already read from the files (to reuse input data for multiple scenarios); if
+                  'foundation_sites' is provided with foundation depth and bearing pressure for each turbine, the
+                  foundation for each turbine is sized separately (sites are selected by project ID only and are used
+                  for every hub height of the project; the file must have rows for the project)
     :param scenario_name: [str] name of scenario to be run (must be in project file)
     :param scenario_height: [str] hub height of scenario to be run (must be in project file)
     :param development: [float] development costs input by the user
-    :return: total BOS costs for by phase and type; weather delay by phase
+    :param multi_year: [bool] if true, also summarizes wind multipliers over each year of weather data
+                       (mean, P50, and P90 wind multiplier columns are added to wind multiplier data frame)
+    :param num_start_samples: [int] number of construction start times to sample from the weather window for roads
+                              and foundations; if greater than zero, also returns data frame with the wind multipliers
+                              and wind delay cost for each sample
+    :param random_seed: [int] seed for sampling construction start times
+    :param simulate_erection: [bool] if true, erection costs are calculated from the erection schedule simulated
+                              against the weather window for the least cost cranes
+    :param max_num_cranes: [int] maximum number of cranes working in parallel on each erection operation (the least
+                           cost number of cranes that completes erection within the time allowed is chosen)
+    :param allow_same_crane: [bool] if true, the same crane can be used for base and topping, and it is only mobilized
+                             (and demobilized) once
+    :return: total BOS costs for by phase and type; weather delay by phase; road length (in meters); number of
+             turbines; project size (in megawatts); and data frame with wind multipliers and wind delay cost for each
+             sampled construction start (None if num_start_samples is zero)
     """
 
     print("Running LandBOSSE...")
-    # read csv files and load data into dictionary
-    data_csv = dict()
-    for file in files:
-        data_csv[file] = pd.DataFrame(pd.read_csv(files[file], engine='python'))
+    # read csv files (unless input bundle was provided) and load data into dictionary
+    # weather data is loaded when the weather window is created (see below)
+    # input data is shared with the input bundle without copying (modules do not change input data)
+    if isinstance(files, InputData.InputBundle):
+        input_bundle = files
+    else:
+        input_bundle = InputData.InputBundle(files)
+    data_csv = dict(input_bundle.data)
 
     # extract project parameters from input data
     project_data = data_csv['project'].where((data_csv['project']['Project ID'] == scenario_name) & (data_csv['project']['Hub height m'] == scenario_height))
     project_data = project_data.dropna(thresh=1)
-    num_turbines = float(project_data['Number of turbines'])
-    turbine_spacing = float(project_data['Turbine spacing (times rotor diameter)'])
-    rotor_diameter = float(project_data['Rotor diameter m'])
-    turbine_rating_kilowatt = float(project_data['Turbine rating MW']) * kilowatt_per_megawatt
-    rate_of_deliveries = float(project_data['Rate of deliveries (turbines per week)'])
-    hub_height = float(project_data['Hub height m'])
-    wind_shear_exponent = float(project_data['Wind shear exponent'])
+    num_turbines = float(project_data['Number of turbines'].iloc[0])
+    turbine_spacing = float(project_data['Turbine spacing (times rotor diameter)'].iloc[0])
+    rotor_diameter = float(project_data['Rotor diameter m'].iloc[0])
+    turbine_rating_kilowatt = float(project_data['Turbine rating MW'].iloc[0]) * kilowatt_per_megawatt
+    rate_of_deliveries = float(project_data['Rate of deliveries (turbines per week)'].iloc[0])
+    hub_height = float(project_data['Hub height m'].iloc[0])
+    wind_shear_exponent = float(project_data['Wind shear exponent'].iloc[0])
     tower_type = project_data['Tower type'].values[0]
-    foundation_depth = float(project_data['Foundation depth m'])
+    foundation_depth = float(project_data['Foundation depth m'].iloc[0])
     project_size = num_turbines * turbine_rating_kilowatt / kilowatt_per_megawatt  # project size in megawatts
 
+    # site-specific foundation depth and bearing pressure for each turbine (if provided)
+    # foundation sites are soil properties at each turbine location, so they are shared by all hub heights of a project
+    foundation_sites = None
+    if 'foundation_sites' in data_csv:
+        foundation_sites = data_csv['foundation_sites'][data_csv['foundation_sites']['Project ID'] == scenario_name]
+        if len(foundation_sites) == 0:
+            raise ValueError('Foundation site data has no turbines for project {scenario_name}'
+                             .format(scenario_name=scenario_name))
+
 
     # create data frame to store cost data for each module
     bos_cost = pd.DataFrame(list(product(phase_list, type_of_cost)), columns=['Phase of construction', 'Type of cost'])
     bos_cost['Cost USD'] = np.nan
 
-    # create weather window for project
-    weather_window = WD.create_weather_window(weather_data=data_csv['weather'],
-                                              season_id=season_dict,
-                                              season_construct=season_construct,
-                                              time_construct=time_construct)
+    # create weather window for project (reused from cache if weather file and construction time have not changed)
+    weather_window = input_bundle.load_weather_window(season_id=season_dict,
+                                                      season_construct=season_construct,
+                                                      time_construct=time_construct)
+
+    # create weather index shared by wind delay calculations for roads, foundations, and erection
+    weather_index = WD.WeatherIndex(weather_window)
+
+    # sample construction start times (as fraction of latest start in weather window) shared by roads and foundations
+    if num_start_samples > 0:
+        start_samples = np.random.RandomState(random_seed).uniform(size=int(num_start_samples))
+    else:
+        start_samples = None
 
     operational_hrs_per_day = operational_hour_dict[time_construct]
 
     # calculate road costs
     print("Calculating road costs...")
     road_length_m = ((np.sqrt(num_turbines) - 1) ** 2 * turbine_spacing * rotor_diameter)
-    [road_cost, road_wind_mult] = RoadsCost.calculate_costs(road_length=road_length_m,
-                                                            road_width=road_width_ft,
-                                                            road_thickness=road_thickness_in,
-                                                            input_data=data_csv,
-                                                            construction_time=construction_time_months,
-                                                            weather_window=weather_window,
-                                                            crane_width_m=crane_width_m,
-                                                            operational_hrs_per_day=operational_hrs_per_day,
-                                                            num_turbines=num_turbines,
-                                                            rotor_diam=rotor_diameter,
-                                                            access_roads=num_access_roads,
-                                                            per_diem_rate=per_diem,
-                                                            overtime_multiplier=overtime_multiplier,
-                                                            wind_shear_exponent=wind_shear_exponent
-                                                            )
+    road_outputs = RoadsCost.calculate_costs(road_length=road_length_m,
+                                             road_width=road_width_ft,
+                                             road_thickness=road_thickness_in,
+                                             input_data=data_csv,
+                                             construction_time=construction_time_months,
+                                             weather_window=weather_window,
+                                             crane_width_m=crane_width_m,
+                                             operational_hrs_per_day=operational_hrs_per_day,
+                                             num_turbines=num_turbines,
+                                             rotor_diam=rotor_diameter,
+                                             access_roads=num_access_roads,
+                                             per_diem_rate=per_diem,
+                                             overtime_multiplier=overtime_multiplier,
+                                             wind_shear_exponent=wind_shear_exponent,
+                                             weather_index=weather_index,
+                                             multi_year=multi_year,
+                                             start_samples=start_samples
+                                             )
+    [road_cost, road_wind_mult, road_other_outputs] = road_outputs
 
     # calculate foundation costs
     print("Calculating foundation costs...")
-    [foundation_cost, foundation_wind_mult] = FoundationCost.calculate_costs(input_data=data_csv,
-                                                                             num_turbines=num_turbines,
-                                                                             construction_time=construction_time_months,
-                                                                             weather_window=weather_window,
-                                                                             operational_hrs_per_day=operational_hrs_per_day,
-                                                                             overtime_multiplier=overtime_multiplier,
-                                                                             wind_shear_exponent=wind_shear_exponent,
-                                                                             depth=foundation_depth)
+    foundation_outputs = FoundationCost.calculate_costs(input_data=data_csv,
+                                                        num_turbines=num_turbines,
+                                                        construction_time=construction_time_months,
+                                                        weather_window=weather_window,
+                                                        operational_hrs_per_day=operational_hrs_per_day,
+                                                        overtime_multiplier=overtime_multiplier,
+                                                        wind_shear_exponent=wind_shear_exponent,
+                                                        depth=foundation_depth,
+                                                        weather_index=weather_index,
+                                                        multi_year=multi_year,
+                                                        start_samples=start_samples,
+                                                        site_data=foundation_sites)
+    [foundation_cost, foundation_wind_mult, foundation_other_outputs] = foundation_outputs
 
 
     # calculate substation costs
@@ -179,16 +232,22 @@ def calculate_bos_cost(files, scenario_name, scenario_height, development):
 
     # calculate erection costs
     print("Calculating erection costs...")
-    [erection_cost, erection_wind_mult] = ErectionCost.calculate_costs(project_specs=project_data,
-                                                                         project_data=data_csv,
-                                                                         hour_day=operational_hour_dict,
-                                                                         construction_time=construction_time_months,
-                                                                         time_construct=time_construct,
-                                                                         weather_window=weather_window,
-                                                                         rate_of_deliveries=rate_of_deliveries,
-                                                                         overtime_multiplier=overtime_multiplier,
-                                                                         wind_shear_exponent=wind_shear_exponent
-                                                                         )
+    erection_outputs = ErectionCost.calculate_costs(project_specs=project_data,
+                                                    project_data=data_csv,
+                                                    hour_day=operational_hour_dict,
+                                                    construction_time=construction_time_months,
+                                                    time_construct=time_construct,
+                                                    weather_window=weather_window,
+                                                    rate_of_deliveries=rate_of_deliveries,
+                                                    overtime_multiplier=overtime_multiplier,
+                                                    wind_shear_exponent=wind_shear_exponent,
+                                                    weather_index=weather_index,
+                                                    multi_year=multi_year,
+                                                    simulate_schedule=simulate_erection,
+                                                    max_num_cranes=max_num_cranes,
+                                                    allow_same_crane=allow_same_crane
+                                                    )
+    [erection_cost, erection_wind_mult, erection_other_outputs] = erection_outputs
 
     # calculate development costs -- based on user input right now
     print ("Calculating development costs... ")
@@ -234,6 +293,17 @@ def calculate_bos_cost(files, scenario_name, scenario_height, development):
                                     ['Foundation', foundation_wind_mult],
                                     ['Road', road_wind_mult]], columns=['Operation', 'Wind multiplier'])
 
+    # summarize weather delays over each year of weather data
+    if multi_year:
+        wind_multiplier_by_year = {'Erection': erection_other_outputs['Wind multiplier by year'],
+                                   'Foundation': foundation_other_outputs['Wind multiplier by year'],
+                                   'Road': road_other_outputs['Wind multiplier by year']}
+        for operation in wind_multiplier_by_year:
+            statistics = WD.calculate_wind_multiplier_statistics(wind_multiplier_by_year[operation]['Wind multiplier'])
+            for statistic in statistics:
+                wind_multiplier.loc[wind_multiplier['Operation'] == operation,
+                                    '{statistic} wind multiplier'.format(statistic=statistic)] = statistics[statistic]
+
     # print statements for debugging
     #print('Final cost matrix:')
     #print(bos_cost)
@@ -246,7 +316,27 @@ def calculate_bos_cost(files, scenario_name, scenario_height, development):
 
     #print(wind_multiplier)
 
-    return bos_cost, wind_multiplier, road_length_m, num_turbines, project_size
+    # distribution of wind delay cost over sampled construction start times
+    if start_samples is not None:
+        road_samples = road_other_outputs['Start samples']
+        foundation_samples = foundation_other_outputs['Start samples']
+        start_sample_cost = pd.DataFrame({'Start fraction': start_samples,
+                                          'Road start delay hr': road_samples['Start delay hr'],
+                                          'Road wind multiplier': road_samples['Wind multiplier'],
+                                          'Road wind delay cost USD': road_samples['Wind delay cost USD'],
+                                          'Foundation start delay hr': foundation_samples['Start delay hr'],
+                                          'Foundation wind multiplier': foundation_samples['Wind multiplier'],
+                                          'Foundation wind delay cost USD': foundation_samples['Wind delay cost USD']},
+                                         columns=['Start fraction',
+                                                  'Road start delay hr', 'Road wind multiplier', 'Road wind delay cost USD',
+                                                  'Foundation start delay hr', 'Foundation wind multiplier',
+                                                  'Foundation wind delay cost USD'])
+        start_sample_cost['Wind delay cost USD'] = (start_sample_cost['Road wind delay cost USD'] +
+                                                    start_sample_cost['Foundation wind delay cost USD'])
+    else:
+        start_sample_cost = None
+
+    return bos_cost, wind_multiplier, road_length_m, num_turbines, project_size, start_sample_cost
 
 
 def save_cost_data(phase, phase_cost, bos_cost):
@@ -233,7 +233,7 @@ def site_facility(project_size):
     building_area = building_area_df[(building_area_df['Size Max (MW)'] > project_size) &
                                      (building_area_df['Size Min (MW)'] <= project_size)]['Building area (sq. ft.)']
 
-    site_facility_cost = float(building_area) * 125 + 176125
+    site_facility_cost = float(building_area.iloc[0]) * 125 + 176125
 
     return site_facility_cost
 
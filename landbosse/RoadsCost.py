@@ -62,6 +62,9 @@ meters_per_inch = 0.025
 cubic_yards_per_cubic_meter = 1.30795
 square_feet_per_square_meter = 10.7639
 
+# mobilization cost as a fraction of total road cost
+mobilization_fraction = 0.05
+
 
 def calculate_road_properties(road_length, road_width, road_thickness, crane_width, num_turbines):
     """
@@ -130,10 +133,8 @@ def estimate_construction_time(throughput_operations, road_properties, duration_
                               'loose cubic yard': material_volume,
                               'Each (100000 square feet)': rough_grading_area}
 
-    material_needs = pd.DataFrame(columns=['Units', 'Quantity of material'])
-    for unit in list_units:
-        unit_quantity = pd.DataFrame([[unit, material_quantity_dict[unit]]], columns=['Units', 'Quantity of material'])
-        material_needs = material_needs.append(unit_quantity)
+    material_needs = pd.DataFrame([[unit, material_quantity_dict[unit]] for unit in list_units],
+                                  columns=['Units', 'Quantity of material'])
 
     # join material needs with operational data to compute costs
     operation_data = pd.merge(operation_data, material_needs, on=['Units']).dropna(thresh=3)
@@ -147,7 +148,7 @@ def estimate_construction_time(throughput_operations, road_properties, duration_
     # if more than one crew needed to complete within construction duration then assume that all construction happens
     # within that window and use that time frame for weather delays; if not, use the number of days calculated
     operation_data['time_construct_bool'] = operation_data['Number of days'] > road_construction_time * 30
-    boolean_dictionary = {True: road_construction_time * 30, False: np.NAN}
+    boolean_dictionary = {True: road_construction_time * 30, False: np.nan}
     operation_data['time_construct_bool'] = operation_data['time_construct_bool'].map(boolean_dictionary)
     operation_data['Time construct days'] = operation_data[['time_construct_bool', 'Number of days']].min(axis=1)
 
@@ -155,7 +156,7 @@ def estimate_construction_time(throughput_operations, road_properties, duration_
 
 
 def calculate_weather_delay(weather_window, duration_construction, start_delay, critical_wind_speed,
-                            operational_hrs_per_day, wind_shear_exponent):
+                            operational_hrs_per_day, wind_shear_exponent, weather_index=None):
     """
     Calculates wind delay for roads.
 
@@ -165,31 +166,92 @@ def calculate_weather_delay(weather_window, duration_construction, start_delay,
     :param critical_wind_speed: the critical wind speed for determining wind delay
     :param operational_hrs_per_day: number of hours of operation per day
     :param wind_shear_exponent: exponent for wind shear calculations
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
     :return: the total wind delay (in hours) as estimated based on the input parameters
     """
 
     # convert days of work to hours of work
     mission_time_hrs = duration_construction * operational_hrs_per_day
 
-    # compute weather delay
-    wind_delay = WD.calculate_wind_delay(weather_window=weather_window,
-                                         start_delay=start_delay,
-                                         mission_time=mission_time_hrs,
-                                         critical_wind_speed=critical_wind_speed,
-                                         height_interest=20,
-                                         wind_shear_exponent=wind_shear_exponent)
-    wind_delay = pd.DataFrame(wind_delay)
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
 
+    # compute weather delay
     # if greater than 4 hour delay, then shut down for full day (10 hours)
-    wind_delay[(wind_delay > 4)] = 10
-    wind_delay_time = float(wind_delay.sum())
+    wind_delay_time = float(WD.calculate_cached_delay(weather_index=weather_index,
+                                                      start_delay=start_delay,
+                                                      mission_time=mission_time_hrs,
+                                                      critical_wind_speed=critical_wind_speed,
+                                                      height_interest=20,
+                                                      wind_shear_exponent=wind_shear_exponent))
 
     return wind_delay_time
 
 
+def calculate_weather_delay_by_year(weather_window, duration_construction, critical_wind_speed,
+                                    operational_hrs_per_day, wind_shear_exponent):
+    """
+    Calculates wind delay for roads for each year of weather data in the weather window.
+
+    :param weather_window: data frame with weather data for time window associated with construction period
+    :param duration_construction: the length of construction time for the entire project (in months)
+    :param critical_wind_speed: the critical wind speed for determining wind delay
+    :param operational_hrs_per_day: number of hours of operation per day
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: array of years and the total wind delay (in hours) for each year as estimated based on the input parameters
+    """
+
+    # convert days of work to hours of work
+    mission_time_hrs = duration_construction * operational_hrs_per_day
+
+    # compute weather delay for each year
+    # if greater than 4 hour delay, then shut down for full day (10 hours)
+    [years, year_hours, wind_delay_time] = WD.calculate_capped_delay_by_year(weather_window=weather_window,
+                                                                             mission_time=mission_time_hrs,
+                                                                             critical_wind_speed=critical_wind_speed,
+                                                                             height_interest=20,
+                                                                             wind_shear_exponent=wind_shear_exponent)
+
+    return years, wind_delay_time[:, 0]
+
+
+def calculate_weather_delay_by_start(weather_window, duration_construction, start_fraction, critical_wind_speed,
+                                    operational_hrs_per_day, wind_shear_exponent, weather_index=None):
+    """
+    Calculates wind delay for roads for many different construction start times in the weather window.
+
+    :param weather_window: data frame with weather data for time window associated with construction period
+    :param duration_construction: the length of construction time for the entire project (in months)
+    :param start_fraction: array of start times as a fraction (0 to 1) of the latest start in the weather window
+    :param critical_wind_speed: the critical wind speed for determining wind delay
+    :param operational_hrs_per_day: number of hours of operation per day
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
+    :return: array of start delays (in hours) and the total wind delay (in hours) for each start
+    """
+
+    # convert days of work to hours of work
+    mission_time_hrs = duration_construction * operational_hrs_per_day
+
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
+
+    # compute weather delay for each start
+    # if greater than 4 hour delay, then shut down for full day (10 hours)
+    [start_delay, wind_delay_time] = WD.calculate_capped_delay_by_start(weather_index=weather_index,
+                                                                        start_fraction=start_fraction,
+                                                                        mission_time=mission_time_hrs,
+                                                                        critical_wind_speed=critical_wind_speed,
+                                                                        height_interest=20,
+                                                                        wind_shear_exponent=wind_shear_exponent)
+
+    return start_delay, wind_delay_time
+
+
 def calculate_costs(road_length, road_width, road_thickness, input_data, construction_time, weather_window,
                     crane_width_m, operational_hrs_per_day, num_turbines, rotor_diam, access_roads, per_diem_rate,
-                    overtime_multiplier, wind_shear_exponent):
+                    overtime_multiplier, wind_shear_exponent, weather_index=None, multi_year=False, start_delay=0,
+                    start_samples=None):
     """
 
     :param road_length: float of road length in meters
@@ -206,9 +268,21 @@ def calculate_costs(road_length, road_width, road_thickness, input_data, constru
     :param per_diem_rate: per diem (USD per day)
     :param overtime_multiplier: multiplier for labor overtime rates due to working 60 hr/wk rather than 40 hr/wk
     :param wind_shear_exponent: exponent for wind shear calculations
-    :return: data frame with total road costs by phase of construction
+    :param weather_index: weather index for the weather window (created from weather window if not provided)
+    :param multi_year: if true, also returns data frame with wind multiplier for each year of weather data
+    :param start_delay: the delay (in hours) from the start of the weather window to the start of construction
+    :param start_samples: array of sampled construction start times as a fraction (0 to 1) of the latest start in the
+                          weather window; if provided, also returns data frame with wind multiplier and wind delay
+                          cost for each sample
+    :return: data frame with total road costs by phase of construction, wind multiplier, and dictionary of other outputs
+             with data frames of wind multiplier by year (if multi year) and by start sample (if start samples are
+             provided); the dictionary is empty if no other outputs are requested
     """
 
+    if weather_index is None:
+        weather_index = WD.WeatherIndex(weather_window)
+    other_outputs = dict()
+
     road_properties = calculate_road_properties(road_length=road_length,
                                                 road_thickness=road_thickness,
                                                 road_width=road_width,
@@ -228,23 +302,55 @@ def calculate_costs(road_length, road_width, road_thickness, input_data, constru
 
     wind_delay = calculate_weather_delay(weather_window=weather_window,
                                          duration_construction=operation_data['Time construct days'].max(skipna=True),
-                                         start_delay=0,
+                                         start_delay=start_delay,
                                          critical_wind_speed=13,
                                          operational_hrs_per_day=operational_hrs_per_day,
-                                         wind_shear_exponent=wind_shear_exponent)
+                                         wind_shear_exponent=wind_shear_exponent,
+                                         weather_index=weather_index)
 
     wind_delay_percent = (wind_delay / operational_hrs_per_day) / operation_data['Time construct days'].max(skipna=True)
     wind_multiplier = 1 / (1 - wind_delay_percent)
-    
+
+    if multi_year:
+        [years, wind_delay_by_year] = calculate_weather_delay_by_year(weather_window=weather_window,
+                                                                      duration_construction=operation_data['Time construct days'].max(skipna=True),
+                                                                      critical_wind_speed=13,
+                                                                      operational_hrs_per_day=operational_hrs_per_day,
+                                                                      wind_shear_exponent=wind_shear_exponent)
+        wind_delay_percent_by_year = (wind_delay_by_year / operational_hrs_per_day) / operation_data['Time construct days'].max(skipna=True)
+        other_outputs['Wind multiplier by year'] = pd.DataFrame({'Year': years,
+                                                                 'Wind multiplier': 1 / (1 - wind_delay_percent_by_year)},
+                                                                columns=['Year', 'Wind multiplier'])
+
+    if start_samples is not None:
+        [sample_start_delay, sample_wind_delay] = calculate_weather_delay_by_start(weather_window=weather_window,
+                                                                                   duration_construction=operation_data['Time construct days'].max(skipna=True),
+                                                                                   start_fraction=start_samples,
+                                                                                   critical_wind_speed=13,
+                                                                                   operational_hrs_per_day=operational_hrs_per_day,
+                                                                                   wind_shear_exponent=wind_shear_exponent,
+                                                                                   weather_index=weather_index)
+        sample_wind_delay_percent = (sample_wind_delay / operational_hrs_per_day) / operation_data['Time construct days'].max(skipna=True)
+        sample_wind_multiplier = 1 / (1 - sample_wind_delay_percent)
+
     labor_equip_data = pd.merge(operation_data[['Operation ID', 'Units', 'Quantity of material']], input_data['rsmeans'], on=['Units', 'Operation ID'])
-    labor_equip_data['Cost USD'] = (labor_equip_data['Quantity of material'] * labor_equip_data['Rate USD per unit'] * overtime_multiplier
-                                    + round(labor_equip_data['Quantity of material'] *
-                                            labor_equip_data['Per Diem Hours (per unit)'] / operational_hrs_per_day / 6
-                                            ) * 7 * per_diem_rate * labor_equip_data['Number of workers']) * wind_multiplier
+    labor_equip_data['Cost without wind delay USD'] = (labor_equip_data['Quantity of material'] * labor_equip_data['Rate USD per unit'] * overtime_multiplier
+                                                       + round(labor_equip_data['Quantity of material'] *
+                                                               labor_equip_data['Per Diem Hours (per unit)'] / operational_hrs_per_day / 6
+                                                               ) * 7 * per_diem_rate * labor_equip_data['Number of workers'])
+    labor_equip_data['Cost USD'] = labor_equip_data['Cost without wind delay USD'] * wind_multiplier
+
+    # wind delay cost (including mobilization) for each sampled construction start
+    if start_samples is not None:
+        other_outputs['Start samples'] = pd.DataFrame({'Start delay hr': sample_start_delay,
+                                                       'Wind multiplier': sample_wind_multiplier,
+                                                       'Wind delay cost USD': labor_equip_data['Cost without wind delay USD'].sum() *
+                                                                              (sample_wind_multiplier - 1) * (1 + mobilization_fraction)},
+                                                      columns=['Start delay hr', 'Wind multiplier', 'Wind delay cost USD'])
 
     road_cost = labor_equip_data[['Operation ID', 'Type of cost', 'Cost USD']]
 
-    material_costs = pd.DataFrame([[material_data['Material type ID'][0], 'Materials', float(material_data['Cost USD'])]],
+    material_costs = pd.DataFrame([[material_data['Material type ID'][0], 'Materials', float(material_data['Cost USD'].iloc[0])]],
                                   columns=['Operation ID', 'Type of cost', 'Cost USD'])
 
     # add costs for other operations not included in process data (e.g., fencing, access roads)
@@ -255,22 +361,21 @@ def calculate_costs(road_length, road_width, road_thickness, input_data, constru
     additional_costs = pd.DataFrame([['Other operations for roads', 'Other', float(cost_adder)]],
                                     columns=['Operation ID', 'Type of cost', 'Cost USD'])
 
-    road_cost = road_cost.append(material_costs)
-    road_cost = road_cost.append(additional_costs)
+    road_cost = pd.concat([road_cost, material_costs, additional_costs], sort=True)
 
     # set mobilization cost equal to 5% of total road cost
-    mobilization_costs = pd.DataFrame([['Mobilization', 'Mobilization', float(road_cost["Cost USD"].sum()) * 0.05]],
+    mobilization_costs = pd.DataFrame([['Mobilization', 'Mobilization', float(road_cost["Cost USD"].sum()) * mobilization_fraction]],
                                       columns=['Operation ID', 'Type of cost', 'Cost USD'])
 
-    road_cost = road_cost.append(mobilization_costs)
+    road_cost = pd.concat([road_cost, mobilization_costs], sort=True)
 
     # print(road_cost.groupby(by=['Operation ID']).sum())
 
-    total_road_cost = road_cost.groupby(by=['Type of cost']).sum().reset_index()
+    total_road_cost = road_cost.groupby(by=['Type of cost'])[['Cost USD']].sum().reset_index()
     total_road_cost.loc[total_road_cost['Type of cost'] == 'Labor', 'Cost USD'] = float(
-        total_road_cost.loc[total_road_cost['Type of cost'] == 'Labor', 'Cost USD']) + 48.8 * road_length
+        total_road_cost.loc[total_road_cost['Type of cost'] == 'Labor', 'Cost USD'].iloc[0]) + 48.8 * road_length
     total_road_cost['Phase of construction'] = 'Roads'
 
     # print(total_road_cost)
 
-    return total_road_cost, wind_multiplier
\ No newline at end of file
+    return total_road_cost, wind_multiplier, other_outputs
\ No newline at end of file
@@ -14,50 +14,93 @@ Get mission time for operation
 Get critical wind speed
 
 Create weather window based on weather data, season dictionary, season of construction, and operation construction time
+(weather windows are cached by weather file content, season of construction, and operation construction time)
 
 Calculate wind delay based on weather window, operation start delay, mission time, and critical wind speed
 
+Create weather index based on weather window to calculate total wind delays without rescanning the weather window
+
+Calculate wind delay for each year of weather data and summarize wind multipliers over all years
+
 """
 import numpy as np
 import pandas as pd
+import hashlib
+import io
+import os
+from collections import OrderedDict
+
+# cache of weather windows by weather file content, months of construction, and time of construction
+# max_size limits the number of weather windows kept in memory (and on disk if cache_dir is set); the eviction policy
+# is either 'lru' (evict least recently used) or 'fifo' (evict oldest)
+weather_cache = OrderedDict()
+weather_cache_settings = {'max_size': 8, 'eviction_policy': 'lru', 'cache_dir': None}
+weather_cache_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+# cache of total wind delay hours by weather window, wind shear exponent, start delay, mission time, critical wind speed,
+# and height of interest (values rounded to cache_decimals places); max_size limits the number of cached wind delays
+# (least recently used wind delays are evicted first)
+cache_decimals = 6
+delay_cache = OrderedDict()
+delay_cache_settings = {'max_size': 100000}
+delay_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+# number of years of weather data in each weather index when calculating wind delays by year (limits memory use)
+years_per_chunk = 5
+
+
+def extract_weather_hours(weather_data):
+    """
+    Extracts time data and wind speed for each hour of weather data (dates are only parsed once).
 
+    :param weather_data: data frame with weather data of interest (multiple years of data are kept in sequence;
+                         see calculate_capped_delay_by_year for wind delays by year)
+    :return: data frame with year, month, day, hour (local time), and wind speed for each hour of weather data
+    """
 
-def create_weather_window(weather_data, season_id, season_construct, time_construct):
+    # skip extra header rows in weather data (date is first column and wind speed is fifth column)
+    weather_data = weather_data[4:]
+
+    # extract time data from string in weather file
+    print('Extracting time data from weather file...')
+    date = pd.to_datetime(weather_data.iloc[:, 0]).dt
+    weather_hour = date.hour.values + 6  # shift weather data to local time
+    # todo: fix weather data to use local time as input
+
+    # change speed to numeric value (kept as float64 so that speeds in the weather file compare exactly with critical
+    # wind speeds; float32 speeds equal to a critical wind speed would be counted as wind delays)
+    speed = pd.to_numeric(weather_data.iloc[:, 4]).values
+
+    weather_hours = pd.DataFrame({'Year': date.year.values.astype(np.int16),
+                                  'Month': date.month.values.astype(np.int8),
+                                  'Day': date.day.values.astype(np.int8),
+                                  'Hour': weather_hour.astype(np.int8),
+                                  'Speed m per s': speed},
+                                 columns=['Year', 'Month', 'Day', 'Hour', 'Speed m per s'])
+
+    return weather_hours
+
+
+def select_weather_window(weather_hours, season_id, season_construct, time_construct):
     """
-    Creates weather window based on season of construction and time of construction (i.e., normal vs. long hours).
+    Selects hours of weather data in weather window based on season of construction and time of construction.
 
-    :param weather_data: data frame with weather data of interest (only accomodates single year of data right now)
+    :param weather_hours: data frame with year, month, day, hour, and wind speed for each hour of weather data
+                          (see extract_weather_hours)
     :param season_id: dictionary that maps seasons to months
     :param season_construct: list of seasons for construction (e.g., ['spring', 'summer'])
     :param time_construct: string that describes operational time (e.g., normal vs. long hours)
     :return: weather_window: filtered weather window containing data specific to season and time of construction
+             (year, month, day, hour, and wind speed for each hour)
     """
 
-    # set column names for weather data
-    column_names = weather_data[4:].columns
-    weather_data = weather_data[4:].rename(columns={column_names[0]: 'Date',
-                                                    column_names[1]: 'Temp C',
-                                                    column_names[2]: 'Pressure atm',
-                                                    column_names[3]: 'Direction deg',
-                                                    column_names[4]: 'Speed m per s'})
-    weather_data = weather_data.reset_index(drop=True)
-
-    # extract time data from string in weather file
-    print('Extracting time data from weather file...')
-    weather_data['Year'] = pd.to_datetime(weather_data['Date']).dt.year
-    weather_data['Month'] = pd.to_datetime(weather_data['Date']).dt.month
-    weather_data['Day'] = pd.to_datetime(weather_data['Date']).dt.day
-    weather_data['Hour'] = pd.to_datetime(weather_data['Date']).dt.hour + 6  # shift weather data to local time
-    # todo: fix weather data to use local time as input
-
-    # change speed to numeric value
-    weather_data['Speed m per s'] = pd.to_numeric(weather_data['Speed m per s'])
+    weather_month = weather_hours['Month'].values
+    weather_hour = weather_hours['Hour'].values
 
     # create time window for normal (8am to 6pm) versus long (24 hour) time window for operation
     print('Creating weather window...')
-    weather_data['Time window'] = weather_data['Hour'].between(8, 18, inclusive=True)
-    boolean_dictionary = {True: 'normal', False: 'long'}
-    weather_data['Time window'] = weather_data['Time window'].map(boolean_dictionary)
+    normal_bool = (weather_hour >= 8) & (weather_hour <= 18)
+    time_window_bool = {'normal': normal_bool, 'long': ~normal_bool}.get(time_construct, np.zeros(len(weather_hour), dtype=bool))
 
     # get list of months of interest based on seasons of construction (needed for > 1 seasons)
     month_list = list()
@@ -66,13 +109,235 @@ def create_weather_window(weather_data, season_id, season_construct, time_constr
             month_list.append(month)
 
     # select data in weather window of interest
-    weather_window = weather_data.where((weather_data['Time window'] == time_construct) &
-                                        (weather_data['Month'].isin(month_list))).dropna(thresh=1)
-    weather_window = weather_window.reset_index(drop=True)
+    window_bool = time_window_bool & np.isin(weather_month, month_list)
+    weather_window = pd.DataFrame({column: weather_hours[column].values[window_bool]
+                                   for column in ['Year', 'Month', 'Day', 'Hour', 'Speed m per s']},
+                                  columns=['Year', 'Month', 'Day', 'Hour', 'Speed m per s'])
+
+    return weather_window
+
+
+def create_weather_window(weather_data, season_id, season_construct, time_construct):
+    """
+    Creates weather window based on season of construction and time of construction (i.e., normal vs. long hours).
+
+    :param weather_data: data frame with weather data of interest (multiple years of data are kept in sequence;
+                         see calculate_capped_delay_by_year for wind delays by year)
+    :param season_id: dictionary that maps seasons to months
+    :param season_construct: list of seasons for construction (e.g., ['spring', 'summer'])
+    :param time_construct: string that describes operational time (e.g., normal vs. long hours)
+    :return: weather_window: filtered weather window containing data specific to season and time of construction
+             (year, month, day, hour, and wind speed for each hour)
+    """
+
+    weather_hours = extract_weather_hours(weather_data=weather_data)
+
+    return select_weather_window(weather_hours=weather_hours,
+                                 season_id=season_id,
+                                 season_construct=season_construct,
+                                 time_construct=time_construct)
+
+
+def configure_weather_cache(max_size=None, eviction_policy=None, cache_dir=None):
+    """
+    Sets size limit, eviction policy, and on-disk store for the weather window cache used by load_weather_window.
+
+    :param max_size: maximum number of weather windows to keep in memory (and on disk)
+    :param eviction_policy: 'lru' to evict least recently used weather window or 'fifo' to evict oldest weather window
+    :param cache_dir: directory to store weather windows on disk (set to '' to disable on-disk store)
+    """
+
+    if max_size is not None:
+        if max_size < 1:
+            raise ValueError('Weather cache size must be at least 1')
+        weather_cache_settings['max_size'] = int(max_size)
+
+    if eviction_policy is not None:
+        if eviction_policy not in ['lru', 'fifo']:
+            raise ValueError('Unknown eviction policy for weather cache: {}'.format(eviction_policy))
+        weather_cache_settings['eviction_policy'] = eviction_policy
+
+    if cache_dir is not None:
+        weather_cache_settings['cache_dir'] = cache_dir or None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    evict_weather_cache()
+
+
+def evict_weather_cache():
+    """
+    Evicts weather windows from memory and disk until the weather window cache is within its size limit.
+    """
+
+    max_size = weather_cache_settings['max_size']
+
+    # weather windows are ordered from first to evict to last to evict
+    while len(weather_cache) > max_size:
+        weather_cache.popitem(last=False)
+        weather_cache_stats['evictions'] += 1
+
+    cache_dir = weather_cache_settings['cache_dir']
+    if cache_dir is not None and os.path.isdir(cache_dir):
+        # file modification time is updated on use for lru (see load_weather_window)
+        cache_files = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.weather.pkl')]
+        cache_files.sort(key=os.path.getmtime)
+        for cache_file in cache_files[:max(len(cache_files) - max_size, 0)]:
+            os.remove(cache_file)
+
+
+def read_weather_hours(weather_content):
+    """
+    Reads weather data from the contents of a weather file and extracts time data and wind speed for each hour.
+
+    :param weather_content: contents of weather file
+    :return: data frame with year, month, day, hour, and wind speed for each hour (see extract_weather_hours)
+    """
+
+    weather_data = pd.DataFrame(pd.read_csv(io.BytesIO(weather_content)))
+
+    return extract_weather_hours(weather_data=weather_data)
+
+
+def load_weather_window(weather_file, season_id, season_construct, time_construct, weather_content=None,
+                        weather_hash=None, weather_hours=None):
+    """
+    Loads the weather window for a weather file from the weather window cache, or reads the weather file and creates
+    the weather window (see create_weather_window) if it is not in the cache. Weather windows in the cache are shared
+    by all scenarios and should not be modified.
+
+    Weather data that has already been read (e.g., from a binary input bundle) can be provided as the hash of the
+    weather file content and the weather data for each hour, in which case the weather file is not read.
+
+    :param weather_file: path to csv file with weather data
+    :param season_id: dictionary that maps seasons to months
+    :param season_construct: list of seasons for construction (e.g., ['spring', 'summer'])
+    :param time_construct: string that describes operational time (e.g., normal vs. long hours)
+    :param weather_content: contents of weather file (read from weather file if not provided)
+    :param weather_hash: SHA-1 hash of weather file content (calculated from weather file content if not provided)
+    :param weather_hours: data frame with weather data for each hour (see extract_weather_hours); if not provided, the
+                          weather file content is parsed when the weather window is not in the cache
+    :return: weather_window: filtered weather window containing data specific to season and time of construction
+    """
+
+    if weather_hash is None or (weather_hours is None and weather_content is None):
+        if weather_content is None:
+            with open(weather_file, 'rb') as weather_stream:
+                weather_content = weather_stream.read()
+        weather_hash = hashlib.sha1(weather_content).hexdigest()
+
+    # cache key is based on weather file content (rather than file name) and the months and hours of construction
+    month_list = [month for season in season_construct for month in season_id[season]]
+    key = hashlib.sha1((weather_hash + repr((month_list, time_construct))).encode()).hexdigest()
+
+    cache_dir = weather_cache_settings['cache_dir']
+    cache_file = None if cache_dir is None else os.path.join(cache_dir, key + '.weather.pkl')
+
+    if key in weather_cache:
+        weather_window = weather_cache[key]
+        weather_cache_stats['hits'] += 1
+        if weather_cache_settings['eviction_policy'] == 'lru':
+            weather_cache.move_to_end(key)
+    elif cache_file is not None and os.path.exists(cache_file):
+        weather_window = pd.read_pickle(cache_file)
+        weather_cache_stats['disk_hits'] += 1
+    else:
+        if weather_hours is None:
+            weather_hours = read_weather_hours(weather_content=weather_content)
+        weather_window = select_weather_window(weather_hours=weather_hours,
+                                               season_id=season_id,
+                                               season_construct=season_construct,
+                                               time_construct=time_construct)
+        weather_cache_stats['misses'] += 1
+        if cache_file is not None:
+            weather_window.to_pickle(cache_file)
+
+    if cache_file is not None and os.path.exists(cache_file) and weather_cache_settings['eviction_policy'] == 'lru':
+        os.utime(cache_file)
+
+    weather_cache[key] = weather_window
+    evict_weather_cache()
 
     return weather_window
 
 
+def get_weather_cache_stats():
+    """
+    Gets statistics for the weather window cache used by load_weather_window.
+
+    :return: dictionary with number of cache hits (in memory and on disk), cache misses, evictions, and cached windows
+    """
+
+    stats = dict(weather_cache_stats)
+    stats['size'] = len(weather_cache)
+    return stats
+
+
+def clear_weather_cache(disk=False):
+    """
+    Clears the weather window cache used by load_weather_window and resets its statistics.
+
+    :param disk: if true, also removes weather windows stored on disk
+    """
+
+    weather_cache.clear()
+    for key in weather_cache_stats:
+        weather_cache_stats[key] = 0
+
+    cache_dir = weather_cache_settings['cache_dir']
+    if disk and cache_dir is not None and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.weather.pkl'):
+                os.remove(os.path.join(cache_dir, name))
+
+
+def calculate_delay_durations(wind_delay, hour):
+    """
+    Run-length encodes hourly wind exceedances into the duration of each weather delay.
+
+    Delay hours are treated as consecutive when the hour of day increases by one between successive delay hours.
+    Consecutive delays are reported with their length and the remaining delay hours as 1 hr delays, matching the
+    original data frame implementation of calculate_wind_delay.
+
+    :param wind_delay: boolean array that is true for each hour of the mission where wind speed exceeds critical wind speed
+    :param hour: array with the hour of day for each hour of the mission
+    :return: list containing the number of hours for each wind delay encountered during mission
+             count of list = number of weather delays; value in list = duration of weather delay)
+    """
+
+    delay_hour = np.asarray(hour)[np.asarray(wind_delay, dtype=bool)]
+    num_delays = len(delay_hour)
+
+    if num_delays == 0:
+        return list([0])
+
+    # boolean for whether each delay hour follows the prior delay hour (hour delay diff == 1)
+    # plus an extra value at the end to make sure the last data point is counted
+    hour_delay_bool = np.zeros(num_delays + 1, dtype=bool)
+    hour_delay_bool[1:num_delays] = np.diff(delay_hour) == 1
+
+    # first value gets removed due to differencing, so first delay is consecutive if the second delay is
+    if num_delays > 1:
+        hour_delay_bool[0] = hour_delay_bool[1]
+    hour_delay_bool[num_delays] = ~hour_delay_bool[num_delays - 1]
+
+    # start and end indices for each run of consecutive delays (> 1 hr)
+    index_change = np.flatnonzero(np.diff(np.r_[0, hour_delay_bool[:num_delays], 0]))
+    greater_than_1hr = index_change[1::2] - index_change[0::2]
+
+    # last run of consecutive delays is not counted if the first delay is a single hour delay
+    if hour_delay_bool[num_delays - 1] and not hour_delay_bool[0]:
+        greater_than_1hr = greater_than_1hr[:-1]
+
+    # calculate the number of single hour delays
+    count_1hr = np.count_nonzero(~hour_delay_bool)
+
+    # create list of weather delays including > 1 hr and 1 hr delays
+    delay_duration = list(greater_than_1hr) + list(np.ones(count_1hr))
+
+    return delay_duration
+
+
 def calculate_wind_delay(weather_window, start_delay, mission_time, critical_wind_speed, height_interest, wind_shear_exponent):
     """
     Calculates wind delay based on weather window, mission time, and critical wind speed.
@@ -81,72 +346,439 @@ def calculate_wind_delay(weather_window, start_delay, mission_time, critical_win
     :param start_delay: delay of mission from start of weather window
     :param mission_time: length of mission (i.e., time that it takes to complete operation) in hours
     :param critical_wind_speed: wind speed at which operation must be shutdown
+    :param height_interest: height of interest for weather delay calculations
+    :param wind_shear_exponent: exponent for wind shear calculations
     :return: list containing the number of hours for each wind delay encountered during mission
              count of list = number of weather delays; value in list = duration of weather delay)
     """
 
     # select only weather data after start delay (e.g., delay due to need for waiting on prior operation before start)
-    weather_data = weather_window[weather_window.index > start_delay]
-    mission_end = weather_window.index[weather_window.index == start_delay][0] + mission_time
+    window_index = weather_window.index.values
+    mission_end = window_index[window_index == start_delay][0] + mission_time
 
     # check if mission time exceeds size of weather window
-    if mission_end > len(weather_window.index):
+    if mission_end > len(window_index):
         print('Warning: Mission time larger than weather window')
 
-    # set mission weather to time window of interest and reset indices for data frame
-    mission_weather = weather_data[weather_data.index <= mission_end].reset_index(drop=True)
+    # set mission weather to time window of interest
+    mission_bool = (window_index > start_delay) & (window_index <= mission_end)
+    mission_speed = weather_window['Speed m per s'].values[mission_bool]
+    mission_hour = weather_window['Hour'].values[mission_bool]
 
-    # create new column for boolean for weather delay (true or false) based on critical wind speed
+    # create boolean for weather delay (true or false) based on critical wind speed
     # todo: might want to modify to consider other types of weather delays (e.g., rain, lightening)
-    mission_weather['Wind delay'] = mission_weather['Speed m per s'] * (height_interest / 100) ** (wind_shear_exponent) > critical_wind_speed
-
-    if mission_weather['Wind delay'].any() == True:
-        # create new weather delay data frame and determine number of hours of delay along with boolean for > 1 hr
-        weather_delay = pd.DataFrame()
-        weather_delay['Hour delay diff'] = (mission_weather['Hour'][mission_weather['Wind delay'] == True].diff())
-        weather_delay['Hour delay bool'] = (weather_delay['Hour delay diff'] == 1)
-        weather_delay = weather_delay.reset_index(drop=True)
-
-        # fix value that got removed due to differencing
-        # because selecting values that == 1 then if hour delay diff [1] == 1, hour delay bool should be true
-        # otherwise remains false
-        if len(weather_delay['Hour delay diff']) > 1:
-            if weather_delay['Hour delay diff'][1] == 1:
-                weather_delay.loc[weather_delay.index == 0, 'Hour delay bool'] = True
-
-        # add extra row at end of data frame to make sure the last data point is counted
-        extra_row = pd.DataFrame([['NaN', ~(weather_delay.iloc[-1]['Hour delay bool'])]], columns=['Hour delay diff', 'Hour delay bool'])
-        weather_delay = weather_delay.append(extra_row)
-
-        # check whether the weather delay is consecutive or not based on hour delay bool
-        # (false then only 1 hr delay; otherwise consecutive)
-        index_change = np.flatnonzero(np.diff(np.r_[0, weather_delay['Hour delay bool'], 0]))
-
-        # find which indices to include based on delay boolean for cases where the indices change
-        # (only include cases where delay is greater than 1 hr)
-        include_change = weather_delay['Hour delay bool'].where(weather_delay.index.isin(index_change))
-        include_change = include_change.dropna()  # drops NaNs
-        include_change = (include_change == 1).reset_index(drop=True)  # resets indices
-        if len(include_change) != 0:
-            include_change.iloc[-1] = ~(include_change.iloc[-1])  # removes last value that was added to pad data from diff
-
-            # calculate the number of hours for each consecutive delay > 1 hr
-            if weather_delay.iloc[-2]['Hour delay bool'] == True:
-                greater_than_1hr = np.diff(index_change)[include_change[0:len(np.diff(index_change))]]
+    wind_delay = mission_speed * (height_interest / 100) ** wind_shear_exponent > critical_wind_speed
+
+    delay_duration = calculate_delay_durations(wind_delay=wind_delay, hour=mission_hour)
+
+    return delay_duration
+
+
+def cap_delay_hours(delay_duration):
+    """
+    Applies the shutdown rule to wind delays: if greater than 4 hour delay, then shut down for full day (10 hours).
+
+    :param delay_duration: duration of each wind delay (in hours)
+    :return: duration of each wind delay after applying the shutdown rule
+    """
+
+    delay_duration = np.asarray(delay_duration)
+    return np.where(delay_duration > 4, 10, delay_duration)
 
+
+class WeatherIndex(object):
+    """
+    Index of a weather window for answering wind delay queries without rescanning the weather window.
+
+    Whether an hour is delayed only depends on how many distinct wind speeds in the weather window exceed the
+    shear-adjusted critical wind speed, so each query is mapped to a threshold level by binary search over the sorted
+    distinct wind speeds. For each level the index stores prefix sums of wind delays and the extent of each run of
+    consecutive delays, which are computed once per level and shared by all later queries at that level.
+
+    Queries accept arrays of critical wind speeds and heights (e.g., every crane and component combination), in which
+    case all new threshold levels are computed in a single pass over the weather window.
+
+    Totals match calculate_wind_delay followed by cap_delay_hours and a sum.
+    """
+
+    def __init__(self, weather_window):
+        """
+        :param weather_window: filtered weather window from create_weather_window
+        """
+
+        self.speed = weather_window['Speed m per s'].values.astype(float)
+        self.hour = weather_window['Hour'].values.astype(float)
+        self.num_hours = len(self.speed)
+
+        # fingerprint of weather window so that cached wind delays can be shared by indices for the same window
+        self.window_id = hashlib.sha1(self.speed.tobytes() + self.hour.tobytes()).hexdigest()
+        self.sorted_speed = np.unique(self.speed[~np.isnan(self.speed)])
+
+        # row in level arrays for each threshold level (-1 if threshold level has not been computed yet)
+        self.level_row = np.full(len(self.sorted_speed) + 1, -1)
+        self.level_data = dict()
+
+    def find_level(self, critical_wind_speed, height_interest, wind_shear_exponent):
+        """
+        Finds the threshold level (index of the lowest delayed speed in sorted_speed) for a critical wind speed.
+
+        :param critical_wind_speed: wind speed at which operation must be shutdown
+        :param height_interest: height of interest for weather delay calculations
+        :param wind_shear_exponent: exponent for wind shear calculations
+        :return: threshold level for each critical wind speed
+        """
+
+        sorted_speed = self.sorted_speed
+        num_speeds = len(sorted_speed)
+        critical_wind_speed = np.asarray(critical_wind_speed, dtype=float)
+        shear_multiplier = np.asarray(height_interest / 100, dtype=float) ** wind_shear_exponent
+
+        if num_speeds == 0:
+            return np.zeros(np.broadcast(critical_wind_speed, shear_multiplier).shape, dtype=int)
+
+        level = np.searchsorted(sorted_speed, critical_wind_speed / shear_multiplier, side='right')
+
+        # adjust level so that delays match the comparison used in calculate_wind_delay exactly
+        while True:
+            step_down = (level > 0) & (sorted_speed[np.maximum(level - 1, 0)] * shear_multiplier > critical_wind_speed)
+            step_up = (level < num_speeds) & ~(sorted_speed[np.minimum(level, num_speeds - 1)] * shear_multiplier >
+                                               critical_wind_speed)
+            if not (step_down.any() or step_up.any()):
+                break
+            level = level - step_down + step_up
+
+        return level
+
+    def build_levels(self, levels):
+        """
+        Computes prefix sums and delay runs for threshold levels that have not been computed yet.
+
+        :param levels: array of threshold levels
+        """
+
+        new_levels = np.unique(levels)
+        new_levels = new_levels[self.level_row[new_levels] < 0]
+        if len(new_levels) == 0:
+            return
+
+        num_hours = self.num_hours
+        hour_index = np.arange(num_hours)
+        threshold = np.append(self.sorted_speed, np.inf)[new_levels]
+
+        # boolean for wind delay for each level (rows) and hour of weather window (columns)
+        wind_delay = self.speed[np.newaxis, :] >= threshold[:, np.newaxis]
+
+        delay_count = np.zeros((len(new_levels), num_hours + 1), dtype=int)
+        delay_count[:, 1:] = np.cumsum(wind_delay, axis=1)
+
+        # last delay at or before each hour and next delay at or after each hour
+        prior_delay = np.maximum.accumulate(np.where(wind_delay, hour_index, -1), axis=1)
+        next_delay = np.full((len(new_levels), num_hours + 1), num_hours)
+        next_delay[:, :-1] = np.minimum.accumulate(np.where(wind_delay, hour_index, num_hours)[:, ::-1], axis=1)[:, ::-1]
+
+        # delays are consecutive when the hour of day increases by one from the prior delay
+        previous_delay = np.full(wind_delay.shape, -1)
+        previous_delay[:, 1:] = prior_delay[:, :-1]
+        consecutive = (previous_delay >= 0) & (self.hour - self.hour[np.maximum(previous_delay, 0)] == 1)
+        run_start_bool = wind_delay & ~consecutive
+
+        # first and last hour of the run of consecutive delays that contains each delayed hour
+        run_start = np.maximum.accumulate(np.where(run_start_bool, hour_index, -1), axis=1)
+        next_run_start = np.full(wind_delay.shape, num_hours)
+        next_run_start[:, :-1] = np.minimum.accumulate(np.where(run_start_bool, hour_index, num_hours)[:, ::-1],
+                                                       axis=1)[:, -2::-1]
+        run_end = np.take_along_axis(prior_delay, next_run_start - 1, axis=1)
+
+        # delay hours for each complete run that lies inside a mission (stored at the last hour of the run)
+        # runs > 1 hr are reported as a consecutive delay plus a 1 hr delay (see calculate_delay_durations)
+        run_length = (np.take_along_axis(delay_count, run_end + 1, axis=1) -
+                      np.take_along_axis(delay_count, np.maximum(run_start, 0), axis=1))
+        run_delay = np.where(run_length > 1, cap_delay_hours(run_length - 1) + 1, 1)
+        run_delay = np.where(wind_delay & (run_end == hour_index), run_delay, 0)
+        run_delay_sum = np.zeros((len(new_levels), num_hours + 1), dtype=int)
+        run_delay_sum[:, 1:] = np.cumsum(run_delay, axis=1)
+
+        new_data = {'delay_count': delay_count.astype(np.int32),
+                    'prior_delay': prior_delay.astype(np.int32),
+                    'next_delay': next_delay.astype(np.int32),
+                    'run_start': run_start.astype(np.int32),
+                    'run_end': run_end.astype(np.int32),
+                    'run_delay_sum': run_delay_sum.astype(np.int32)}
+
+        for key in new_data:
+            if key in self.level_data:
+                self.level_data[key] = np.concatenate([self.level_data[key], new_data[key]])
             else:
-                greater_than_1hr = np.diff(index_change)[include_change[0:len(np.diff(index_change))+1]]
+                self.level_data[key] = new_data[key]
+        self.level_row[new_levels] = np.arange(len(new_levels)) + np.count_nonzero(self.level_row >= 0)
+
+    def calculate_capped_delay(self, start_delay, mission_time, critical_wind_speed, height_interest,
+                               wind_shear_exponent):
+        """
+        Calculates total wind delay hours (after applying the shutdown rule in cap_delay_hours) for a mission.
+        Start delay, mission time, critical wind speed, and height of interest may be arrays (broadcast together).
+
+        :param start_delay: delay of mission from start of weather window
+        :param mission_time: length of mission (i.e., time that it takes to complete operation) in hours
+        :param critical_wind_speed: wind speed at which operation must be shutdown
+        :param height_interest: height of interest for weather delay calculations
+        :param wind_shear_exponent: exponent for wind shear calculations
+        :return: total wind delay (in hours) for each mission
+        """
+
+        if np.any(np.asarray(start_delay) + mission_time > self.num_hours):
+            print('Warning: Mission time larger than weather window')
+
+        level = self.find_level(critical_wind_speed=critical_wind_speed,
+                                height_interest=height_interest,
+                                wind_shear_exponent=wind_shear_exponent)
+        self.build_levels(level)
+        row = self.level_row[level]
+
+        # mission covers hours after start delay up to and including start delay + mission time
+        mission_start = np.minimum(np.asarray(start_delay, dtype=int) + 1, self.num_hours)
+        mission_end = np.minimum(np.floor(start_delay + mission_time).astype(int), self.num_hours - 1)
+
+        return self.sum_capped_delay(row, mission_start, mission_end)
+
+    def sum_capped_delay(self, row, mission_start, mission_end):
+        """
+        Sums wind delay hours between first and last hour of a mission from the prefix sums for a threshold level.
+
+        :param row: row in level arrays for the threshold level
+        :param mission_start: first hour of mission in weather window
+        :param mission_end: last hour of mission in weather window
+        :return: total wind delay (in hours)
+        """
+
+        data = self.level_data
+        delay_count = data['delay_count']
+
+        # first and last delay during mission
+        first_delay = data['next_delay'][row, mission_start]
+        any_delay = first_delay <= mission_end
+        first_delay = np.minimum(first_delay, self.num_hours - 1)
+        last_delay = np.maximum(data['prior_delay'][row, np.maximum(mission_end, 0)], 0)
+
+        # runs of consecutive delays containing the first and last delay may be cut off by the mission
+        first_run_end = data['run_end'][row, first_delay]
+        last_run_start = data['run_start'][row, last_delay]
+        first_length = (delay_count[row, np.minimum(first_run_end, mission_end) + 1] - delay_count[row, first_delay])
+        last_length = (delay_count[row, last_delay + 1] - delay_count[row, np.maximum(last_run_start, mission_start)])
+
+        # when the first delay is consecutive, the entire first run is reported as a single delay
+        # when the last delay is consecutive, an extra 1 hr delay is reported, and the last run is not reported
+        # unless the first delay is also consecutive (see calculate_delay_durations)
+        single_run = np.where(first_length > 1, cap_delay_hours(first_length) + 1, 1)
+        first_run = np.where(first_length > 1, cap_delay_hours(first_length), 1)
+        middle_runs = (data['run_delay_sum'][row, np.maximum(last_run_start, first_run_end + 1)] -
+                       data['run_delay_sum'][row, first_run_end + 1])
+        last_run = np.where(last_length > 1, np.where(first_length > 1, cap_delay_hours(last_length - 1) + 2, 2), 1)
+
+        capped_delay = np.where(last_run_start <= first_delay, single_run, first_run + middle_runs + last_run)
+        capped_delay = np.where(any_delay, capped_delay, 0)
+
+        return capped_delay.astype(float)
+
+
+def calculate_cached_delay(weather_index, start_delay, mission_time, critical_wind_speed, height_interest,
+                           wind_shear_exponent):
+    """
+    Calculates total wind delay hours for a mission (see WeatherIndex.calculate_capped_delay), reusing results from
+    delay_cache for combinations that have already been computed for the same weather window (e.g., cranes with the same
+    critical wind speed for a component, or other scenarios that share the weather window). Inputs are rounded to
+    cache_decimals places for the cache key only; wind delays that are not in the cache are calculated from the inputs
+    as given.
 
-        else:
-            greater_than_1hr = []
+    :param weather_index: weather index for the weather window
+    :param start_delay: delay of mission from start of weather window
+    :param mission_time: length of mission (i.e., time that it takes to complete operation) in hours
+    :param critical_wind_speed: wind speed at which operation must be shutdown
+    :param height_interest: height of interest for weather delay calculations
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: total wind delay (in hours) for each mission
+    """
 
-        # calculate the number of single hour delays
-        count_1hr = weather_delay['Hour delay bool'].where(weather_delay['Hour delay bool'] == False).count()
+    inputs = np.broadcast_arrays(*[np.asarray(value, dtype=float)
+                                   for value in [start_delay, mission_time, critical_wind_speed, height_interest]])
+    [start_delay, mission_time, critical_wind_speed, height_interest] = [value.ravel() for value in inputs]
+    key_inputs = [np.round(value, cache_decimals).tolist()
+                  for value in [start_delay, mission_time, critical_wind_speed, height_interest]]
+    wind_shear_key = round(float(wind_shear_exponent), cache_decimals)
+
+    # group inputs by cache key
+    key_position = dict()
+    for position, key in enumerate(zip(*key_inputs)):
+        key_position.setdefault((weather_index.window_id, wind_shear_key) + key, []).append(position)
+
+    # wind delays in cache (most recently used are moved to end of cache)
+    key_delay = dict()
+    for key in key_position:
+        if key in delay_cache:
+            key_delay[key] = delay_cache[key]
+            delay_cache.move_to_end(key)
+
+    # compute wind delays that are not in cache in a single call
+    missing_keys = [key for key in key_position if key not in key_delay]
+    if len(missing_keys) != 0:
+        missing_position = [key_position[key][0] for key in missing_keys]
+        missing_delay = weather_index.calculate_capped_delay(start_delay=start_delay[missing_position],
+                                                             mission_time=mission_time[missing_position],
+                                                             critical_wind_speed=critical_wind_speed[missing_position],
+                                                             height_interest=height_interest[missing_position],
+                                                             wind_shear_exponent=float(wind_shear_exponent))
+        key_delay.update(zip(missing_keys, missing_delay.tolist()))
+        delay_cache.update(zip(missing_keys, missing_delay.tolist()))
+        evict_delay_cache()
+
+    delay_cache_stats['misses'] += len(missing_keys)
+    delay_cache_stats['hits'] += len(start_delay) - len(missing_keys)
+
+    wind_delay_time = np.empty(len(start_delay))
+    for key in key_position:
+        wind_delay_time[key_position[key]] = key_delay[key]
+
+    return wind_delay_time.reshape(inputs[0].shape)
+
+
+def configure_delay_cache(max_size=None):
+    """
+    Sets size limit for the wind delay cache used by calculate_cached_delay.
 
-        # create list of weather delays including > 1 hr and 1 hr delays
-        delay_duration = list(greater_than_1hr) + list(np.ones(count_1hr))
-    else:
-        delay_duration = list([0])
+    :param max_size: maximum number of wind delays to keep in cache
+    """
+
+    if max_size is not None:
+        if max_size < 1:
+            raise ValueError('Wind delay cache size must be at least 1')
+        delay_cache_settings['max_size'] = int(max_size)
+
+    evict_delay_cache()
+
+
+def evict_delay_cache():
+    """
+    Evicts least recently used wind delays until the wind delay cache is within its size limit.
+    """
+
+    while len(delay_cache) > delay_cache_settings['max_size']:
+        delay_cache.popitem(last=False)
+        delay_cache_stats['evictions'] += 1
+
+
+def get_delay_cache_stats():
+    """
+    Gets statistics for the wind delay cache used by calculate_cached_delay.
+
+    :return: dictionary with number of cache hits, cache misses, evictions, and cached wind delays
+    """
+
+    stats = dict(delay_cache_stats)
+    stats['size'] = len(delay_cache)
+    return stats
+
+
+def clear_delay_cache():
+    """
+    Clears the wind delay cache used by calculate_cached_delay and resets its statistics.
+    """
+
+    delay_cache.clear()
+    for key in delay_cache_stats:
+        delay_cache_stats[key] = 0
+
+
+def calculate_capped_delay_by_year(weather_window, mission_time, critical_wind_speed, height_interest,
+                                   wind_shear_exponent):
+    """
+    Calculates total wind delay hours (see WeatherIndex.calculate_capped_delay) for each year in a multi-year weather
+    window, with each mission starting at the beginning of the weather window for each year. Results for each year are
+    the same as using a weather window with only that year of weather data.
+
+    Years are processed in chunks of years_per_chunk years so that memory use does not grow with the number of years.
+
+    :param weather_window: filtered weather window containing data specific to season and time of construction
+    :param mission_time: length of mission (i.e., time that it takes to complete operation) in hours
+                         (limited to the weather window for each year, so np.inf covers the entire year)
+    :param critical_wind_speed: wind speed at which operation must be shutdown
+    :param height_interest: height of interest for weather delay calculations
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: array of years, array of hours in weather window for each year, and array of total wind delay (in hours)
+             for each year (rows) and mission (columns)
+    """
+
+    [mission_time, critical_wind_speed, height_interest] = [
+        value.ravel() for value in np.broadcast_arrays(np.asarray(mission_time, dtype=float),
+                                                       np.asarray(critical_wind_speed, dtype=float),
+                                                       np.asarray(height_interest, dtype=float))]
+
+    # first hour of weather window and number of hours in weather window for each year
+    window_year = weather_window['Year'].values
+    year_start = np.r_[0, np.flatnonzero(np.diff(window_year)) + 1]
+    year_hours = np.diff(np.r_[year_start, len(window_year)])
+
+    wind_delay_time = np.zeros((len(year_start), len(mission_time)))
+    for chunk_start in range(0, len(year_start), years_per_chunk):
+        chunk = slice(chunk_start, chunk_start + years_per_chunk)
+        first_hour = year_start[chunk][0]
+        last_hour = year_start[chunk][-1] + year_hours[chunk][-1]
+
+        weather_index = WeatherIndex(weather_window.iloc[first_hour:last_hour])
+        year_mission_time = np.minimum(mission_time[np.newaxis, :], year_hours[chunk][:, np.newaxis] - 1)
+        wind_delay_time[chunk] = weather_index.calculate_capped_delay(
+            start_delay=(year_start[chunk] - first_hour)[:, np.newaxis],
+            mission_time=year_mission_time,
+            critical_wind_speed=critical_wind_speed,
+            height_interest=height_interest,
+            wind_shear_exponent=wind_shear_exponent)
+
+    return window_year[year_start], year_hours, wind_delay_time
+
+
+def calculate_wind_multiplier_statistics(wind_multiplier):
+    """
+    Summarizes wind multipliers over all years of weather data.
+
+    :param wind_multiplier: wind multiplier for each year of weather data
+    :return: dictionary with mean, median (P50), and 90th percentile (P90) wind multiplier
+    """
+
+    wind_multiplier = np.asarray(wind_multiplier, dtype=float)
+
+    return {'Mean': np.mean(wind_multiplier),
+            'P50': np.percentile(wind_multiplier, 50),
+            'P90': np.percentile(wind_multiplier, 90)}
+
+
+def calculate_capped_delay_by_start(weather_index, start_fraction, mission_time, critical_wind_speed, height_interest,
+                                    wind_shear_exponent):
+    """
+    Calculates total wind delay hours (see WeatherIndex.calculate_capped_delay) for a mission started at many
+    different hours of the weather window (e.g., for sampling the construction start date). All starts are evaluated
+    in a single call from the cumulative run sums of the weather index rather than by recalculating wind delay for
+    each start.
+
+    Start times are given as a fraction of the latest start that keeps the entire mission within the weather window,
+    so that the same fractions can be shared by operations with different mission times.
+
+    :param weather_index: weather index for the weather window
+    :param start_fraction: array of start times as a fraction (0 to 1) of the latest start in the weather window
+    :param mission_time: length of mission (i.e., time that it takes to complete operation) in hours
+    :param critical_wind_speed: wind speed at which operation must be shutdown
+    :param height_interest: height of interest for weather delay calculations
+    :param wind_shear_exponent: exponent for wind shear calculations
+    :return: array of start delays (in hours) and array of total wind delay (in hours) for each start
+    """
+
+    # latest start where the last hour of the mission is still in the weather window
+    latest_start = max(weather_index.num_hours - 1 - int(np.floor(mission_time)), 0)
+    start_fraction = np.clip(np.asarray(start_fraction, dtype=float), 0, 1)
+    start_delay = np.minimum(np.floor(start_fraction * (latest_start + 1)), latest_start).astype(int)
+
+    wind_delay_time = weather_index.calculate_capped_delay(start_delay=start_delay,
+                                                           mission_time=mission_time,
+                                                           critical_wind_speed=critical_wind_speed,
+                                                           height_interest=height_interest,
+                                                           wind_shear_exponent=wind_shear_exponent)
 
-    delay_duration = delay_duration
-    return delay_duration
\ No newline at end of file
+    return start_delay, wind_delay_time
@@ -9,7 +9,7 @@ setup(
     description='Land-based Balance-of-System Systems Engineering Model',
     author='A. Eberle',
     author_email='annika.eberle@nrel.gov',
-    install_requires=['pandas', 'numpy', 'seaborn', 'scipy', 'shapely'],
+    install_requires=['pandas', 'numpy', 'seaborn', 'scipy'],
     packages=['landbosse'],
     license='Apache License, Version 2.0',
     dependency_links=['https://github.nrel.gov/kdykes/LandBOSSE'],
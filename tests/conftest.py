@@ -0,0 +1,114 @@
+"""
+Test configuration for LandBOSSE (modules in landbosse are imported by name, as in LandBOSSE.py).
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'landbosse'))
+
+def write_input_files(input_dir, num_turbines=50):
+    """
+    Writes synthetic input files for a single project (one year of hourly weather data).
+
+    :param input_dir: directory for input files
+    :param num_turbines: number of turbines in project
+    :return: dictionary of input files
+    """
+
+    random_state = np.random.RandomState(0)
+    files = {name: os.path.join(input_dir, name + '.csv')
+             for name in ['crane_specs', 'crew', 'components', 'project', 'equip_price', 'crew_price',
+                          'material_price', 'weather', 'rsmeans']}
+
+    # weather file has four header rows, date in first column, and wind speed in fifth column
+    dates = pd.date_range('2017-01-01 00:00', periods=8760 + 4, freq='h')
+    speed = pd.Series(random_state.weibull(2.0, len(dates)) * 9.5).rolling(4, min_periods=1).mean().values
+    pd.DataFrame({'Date': dates.strftime('%m/%d/%Y %H:%M'), 'Temp': 10.0, 'Pres': 1.0, 'Dir': 180.0,
+                  'Speed': speed.round(3)},
+                 columns=['Date', 'Temp', 'Pres', 'Dir', 'Speed']).to_csv(files['weather'], index=False)
+
+    pd.DataFrame([['T1_100', 100, num_turbines, 5, 120, 2.5, 10, 0.2, 'steel', 2.36, 0.5, 2.5]],
+                 columns=['Project ID', 'Hub height m', 'Number of turbines', 'Turbine spacing (times rotor diameter)',
+                          'Rotor diameter m', 'Turbine rating MW', 'Rate of deliveries (turbines per week)',
+                          'Wind shear exponent', 'Tower type', 'Foundation depth m',
+                          'Breakpoint between base and topping (percent)',
+                          'Fuel cost USD per gal']).to_csv(files['project'], index=False)
+
+    pd.DataFrame([['Tower 1', 60, 25, 100, 1.2, 0.6, 15, 15, 0, 1, 3, 5, 1],
+                  ['Tower 2', 50, 55, 90, 1.2, 0.6, 45, 45, 0, 1, 3, 5, 1],
+                  ['Tower 3', 40, 85, 80, 1.2, 0.6, 75, 75, 0, 1, 3, 5, 1],
+                  ['Nacelle', 80, 100, 40, 1.3, 0.8, 100, 100, 0, 1, 4, 6, 1],
+                  ['Hub', 25, 100, 15, 1.2, 0.8, 100, 100, 1, 0, 3, 4, 1],
+                  ['Blade', 12, 100, 60, 1.4, 1.0, 100, 100, 3, 0, 2, 4, 1]],
+                 columns=['Component', 'Mass tonne', 'Lift height m', 'Surface area sq m', 'Coeff drag',
+                          'Coeff drag (installed)', 'Section height m', 'Lever arm m', 'Multplier drag rotor',
+                          'Multiplier tower drag', 'Cycle time installation hrs', 'Offload hook height m',
+                          'Offload cycle time hrs']).to_csv(files['components'], index=False)
+
+    # load chart points (max capacity, hub height) for each crane configuration
+    cranes = [['Crawler crane', 'LR1600', 'SL8', 600, [(90, 120), (130, 80), (150, 40)], 12, 60, 1.0, 30, 'C1', 200000],
+              ['Crawler crane', 'LR1400', 'SL5', 400, [(70, 110), (110, 60), (130, 30)], 11, 50, 1.2, 24, 'C1', 150000],
+              ['Crawler crane', 'LR11000', 'PS', 1000, [(120, 140), (200, 80)], 13, 70, 0.8, 40, 'C1', 300000],
+              ['Crawler crane', 'LR1300', 'SL2', 300, [(40, 70), (80, 40), (90, 20)], 10, 45, 1.5, 20, 'C2', 100000],
+              ['Offload crane', 'LTM1100', 'T', 100, [(60, 20), (70, 10)], 9, 30, 40, 2, 'C3', 20000],
+              ['Offload crane', 'LTM1200', 'T', 200, [(80, 20), (100, 10)], 9, 30, 40, 2, 'C3', 30000]]
+    pd.DataFrame([crane[:4] + list(point) + crane[5:] for crane in cranes for point in crane[4]],
+                 columns=['Equipment name', 'Crane name', 'Boom system', 'Crane capacity tonne', 'Max capacity tonne',
+                          'Hub height m', 'Max wind speed m per s', 'Hoist speed m per min',
+                          'Speed of travel km per hr', 'Setup time hr', 'Crew type ID',
+                          'Mobilization cost USD']).to_csv(files['crane_specs'], index=False)
+
+    pd.DataFrame([['Crawler crane', 600, 900, 300], ['Crawler crane', 400, 700, 250],
+                  ['Crawler crane', 1000, 1400, 400], ['Crawler crane', 300, 500, 200],
+                  ['Offload crane', 100, 200, 80], ['Offload crane', 200, 300, 100]],
+                 columns=['Equipment name', 'Crane capacity tonne', 'Equipment price USD per hour',
+                          'Fuel consumption gal per day']).to_csv(files['equip_price'], index=False)
+
+    pd.DataFrame([['C1', 'Base', 'Base crew', 'Base crew', 'L1', 4], ['C1', 'Base', 'Base crew', 'Base crew', 'L2', 2],
+                  ['C1', 'Top', 'Top crew', 'Top crew', 'L1', 5], ['C1', 'Top', 'Top crew', 'Top crew', 'L2', 2],
+                  ['C2', 'Base', 'Base crew', 'Base crew', 'L1', 3], ['C2', 'Top', 'Top crew', 'Top crew', 'L1', 4],
+                  ['C3', 'Offload', 'Offload crew', 'Offload crew', 'L1', 2],
+                  ['M1', 'Management', 'Mgmt', 'Management - project size', 'L3', 1],
+                  ['M1', 'Management', 'Mgmt', 'Management - rate construction', 'L3', 1],
+                  ['M2', 'Mechanical completion', 'Mech', 'Mechanical completion', 'L1', 2]],
+                 columns=['Crew type ID', 'Operation', 'Crew type', 'Crew name', 'Labor type ID',
+                          'Number of workers']).to_csv(files['crew'], index=False)
+
+    pd.DataFrame([['L1', 50, 144], ['L2', 80, 144], ['L3', 90, 144]],
+                 columns=['Labor type ID', 'Hourly rate USD per hour',
+                          'Per diem USD per day']).to_csv(files['crew_price'], index=False)
+
+    pd.DataFrame([['Steel - rebar', 900], ['Concrete 5000 psi', 130], ['Excavated dirt', 0], ['Backfill', 5],
+                  ['Rock', 20]],
+                 columns=['Material type ID', 'Material price USD per unit']).to_csv(files['material_price'],
+                                                                                      index=False)
+
+    pd.DataFrame([['Foundations', 'Steel - rebar', 'Rebar', 'Labor', 'ton (short)', 2.0, 500, 4, 0],
+                  ['Foundations', 'Steel - rebar', 'Rebar', 'Equipment rental', 'ton (short)', 2.0, 100, 4, 0],
+                  ['Foundations', 'Concrete 5000 psi', 'Pour', 'Labor', 'cubic yards', 100, 20, 6, 0],
+                  ['Foundations', 'Concrete 5000 psi', 'Pour', 'Equipment rental', 'cubic yards', 100, 10, 6, 0],
+                  ['Foundations', 'Excavated dirt', 'Excavate', 'Equipment rental', 'cubic_yards', 500, 5, 2, 0],
+                  ['Foundations', 'Backfill', 'Backfill', 'Labor', 'cubic_yards', 400, 3, 2, 0],
+                  ['Roads', 'Rock', 'Topsoil', 'Labor', 'cubic yard', 800, 2, 3, 0.01],
+                  ['Roads', 'Rock', 'Embank crane', 'Equipment rental', 'embankment cubic yards crane', 900, 3, 3, 0.01],
+                  ['Roads', 'Rock', 'Embank road', 'Labor', 'embankment cubic yards road', 700, 4, 3, 0.01],
+                  ['Roads', 'Rock', 'Rock place', 'Equipment rental', 'loose cubic yard', 600, 6, 3, 0.01],
+                  ['Roads', 'Rock', 'Grading', 'Labor', 'Each (100000 square feet)', 2, 2000, 3, 1.0]],
+                 columns=['Module', 'Material type ID', 'Operation ID', 'Type of cost', 'Units', 'Daily output',
+                          'Rate USD per unit', 'Number of workers',
+                          'Per Diem Hours (per unit)']).to_csv(files['rsmeans'], index=False)
+
+    return files
+
+
+@pytest.fixture(scope='session')
+def input_files(tmp_path_factory):
+    """
+    Synthetic input files for a 50 turbine project.
+    """
+
+    return write_input_files(str(tmp_path_factory.mktemp('inputs')))
@@ -0,0 +1,228 @@
+"""
+Tests for erection costs in ErectionCost.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import ErectionCost
+import InputData
+import LandBOSSE
+from conftest import write_input_files
+
+
+@pytest.fixture(scope='module')
+def large_project_files(tmp_path_factory):
+    """
+    Synthetic input files for a 150 turbine project (erection takes long enough for fleets of several cranes), with a
+    second boom system for each crawler crane so that there are more crane and operation combinations than crews.
+    """
+
+    files = write_input_files(str(tmp_path_factory.mktemp('inputs')), num_turbines=150)
+    crane_specs = pd.read_csv(files['crane_specs'])
+    crawler_cranes = crane_specs[crane_specs['Equipment name'] == 'Crawler crane']
+    second_boom = crawler_cranes.assign(**{'Boom system': crawler_cranes['Boom system'] + 'L',
+                                           'Hub height m': crawler_cranes['Hub height m'] + 10,
+                                           'Max capacity tonne': crawler_cranes['Max capacity tonne'] * 0.9})
+    pd.concat([crane_specs, second_boom]).to_csv(files['crane_specs'], index=False)
+
+    return files
+
+
+def calculate_fleet_costs(files, max_num_cranes):
+    """
+    Calculates erection costs for each crane, operation, and number of cranes as in ErectionCost.calculate_costs.
+    """
+
+    input_bundle = InputData.InputBundle(files)
+    project_data = input_bundle.data
+    project_specs = project_data['project'].iloc[[0]]
+    hour_day = LandBOSSE.operational_hour_dict
+    weather_window = input_bundle.load_weather_window(season_id=LandBOSSE.season_dict,
+                                                      season_construct=LandBOSSE.season_construct,
+                                                      time_construct=LandBOSSE.time_construct)
+
+    [crane_specs, operation_time, infeasible_lifts] = \
+        ErectionCost.calculate_operation_time(project_specs=project_specs,
+                                              project_data=project_data,
+                                              operations=list(ErectionCost.crane_operations),
+                                              construct_duration=LandBOSSE.construction_time_months,
+                                              operational_construction_time=hour_day[LandBOSSE.time_construct],
+                                              rate_of_deliveries=float(project_specs['Rate of deliveries (turbines per week)'].iloc[0]))
+    assert len(infeasible_lifts) == 0
+
+    cranes_wind_delay = ErectionCost.calculate_wind_delay_by_component(crane_specs=crane_specs,
+                                                                       weather_window=weather_window,
+                                                                       wind_shear_exponent=0.2)
+    separate_basetop = ErectionCost.aggregate_erection_costs(project_specs=project_specs,
+                                                             crane_data=cranes_wind_delay,
+                                                             operation_time=operation_time,
+                                                             project_data=project_data,
+                                                             hour_day=hour_day,
+                                                             construct_time=LandBOSSE.time_construct,
+                                                             overtime_multiplier=LandBOSSE.overtime_multiplier)
+
+    return separate_basetop, ErectionCost.calculate_crane_fleet_costs(separate_basetop=separate_basetop,
+                                                                      hour_day=hour_day,
+                                                                      construct_time=LandBOSSE.time_construct,
+                                                                      construction_time=LandBOSSE.construction_time_months,
+                                                                      max_num_cranes=max_num_cranes)
+
+
+def test_fleet_costs_not_negative(large_project_files):
+    [separate_basetop, fleet_cost] = calculate_fleet_costs(large_project_files, max_num_cranes=3)
+
+    assert (separate_basetop['Management labor cost USD'] <= separate_basetop['Labor cost USD']).all()
+    assert fleet_cost['Number of cranes'].max() > 1
+    for column in ['Labor cost USD', 'Management labor cost USD', 'Total cost USD']:
+        assert (fleet_cost[column] >= 0).all(), column
+
+
+def test_fleet_time_allowed_recorded(large_project_files):
+    [separate_basetop, fleet_cost] = calculate_fleet_costs(large_project_files, max_num_cranes=1)
+
+    # fleets that do not complete erection in time are kept (and recorded) if no fleet for the operation does
+    erection = fleet_cost['Operation'].isin(['Base', 'Top'])
+    within_time = fleet_cost.loc[erection, 'Within time allowed']
+    construct_days = fleet_cost.loc[erection, 'Construct days']
+    np.testing.assert_array_equal(within_time, construct_days <= 1 / 3 * LandBOSSE.construction_time_months * 30)
+    assert set(fleet_cost.loc[erection, 'Operation']) == {'Base', 'Top'}
+
+
+def test_infeasible_lift_reasons(input_files):
+    project_specs = pd.read_csv(input_files['project'])
+    components = pd.read_csv(input_files['components']).set_index('Component')
+    crane_specs = pd.read_csv(input_files['crane_specs'])
+
+    # nacelle is too heavy for any crane, blade is too high for any crane, and there are no offload cranes
+    components.loc['Nacelle', 'Mass tonne'] = 5000
+    components.loc['Blade', 'Lift height m'] = 500
+    project_data = {'components': components.reset_index(),
+                    'crane_specs': crane_specs[crane_specs['Equipment name'] != 'Offload crane']}
+
+    infeasible_lifts = ErectionCost.find_infeasible_lifts(project_specs=project_specs, project_data=project_data)
+    reason = infeasible_lifts.set_index(['Operation', 'Component'])['Reason']
+
+    assert reason[('Top', 'Nacelle')] == 'Crane capacity too small'
+    assert reason[('Top', 'Blade')] == 'Crane hub height too small'
+    offload = infeasible_lifts['Operation'] == 'Offload'
+    assert offload.sum() == len(components)
+    assert (infeasible_lifts.loc[offload, 'Reason'] == 'No crane for equipment name').all()
+    assert infeasible_lifts.loc[offload, 'Nearest crane name'].isnull().all()
+
+    # cost calculation stops before operation time, wind delays, and crew costs are needed
+    with pytest.raises(ErectionCost.InfeasibleErectionError, match='no crane for equipment name') as error:
+        ErectionCost.calculate_costs(project_specs=project_specs, project_data=project_data, hour_day={'normal': 10},
+                                     time_construct='normal', weather_window=None, construction_time=9,
+                                     rate_of_deliveries=10, overtime_multiplier=1, wind_shear_exponent=0.2)
+    pd.testing.assert_frame_equal(error.value.infeasible_lifts, infeasible_lifts)
+
+
+def test_bos_cost_with_crane_fleets(large_project_files):
+    single_crane = LandBOSSE.calculate_bos_cost(files=large_project_files, scenario_name='T1_100', scenario_height=100,
+                                                development=5e6)
+    crane_fleet = LandBOSSE.calculate_bos_cost(files=large_project_files, scenario_name='T1_100', scenario_height=100,
+                                               development=5e6, max_num_cranes=3)
+
+    # erection costs are only calculated for some types of cost (others are missing for all phases)
+    erection_cost = crane_fleet[0].loc[crane_fleet[0]['Phase of construction'] == 'Erection', 'Cost USD'].dropna()
+    assert len(erection_cost) == 6
+    assert (erection_cost >= 0).all() and np.isfinite(erection_cost).all()
+    assert np.isfinite(crane_fleet[1]['Wind multiplier']).all()
+
+    # fleets only change erection costs (and management costs that depend on total costs)
+    other_phases = ~crane_fleet[0]['Phase of construction'].isin(['Erection', 'Management'])
+    pd.testing.assert_frame_equal(crane_fleet[0][other_phases], single_crane[0][other_phases])
+
+
+def create_crane_costs(num_cranes, num_offload, random_state):
+    """
+    Random costs for each crane for base and topping (same cranes) and for offload cranes.
+    """
+
+    crane_name = ['C{}'.format(crane) for crane in range(num_cranes)]
+    offload_name = ['O{}'.format(crane) for crane in range(num_offload)]
+    operation = ['Base'] * num_cranes + ['Top'] * num_cranes + ['Offload'] * num_offload
+    crane_costs = pd.DataFrame({'Operation': operation,
+                                'Crane name': crane_name + crane_name + offload_name,
+                                'Boom system': 'B',
+                                'Total cost USD': random_state.uniform(1e5, 1e6, len(operation)),
+                                'Mobilization cost USD': random_state.uniform(1e4, 2e5, len(operation))})
+
+    # shuffle rows and use a non-default index (rows are returned by index label)
+    return crane_costs.sample(frac=1, random_state=random_state).set_index(np.arange(len(operation)) * 3 + 7)
+
+
+@pytest.mark.parametrize('allow_same_crane', [False, True])
+@pytest.mark.parametrize('num_offload', [0, 3])
+def test_crane_fleet_options_match_enumeration(allow_same_crane, num_offload):
+    random_state = np.random.RandomState(1)
+    for trial in range(20):
+        crane_costs = create_crane_costs(num_cranes=random_state.randint(1, 8), num_offload=num_offload,
+                                         random_state=random_state)
+        rows = {operation: crane_costs.index[crane_costs['Operation'] == operation]
+                for operation in ['Base', 'Top', 'Offload']}
+
+        # cost of every fleet (two offload cranes; shared crane is mobilized and demobilized once)
+        fleets = list()
+        for base in rows['Base']:
+            for top in rows['Top']:
+                for offload in (rows['Offload'] if num_offload else [None]):
+                    cost = crane_costs.loc[base, 'Total cost USD'] + crane_costs.loc[top, 'Total cost USD']
+                    if offload is not None:
+                        cost += crane_costs.loc[offload, 'Total cost USD'] * 2
+                    same_crane = crane_costs.loc[base, 'Crane name'] == crane_costs.loc[top, 'Crane name']
+                    if allow_same_crane and same_crane:
+                        cost -= min(crane_costs.loc[base, 'Mobilization cost USD'],
+                                    crane_costs.loc[top, 'Mobilization cost USD']) * 2
+                    fleets.append((cost, base, top, offload))
+        fleets.sort(key=lambda fleet: fleet[0])
+
+        num_options = 5
+        fleet_options = ErectionCost.find_crane_fleet_options(separate_basetop=crane_costs,
+                                                              allow_same_crane=allow_same_crane,
+                                                              num_options=num_options)
+
+        expected = fleets[:num_options]
+        np.testing.assert_allclose(fleet_options['Total cost USD'], [fleet[0] for fleet in expected], rtol=1e-12)
+        assert list(fleet_options['Base row']) == [fleet[1] for fleet in expected]
+        assert list(fleet_options['Top row']) == [fleet[2] for fleet in expected]
+        if num_offload:
+            assert list(fleet_options['Offload row']) == [fleet[3] for fleet in expected]
+        else:
+            assert fleet_options['Offload row'].isnull().all()
+
+
+def test_bos_cost_with_same_crane(input_files):
+    separate_cranes = LandBOSSE.calculate_bos_cost(files=input_files, scenario_name='T1_100', scenario_height=100,
+                                                   development=5e6)[0]
+    same_crane = LandBOSSE.calculate_bos_cost(files=input_files, scenario_name='T1_100', scenario_height=100,
+                                              development=5e6, allow_same_crane=True)[0]
+
+    # least cost base and topping crane is the same crane (mobilized once if allowed)
+    erection = separate_cranes['Phase of construction'] == 'Erection'
+    assert same_crane.loc[erection, 'Cost USD'].sum() < separate_cranes.loc[erection, 'Cost USD'].sum()
+
+
+def test_compiled_cache_is_bounded(input_files):
+    crane_specs = pd.read_csv(input_files['crane_specs'])
+    crew = pd.read_csv(input_files['crew'])
+    crew_price = pd.read_csv(input_files['crew_price'])
+    ErectionCost.clear_compiled_cache()
+    ErectionCost.configure_compiled_cache(max_size=3)
+    try:
+        for rate in range(5):
+            ErectionCost.get_crane_catalog(crane_specs.assign(**{'Mobilization cost USD': rate}))
+            ErectionCost.get_crew_rates(crew, crew_price.assign(**{'Hourly rate USD per hour': rate}))
+        stats = ErectionCost.get_compiled_cache_stats()
+        for name in ['crane_catalog', 'crew_rates']:
+            assert stats[name]['size'] == 3
+            assert stats[name]['evictions'] == 2
+            assert stats[name]['misses'] == 5
+
+        # most recently used crane catalogs are kept
+        ErectionCost.get_crane_catalog(crane_specs.assign(**{'Mobilization cost USD': 4}))
+        assert ErectionCost.get_compiled_cache_stats()['crane_catalog']['hits'] == 1
+    finally:
+        ErectionCost.configure_compiled_cache(max_size=16)
+        ErectionCost.clear_compiled_cache()
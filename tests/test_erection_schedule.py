@@ -0,0 +1,70 @@
+"""
+Tests for the simulated erection schedule in ErectionSchedule.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import ErectionCost
+import ErectionSchedule
+import LandBOSSE
+
+
+def create_lift_data(vmax):
+    """
+    Lift data for base (one lift) and topping (two lifts) with max permissible wind speed for each lift.
+    """
+
+    return pd.DataFrame({'Operation': ['Base', 'Top', 'Top'],
+                         'Component': ['Tower', 'Nacelle', 'Blade'],
+                         'Lift time hr': [2.0, 3.0, 1.5],
+                         'vmax': vmax,
+                         'Lift height m': [50.0, 100.0, 100.0],
+                         'Travel time hr': [1.0, 1.0, 1.0],
+                         'Setup time hr': [0.5, 0.5, 0.5]})
+
+
+def test_calm_schedule():
+    weather_window = pd.DataFrame({'Speed m per s': np.full(1000, 5.0)})
+    [schedule, operation_summary] = ErectionSchedule.simulate_erection(weather_window=weather_window,
+                                                                       lift_data=create_lift_data([20.0, 20.0, 20.0]),
+                                                                       num_turbines=3,
+                                                                       wind_shear_exponent=0.2,
+                                                                       operational_hrs_per_day=10)
+
+    # one crane for each operation erects turbines back to back; topping starts when base is finished
+    np.testing.assert_allclose(schedule.loc[schedule['Operation'] == 'Base', 'Finish hr'], [3.5, 7.0, 10.5])
+    np.testing.assert_allclose(schedule.loc[schedule['Operation'] == 'Top', 'Finish hr'], [9.5, 15.5, 21.5])
+    assert (schedule['Weather delay hr'] == 0).all()
+    np.testing.assert_allclose(operation_summary['Total time hrs'], [10.5, 18])
+
+
+def test_lift_never_permitted():
+    # wind speed at blade lift height always exceeds max permissible wind speed for blade lift
+    weather_window = pd.DataFrame({'Speed m per s': np.random.RandomState(0).uniform(8, 12, 1000)})
+    lift_data = create_lift_data([20.0, 20.0, 7.0])
+
+    unpermitted_lifts = ErectionSchedule.find_unpermitted_lifts(weather_window=weather_window,
+                                                                lift_data=lift_data,
+                                                                wind_shear_exponent=0.2)
+    assert list(unpermitted_lifts['Component']) == ['Blade']
+
+    with pytest.raises(ValueError, match='Top operation and Blade component'):
+        ErectionSchedule.simulate_erection(weather_window=weather_window,
+                                           lift_data=lift_data,
+                                           num_turbines=3,
+                                           wind_shear_exponent=0.2,
+                                           operational_hrs_per_day=10)
+
+
+def test_simulated_erection_in_constant_high_wind(input_files, tmp_path):
+    files = dict(input_files, weather=str(tmp_path / 'weather.csv'))
+    weather = pd.read_csv(input_files['weather'])
+    weather['Speed'] = 100.0
+    weather.to_csv(files['weather'], index=False)
+
+    with pytest.raises(ErectionCost.InfeasibleErectionError) as error:
+        LandBOSSE.calculate_bos_cost(files=files, scenario_name='T1_100', scenario_height=100, development=5e6,
+                                     simulate_erection=True)
+    assert len(error.value.infeasible_lifts) > 0
+    assert (error.value.infeasible_lifts['Reason'] == 'Wind speed always exceeds max permissible wind speed').all()
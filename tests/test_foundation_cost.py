@@ -0,0 +1,69 @@
+"""
+Tests for foundation sizing in FoundationCost.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import FoundationCost
+
+
+def calculate_bearing_radius_sympy(e, a_eff):
+    """
+    Reference foundation radius from sympy (as calculated before the closed form solution).
+    """
+
+    sympy = pytest.importorskip('sympy')
+    x = sympy.Symbol('x')
+    try:
+        return float(max(sympy.solve(2 * (x ** 2 - e * (x ** 2 - e ** 2) ** 0.5) - a_eff, x)))
+    except (TypeError, ValueError):
+        # no roots, or complex roots
+        return np.nan
+
+
+def test_bearing_radius_matches_sympy():
+    pytest.importorskip('sympy')
+
+    num_points = 0
+    for e in np.r_[np.linspace(-6, 12, 13), 0.0, 3.3]:
+        # include an effective area near the boundary of real roots (discriminant close to zero)
+        for a_eff in np.r_[np.linspace(1, 300, 11), 1.5 * e ** 2 + 1e-6 if e else 1.0]:
+            expected = calculate_bearing_radius_sympy(e, a_eff)
+            radius = float(FoundationCost.calculate_bearing_radius(e, a_eff))
+            if np.isnan(expected):
+                assert np.isnan(radius), (e, a_eff)
+            else:
+                assert radius == pytest.approx(expected, rel=1e-10), (e, a_eff)
+                num_points += 1
+
+    assert num_points > 100
+
+
+def test_bearing_radius_array_matches_scalar():
+    e, a_eff = np.meshgrid(np.linspace(-6, 12, 13), np.linspace(1, 300, 11))
+    radius = FoundationCost.calculate_bearing_radius(e, a_eff)
+
+    assert radius.shape == e.shape
+    for i, j in np.ndindex(e.shape):
+        np.testing.assert_equal(radius[i, j], FoundationCost.calculate_bearing_radius(e[i, j], a_eff[i, j]))
+
+
+def test_foundation_loads_cache_is_bounded(input_files):
+    component_data = pd.read_csv(input_files['components'])
+    FoundationCost.clear_foundation_loads_cache()
+    FoundationCost.configure_foundation_loads_cache(max_size=3)
+    try:
+        for depth in [2.36, 2.5, 2.6, 2.7, 2.8]:
+            FoundationCost.get_foundation_loads(component_data=component_data, depth=depth)
+        stats = FoundationCost.get_foundation_loads_cache_stats()
+        assert stats['size'] == 3
+        assert stats['evictions'] == 2
+
+        # most recently used foundation loads are kept (and match uncached foundation loads)
+        foundation_loads = FoundationCost.get_foundation_loads(component_data=component_data, depth=2.8)
+        assert FoundationCost.get_foundation_loads_cache_stats()['hits'] == 1
+        assert foundation_loads == FoundationCost.calculate_foundation_loads(component_data=component_data, depth=2.8)
+    finally:
+        FoundationCost.configure_foundation_loads_cache(max_size=1000)
+        FoundationCost.clear_foundation_loads_cache()
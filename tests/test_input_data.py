@@ -0,0 +1,42 @@
+"""
+Tests for InputData.py
+"""
+
+import numpy as np
+import pandas as pd
+
+import InputData
+
+
+def find_memmap(values):
+    """
+    Finds the memory mapped file array that an array is a view of (None if the array is not a view of a memory mapped
+    file).
+    """
+
+    base = values
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return base
+        base = getattr(base, 'base', None)
+
+    return None
+
+
+def test_bundle_columns_are_views_of_file(tmp_path):
+    components = pd.DataFrame({'Component': ['Tower', 'Nacelle', 'Blade'],
+                               'Mass tonne': [60.0, 80.0, 12.0],
+                               'Lift height m': [25.0, 100.0, 100.0]})
+    components.to_csv(str(tmp_path / 'components.csv'), index=False)
+    bundle_file = str(tmp_path / 'bundle.bin')
+    InputData.export_input_bundle({'components': str(tmp_path / 'components.csv')}, bundle_file)
+
+    table = InputData.load_input_bundle(bundle_file).data['components']
+
+    pd.testing.assert_frame_equal(table, components)
+    for column in ['Mass tonne', 'Lift height m']:
+        values = table[column].values
+        memmap = find_memmap(values)
+        assert memmap is not None
+        assert np.shares_memory(values, memmap)
+        assert not values.flags.writeable
@@ -0,0 +1,71 @@
+"""
+Tests for the LandBOSSE model entry point.
+"""
+
+import pandas as pd
+import pytest
+import FoundationCost
+import LandBOSSE
+import InputData
+import RoadsCost
+
+
+def test_input_tables_unchanged(input_files):
+    bundle = InputData.InputBundle(input_files)
+    input_tables = {name: table.copy(deep=True) for name, table in bundle.data.items()}
+
+    LandBOSSE.calculate_bos_cost(files=bundle, scenario_name='T1_100', scenario_height=100, development=5e6,
+                                 multi_year=True, num_start_samples=10)
+
+    assert set(bundle.data) == set(input_tables)
+    for name, table in input_tables.items():
+        pd.testing.assert_frame_equal(bundle.data[name], table)
+
+
+def test_start_sample_cost_uses_mobilization_fraction(input_files, tmp_path, monkeypatch):
+    # windier weather so that road and foundation construction have wind delays
+    weather = pd.read_csv(input_files['weather'])
+    weather['Speed'] = weather['Speed'] * 2
+    files = dict(input_files, weather=str(tmp_path / 'weather.csv'))
+    weather.to_csv(files['weather'], index=False)
+
+    start_sample_cost = LandBOSSE.calculate_bos_cost(files=files, scenario_name='T1_100', scenario_height=100,
+                                                     development=5e6, num_start_samples=5, random_seed=0)[5]
+
+    monkeypatch.setattr(RoadsCost, 'mobilization_fraction', 0.1)
+    monkeypatch.setattr(FoundationCost, 'mobilization_fraction', 0.2)
+    changed_cost = LandBOSSE.calculate_bos_cost(files=files, scenario_name='T1_100', scenario_height=100,
+                                                development=5e6, num_start_samples=5, random_seed=0)[5]
+
+    assert (start_sample_cost['Road wind delay cost USD'] > 0).all()
+    assert (start_sample_cost['Foundation wind delay cost USD'] > 0).all()
+    pd.testing.assert_series_equal(changed_cost['Road wind delay cost USD'],
+                                   start_sample_cost['Road wind delay cost USD'] * 1.1 / 1.05)
+    pd.testing.assert_series_equal(changed_cost['Foundation wind delay cost USD'],
+                                   start_sample_cost['Foundation wind delay cost USD'] * 1.2 / 1.1)
+
+
+def test_uniform_foundation_sites_match_project(input_files, tmp_path):
+    project = pd.read_csv(input_files['project'])
+    foundation_sites = pd.DataFrame({'Project ID': 'T1_100',
+                                     'Turbine ID': ['T{}'.format(turbine) for turbine in range(50)],
+                                     'Foundation depth m': project['Foundation depth m'][0],
+                                     'Bearing pressure kPa': FoundationCost.default_bearing_pressure / 1000})
+    files = dict(input_files, foundation_sites=str(tmp_path / 'foundation_sites.csv'))
+    foundation_sites.to_csv(files['foundation_sites'], index=False)
+
+    project_cost = LandBOSSE.calculate_bos_cost(files=input_files, scenario_name='T1_100', scenario_height=100,
+                                                development=5e6)[0]
+    site_cost = LandBOSSE.calculate_bos_cost(files=files, scenario_name='T1_100', scenario_height=100,
+                                             development=5e6)[0]
+
+    pd.testing.assert_frame_equal(site_cost, project_cost, check_exact=False, rtol=1e-9)
+
+
+def test_foundation_sites_without_project(input_files, tmp_path):
+    files = dict(input_files, foundation_sites=str(tmp_path / 'foundation_sites.csv'))
+    pd.DataFrame({'Project ID': 'Other project', 'Turbine ID': ['T1'], 'Foundation depth m': [2.36],
+                  'Bearing pressure kPa': [244.2]}).to_csv(files['foundation_sites'], index=False)
+
+    with pytest.raises(ValueError, match='no turbines for project T1_100'):
+        LandBOSSE.calculate_bos_cost(files=files, scenario_name='T1_100', scenario_height=100, development=5e6)
@@ -0,0 +1,202 @@
+"""
+Tests for WeatherDelay.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import WeatherDelay as WD
+
+
+def calculate_wind_delay_loop(weather_window, start_delay, mission_time, critical_wind_speed, height_interest,
+                              wind_shear_exponent):
+    """
+    Original data frame implementation of calculate_wind_delay (DataFrame.append replaced with pd.concat), used as the
+    reference for the run-length encoder.
+    """
+
+    weather_data = weather_window[weather_window.index > start_delay]
+    mission_end = weather_window.index[weather_window.index == start_delay][0] + mission_time
+    mission_weather = weather_data[weather_data.index <= mission_end].reset_index(drop=True)
+    mission_weather['Wind delay'] = mission_weather['Speed m per s'] * (height_interest / 100) ** (wind_shear_exponent) > critical_wind_speed
+
+    if mission_weather['Wind delay'].any() == True:
+        weather_delay = pd.DataFrame()
+        weather_delay['Hour delay diff'] = (mission_weather['Hour'][mission_weather['Wind delay'] == True].diff())
+        weather_delay['Hour delay bool'] = (weather_delay['Hour delay diff'] == 1)
+        weather_delay = weather_delay.reset_index(drop=True)
+
+        if len(weather_delay['Hour delay diff']) > 1:
+            if weather_delay['Hour delay diff'][1] == 1:
+                weather_delay.loc[weather_delay.index == 0, 'Hour delay bool'] = True
+
+        extra_row = pd.DataFrame([[np.nan, not weather_delay.iloc[-1]['Hour delay bool']]],
+                                 columns=['Hour delay diff', 'Hour delay bool'])
+        weather_delay = pd.concat([weather_delay, extra_row])
+
+        index_change = np.flatnonzero(np.diff(np.r_[0, weather_delay['Hour delay bool'].values.astype(int), 0]))
+
+        include_change = weather_delay['Hour delay bool'].where(weather_delay.index.isin(index_change))
+        include_change = include_change.dropna()
+        include_change = (include_change == 1).reset_index(drop=True)
+        if len(include_change) != 0:
+            include_change.iloc[-1] = ~(include_change.iloc[-1])
+
+            if weather_delay.iloc[-2]['Hour delay bool'] == True:
+                greater_than_1hr = np.diff(index_change)[include_change[0:len(np.diff(index_change))].values]
+            else:
+                greater_than_1hr = np.diff(index_change)[include_change[0:len(np.diff(index_change)) + 1].values]
+        else:
+            greater_than_1hr = []
+
+        count_1hr = weather_delay['Hour delay bool'].where(weather_delay['Hour delay bool'] == False).count()
+        delay_duration = list(greater_than_1hr) + list(np.ones(count_1hr))
+    else:
+        delay_duration = list([0])
+
+    return delay_duration
+
+
+def create_weather_window(num_hours, seed):
+    """
+    Creates a weather window with autocorrelated wind speeds for 11 hours (8am to 6pm) each day.
+    """
+
+    random_state = np.random.RandomState(seed)
+    speed = pd.Series(random_state.weibull(2.0, num_hours) * 9.5).rolling(4, min_periods=1).mean().values
+
+    return pd.DataFrame({'Hour': np.arange(num_hours) % 11 + 8, 'Speed m per s': speed})
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_wind_delay_matches_loop(seed):
+    weather_window = create_weather_window(num_hours=2000, seed=seed)
+    random_state = np.random.RandomState(seed)
+
+    num_compared = 0
+    for trial in range(25):
+        start_delay = int(random_state.randint(0, 1000))
+        mission_time = int(random_state.randint(1, 900))
+        critical_wind_speed = random_state.uniform(6, 16)
+        kwargs = dict(weather_window=weather_window, start_delay=start_delay, mission_time=mission_time,
+                      critical_wind_speed=critical_wind_speed, height_interest=100, wind_shear_exponent=0.2)
+
+        # the loop raises IndexError when neither the first nor the last delay is consecutive
+        try:
+            expected = calculate_wind_delay_loop(**kwargs)
+        except IndexError:
+            continue
+
+        assert list(WD.calculate_wind_delay(**kwargs)) == list(expected)
+        num_compared += 1
+
+    assert num_compared > 0
+
+
+@pytest.mark.parametrize('wind_delay, hour', [([], []), ([False, False], [8, 9])])
+def test_no_delay(wind_delay, hour):
+    assert list(WD.calculate_delay_durations(wind_delay=wind_delay, hour=hour)) == [0]
+
+
+def test_speed_at_critical_wind_speed_is_not_delay():
+    # speeds equal to critical wind speed (e.g., from crane specifications) are not wind delays
+    dates = pd.date_range('2017-06-01 02:00', periods=4 + 110, freq='h')
+    weather_data = pd.DataFrame({'Date': dates.strftime('%m/%d/%Y %H:%M'), 'Temp': 10.0, 'Pres': 1.0, 'Dir': 180.0,
+                                 'Speed': '9.8'})
+    weather_hours = WD.extract_weather_hours(weather_data=weather_data)
+    critical_wind_speed = pd.Series([9.8]).values[0]
+
+    assert (weather_hours['Speed m per s'] == critical_wind_speed).all()
+    assert list(WD.calculate_wind_delay(weather_window=weather_hours, start_delay=0, mission_time=100,
+                                        critical_wind_speed=critical_wind_speed, height_interest=100,
+                                        wind_shear_exponent=0.2)) == [0]
+
+
+def test_cached_delay_uses_unrounded_inputs():
+    weather_index = WD.WeatherIndex(create_weather_window(num_hours=2000, seed=0))
+    WD.clear_delay_cache()
+
+    # critical wind speeds that round to the same cache key
+    critical_wind_speed = np.array([10.0000004, 9.9999996, 12.3])
+    cached = WD.calculate_cached_delay(weather_index=weather_index, start_delay=100, mission_time=500,
+                                       critical_wind_speed=critical_wind_speed, height_interest=100,
+                                       wind_shear_exponent=0.2)
+    uncached = weather_index.calculate_capped_delay(start_delay=np.array([100, 100]), mission_time=np.array([500, 500]),
+                                                    critical_wind_speed=critical_wind_speed[[0, 2]],
+                                                    height_interest=np.array([100, 100]), wind_shear_exponent=0.2)
+
+    assert cached[[0, 2]].tolist() == uncached.tolist()
+    assert WD.get_delay_cache_stats()['misses'] == 2
+
+
+def test_delay_cache_is_bounded():
+    weather_index = WD.WeatherIndex(create_weather_window(num_hours=2000, seed=1))
+    WD.clear_delay_cache()
+    WD.configure_delay_cache(max_size=10)
+    try:
+        for start_delay in range(25):
+            WD.calculate_cached_delay(weather_index=weather_index, start_delay=start_delay, mission_time=300,
+                                      critical_wind_speed=10, height_interest=100, wind_shear_exponent=0.2)
+        stats = WD.get_delay_cache_stats()
+        assert stats['size'] == 10
+        assert stats['evictions'] == 15
+
+        # most recently used wind delays are kept
+        WD.calculate_cached_delay(weather_index=weather_index, start_delay=24, mission_time=300,
+                                  critical_wind_speed=10, height_interest=100, wind_shear_exponent=0.2)
+        assert WD.get_delay_cache_stats()['hits'] == 1
+    finally:
+        WD.configure_delay_cache(max_size=100000)
+        WD.clear_delay_cache()
+
+
+def calculate_capped_delay_scan(weather_window, start_delay, mission_time, critical_wind_speed, height_interest,
+                                wind_shear_exponent):
+    """
+    Total capped wind delay from a full scan of the weather window (reference for WeatherIndex).
+    """
+
+    delay_duration = WD.calculate_wind_delay(weather_window=weather_window, start_delay=start_delay,
+                                             mission_time=mission_time, critical_wind_speed=critical_wind_speed,
+                                             height_interest=height_interest, wind_shear_exponent=wind_shear_exponent)
+
+    return np.sum(WD.cap_delay_hours(delay_duration))
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_weather_index_matches_scan(seed):
+    weather_window = create_weather_window(num_hours=1500, seed=seed)
+    weather_index = WD.WeatherIndex(weather_window)
+    random_state = np.random.RandomState(seed)
+
+    num_queries = 300
+    start_delay = random_state.randint(0, 1400, num_queries)
+    mission_time = random_state.randint(1, 1500 - start_delay)
+    height_interest = random_state.choice([50.0, 87.5, 100.0, 140.0], num_queries)
+    critical_wind_speed = random_state.uniform(4, 18, num_queries)
+
+    # include critical wind speeds equal to shear-adjusted wind speeds in the weather window (ties are not delays)
+    ties = random_state.rand(num_queries) < 0.2
+    critical_wind_speed[ties] = (random_state.choice(weather_window['Speed m per s'].values, ties.sum()) *
+                                 (height_interest[ties] / 100) ** 0.2)
+
+    expected = [calculate_capped_delay_scan(weather_window=weather_window, start_delay=start_delay[query],
+                                            mission_time=mission_time[query],
+                                            critical_wind_speed=critical_wind_speed[query],
+                                            height_interest=height_interest[query], wind_shear_exponent=0.2)
+                for query in range(num_queries)]
+
+    # queries one at a time (threshold levels built as needed) and all at once on a new index
+    delay = [weather_index.calculate_capped_delay(start_delay=start_delay[query], mission_time=mission_time[query],
+                                                  critical_wind_speed=critical_wind_speed[query],
+                                                  height_interest=height_interest[query], wind_shear_exponent=0.2)
+             for query in range(num_queries)]
+    batched_delay = WD.WeatherIndex(weather_window).calculate_capped_delay(start_delay=start_delay,
+                                                                           mission_time=mission_time,
+                                                                           critical_wind_speed=critical_wind_speed,
+                                                                           height_interest=height_interest,
+                                                                           wind_shear_exponent=0.2)
+
+    np.testing.assert_array_equal(np.ravel(delay), expected)
+    np.testing.assert_array_equal(batched_delay, expected)